@@ -1,6 +1,20 @@
 """Backend application package for REST API components."""
 
-from .app import create_app
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .app import create_app
 
 __all__ = ["create_app"]
 
+
+def __getattr__(name: str) -> Any:
+    # Importing ``backend.settings`` or ``backend.database`` (scripts, workers)
+    # should not pull in FastAPI and every route module.
+    if name == "create_app":
+        from .app import create_app
+
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
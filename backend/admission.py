@@ -0,0 +1,277 @@
+"""Admission control for the processing endpoints.
+
+Uploads decode video, run models and write to disk, so accepting every request
+in a burst exhausts memory and CPU for the whole server. ``AdmissionMiddleware``
+admits at most ``max_in_flight`` processing requests. Up to ``max_queue`` more
+wait in FIFO order for ``queue_timeout_seconds``, and anything beyond that is
+refused before its body is read: ``503`` when the server is saturated, ``429``
+when one client already holds ``per_client_limit`` slots. Both carry a
+``Retry-After`` estimated from recent processing times.
+
+``BodyLimitMiddleware`` caps the request body of the same endpoints: a
+``Content-Length`` over ``upload.max_request_bytes`` is refused with ``413``
+before anything is read, and a streamed body is cut off as soon as it exceeds
+the limit, so oversized uploads never reach the multipart spool on disk.
+
+Read endpoints bypass the controller entirely, and processing threads run at a
+lower CPU priority (``processing.nice``), so ``/search`` and ``/videos`` stay
+fast while the processing capacity is saturated.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import Counter, deque
+from typing import Any, Iterable
+
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.metrics import ADMISSION_REJECTIONS
+from backend.settings import AdmissionSettings
+
+# Weight of the newest sample in the running average of processing time.
+_EWMA_ALPHA = 0.2
+
+
+class Rejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Counting semaphore with a bounded FIFO wait queue and per-client caps.
+
+    Only used from the event loop, so no locking is needed. A released slot is
+    handed directly to the oldest waiter, which keeps admission order fair.
+    """
+
+    def __init__(self, settings: AdmissionSettings) -> None:
+        self.settings = settings
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._clients: Counter[str] = Counter()
+        self._service_seconds: float | None = None
+        self.admitted = 0
+        self.queued = 0
+        self.rejections: Counter[str] = Counter()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def client_id(self, scope: Scope) -> str:
+        header = self.settings.client_header
+        if header:
+            name = header.lower().encode("latin-1")
+            for key, value in scope.get("headers", ()):
+                if key == name:
+                    return value.decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, from the average service time."""
+        if self._service_seconds is None:
+            return self.settings.retry_after_seconds
+        ahead = len(self._waiters) + 1
+        estimate = self._service_seconds * ahead / self.settings.max_in_flight
+        return max(1, math.ceil(estimate))
+
+    async def acquire(self, client: str) -> None:
+        """Wait for a processing slot or raise ``Rejected``."""
+        limit = self.settings.per_client_limit
+        if limit and self._clients[client] >= limit:
+            self._reject(429, "client_limit")
+
+        if self.in_flight < self.settings.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self._clients[client] += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.settings.max_queue:
+            self._reject(503, "queue_full")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._clients[client] += 1
+        self.queued += 1
+        try:
+            done, _ = await asyncio.wait(
+                {waiter}, timeout=self.settings.queue_timeout_seconds
+            )
+        except BaseException:
+            # Cancelled (e.g. the client went away): give back a slot that was
+            # handed over in the meantime, otherwise leave the queue.
+            if waiter.done() and not waiter.cancelled():
+                self.release(client)
+            else:
+                self._abandon(waiter, client)
+            raise
+        if not done:
+            self._abandon(waiter, client)
+            self._reject(503, "queue_timeout")
+        self.admitted += 1
+
+    def release(self, client: str, service_seconds: float | None = None) -> None:
+        """Free ``client``'s slot, passing it to the next waiter if there is one."""
+        self._clients[client] -= 1
+        if self._clients[client] <= 0:
+            del self._clients[client]
+        if service_seconds is not None:
+            previous = self._service_seconds
+            self._service_seconds = (
+                service_seconds
+                if previous is None
+                else previous + _EWMA_ALPHA * (service_seconds - previous)
+            )
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict[str, Any]:
+        """Current load, totals since startup and rejections by reason."""
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.settings.max_in_flight,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.settings.max_queue,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": dict(self.rejections),
+            "clients": len(self._clients),
+            "mean_service_seconds": self._service_seconds,
+        }
+
+    def _abandon(self, waiter: asyncio.Future[None], client: str) -> None:
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._clients[client] -= 1
+        if self._clients[client] <= 0:
+            del self._clients[client]
+
+    def _reject(self, status_code: int, reason: str) -> None:
+        self.rejections[reason] += 1
+        ADMISSION_REJECTIONS.labels(reason).inc()
+        raise Rejected(status_code, reason, self.retry_after())
+
+
+_MESSAGES = {
+    "client_limit": "Too many concurrent processing requests from this client.",
+    "queue_full": "Processing capacity is saturated; retry later.",
+    "queue_timeout": "Timed out waiting for processing capacity; retry later.",
+}
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that gates ``POST`` requests to ``paths`` on a controller."""
+
+    def __init__(
+        self, app: ASGIApp, controller: AdmissionController, paths: Iterable[str]
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        client = self.controller.client_id(scope)
+        try:
+            await self.controller.acquire(client)
+        except Rejected as rejection:
+            response = JSONResponse(
+                {"detail": _MESSAGES[rejection.reason], "reason": rejection.reason},
+                status_code=rejection.status_code,
+                headers={"Retry-After": str(rejection.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(client, time.perf_counter() - started)
+
+
+class BodyLimitMiddleware:
+    """ASGI middleware that refuses ``POST`` bodies to ``paths`` over ``max_bytes``."""
+
+    def __init__(self, app: ASGIApp, max_bytes: int, paths: Iterable[str]) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        for key, value in scope.get("headers", ()):
+            if key == b"content-length":
+                if value.isdigit() and int(value) > self.max_bytes:
+                    await self._too_large()(scope, receive, send)
+                    return
+                break
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside body parsing: FastAPI re-raises
+                    # HTTPException there and renders it as the response.
+                    ADMISSION_REJECTIONS.labels("body_too_large").inc()
+                    raise HTTPException(status_code=413, detail=self._detail())
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except HTTPException as error:
+            if error.status_code != 413 or response_started:
+                raise
+            await self._too_large(count=False)(scope, receive, send)
+
+    def _detail(self) -> str:
+        return f"Request body exceeds the maximum size of {self.max_bytes} bytes."
+
+    def _too_large(self, count: bool = True) -> JSONResponse:
+        if count:
+            ADMISSION_REJECTIONS.labels("body_too_large").inc()
+        return JSONResponse(
+            {"detail": self._detail(), "reason": "body_too_large"}, status_code=413
+        )
@@ -1,31 +1,230 @@
+import asyncio
 import os
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from omegaconf import DictConfig, OmegaConf
 
-from backend.database import init_database
-from backend.routes import audio, health, search, videos
+from backend.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    BodyLimitMiddleware,
+)
+from backend.database import (
+    dispose_engines,
+    ensure_schema,
+    get_engine,
+    init_database,
+)
+from backend.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_DEPTH,
+    INFERENCE_QUEUE_DEPTH,
+    JOB_QUEUE_DEPTH,
+    MetricsMiddleware,
+    instrument_queries,
+)
+from backend.response_cache import (
+    CACHE_STAMP_FILE,
+    ResponseCache,
+    ResponseCacheMiddleware,
+    invalidate_on_media_commit,
+)
+from backend.routes import (
+    audio,
+    batch,
+    events,
+    health,
+    jobs,
+    metrics,
+    search,
+    videos,
+)
 from backend.services.audio_processor import AudioProcessor
+from backend.services.batch_ingest import BatchIngestor
+from backend.services.detector import YoloDetector
+from backend.services.event_queries import EventStore
+from backend.services.executor import create_processing_executor
+from backend.services.extraction_sync import ExtractionSyncTask
+from backend.services.job_runner import JobRunner
+from backend.services.transcriber import WhisperTranscriber
 from backend.services.video_processor import VideoProcessor
 from backend.settings import AppSettings, build_settings, ensure_storage_dirs
+from backend.startup import Readiness
+
+CACHED_PATHS = ("/videos", "/transcriptions", "/search")
+ADMISSION_PATHS = ("/process/video", "/process/audio", "/process/batch")
 
 
 def create_app(cfg: DictConfig, project_root: str | None = None) -> FastAPI:
-    """FastAPI application factory."""
+    """FastAPI application factory.
+
+    Only cheap wiring happens here; the schema, job runner and models are
+    brought up by the lifespan warm-up and reported by ``/health/ready``.
+    """
     settings = _build_settings(cfg=cfg, project_root=project_root)
     ensure_storage_dirs(settings)
-    init_database(database_url=settings.database.url)
+    init_database(
+        database_url=settings.database.url,
+        database_settings=settings.database,
+        prepare_schema=False,
+    )
+
+    processing_executor = create_processing_executor(settings)
+
+    transcriber = (
+        WhisperTranscriber(
+            settings.transcription,
+            executor=processing_executor,
+            thread_nice=settings.processing.nice,
+        )
+        if settings.transcription.enabled
+        else None
+    )
+
+    detector = (
+        YoloDetector(
+            settings.detection,
+            executor=processing_executor,
+            thread_nice=settings.processing.nice,
+        )
+        if settings.detection.enabled
+        else None
+    )
+    shared_models = [m for m in (transcriber, detector) if m is not None]
+    # Requests that need a model before it is loaded wait in its batcher, even
+    # if they arrive before the warm-up task gets to start it.
+    for model in shared_models:
+        model.batcher.expect_start()
+
+    async def start_services(app: FastAPI) -> None:
+        readiness: Readiness = app.state.readiness
+        if not await readiness.run("database", asyncio.to_thread(ensure_schema)):
+            return
+        await readiness.run("jobs", app.state.job_runner.start())
+        if app.state.extraction_sync is not None:
+            await app.state.extraction_sync.start()
+
+    async def warm_up(app: FastAPI) -> None:
+        # Models do not need the database, so they load alongside it and still
+        # come up when the schema step fails.
+        readiness: Readiness = app.state.readiness
+        await asyncio.gather(
+            start_services(app),
+            *(
+                readiness.run(model.batcher.name, model.start())
+                for model in shared_models
+            ),
+        )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        warm_up_task = asyncio.create_task(warm_up(app), name="warm-up")
+        yield
+        warm_up_task.cancel()
+        await asyncio.gather(warm_up_task, return_exceptions=True)
+        if app.state.extraction_sync is not None:
+            await app.state.extraction_sync.stop()
+        await app.state.job_runner.stop()
+        for model in shared_models:
+            await model.stop()
+        processing_executor.shutdown(wait=True, cancel_futures=True)
+        app.state.video_processor.close()
+        if app.state.event_store is not None:
+            app.state.event_store.dispose()
+        await dispose_engines()
 
     app = FastAPI(
         title="HTX Media Intelligence Backend",
         version="0.1.0",
         docs_url="/",
+        lifespan=lifespan,
     )
     app.state.settings = settings
-    app.state.video_processor = VideoProcessor(settings=settings)
-    app.state.audio_processor = AudioProcessor(settings=settings)
+    app.state.readiness = Readiness(
+        ["database", "jobs", *(model.batcher.name for model in shared_models)]
+    )
+    app.state.processing_executor = processing_executor
+    app.state.video_processor = VideoProcessor(
+        settings=settings, executor=processing_executor, detector=detector
+    )
+    app.state.audio_processor = AudioProcessor(
+        settings=settings, executor=processing_executor, transcriber=transcriber
+    )
+    app.state.models = shared_models
+    app.state.batchers = {m.batcher.name: m.batcher for m in shared_models}
+    app.state.batch_ingestor = BatchIngestor(
+        settings=settings,
+        video_processor=app.state.video_processor,
+        audio_processor=app.state.audio_processor,
+    )
+    app.state.job_runner = JobRunner(
+        video_processor=app.state.video_processor,
+        audio_processor=app.state.audio_processor,
+        workers=settings.jobs.workers,
+        batch_ingestor=app.state.batch_ingestor,
+        # With several server workers the parent requeues interrupted jobs once.
+        recover_running=settings.server.workers == 1,
+    )
+
+    if settings.cache.enabled:
+        response_cache = ResponseCache(
+            max_entries=settings.cache.max_entries,
+            ttl_seconds=settings.cache.ttl_seconds,
+            # Watched even with one worker: the sync CLI replaces it too.
+            stamp_path=os.path.join(
+                settings.storage.processed_data_dir, CACHE_STAMP_FILE
+            ),
+        )
+        invalidate_on_media_commit(response_cache)
+        app.add_middleware(
+            ResponseCacheMiddleware, cache=response_cache, paths=CACHED_PATHS
+        )
+        app.state.response_cache = response_cache
+
+    app.state.admission = None
+    if settings.admission.enabled:
+        admission = AdmissionController(settings.admission)
+        app.add_middleware(
+            AdmissionMiddleware, controller=admission, paths=ADMISSION_PATHS
+        )
+        app.state.admission = admission
+    # Outside admission, so oversized uploads are refused without queueing.
+    app.add_middleware(
+        BodyLimitMiddleware,
+        max_bytes=settings.upload.max_request_bytes,
+        paths=ADMISSION_PATHS,
+    )
+
+    if settings.metrics.enabled:
+        instrument_queries()
+        JOB_QUEUE_DEPTH.set_function(lambda: app.state.job_runner.queue_depth)
+        if app.state.admission is not None:
+            ADMISSION_IN_FLIGHT.set_function(lambda: app.state.admission.in_flight)
+            ADMISSION_QUEUE_DEPTH.set_function(lambda: app.state.admission.queue_depth)
+        for name, batcher in app.state.batchers.items():
+            INFERENCE_QUEUE_DEPTH.labels(name).set_function(
+                lambda batcher=batcher: batcher.queue_depth
+            )
+        # Added last so it is outermost and also times cached responses.
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router, tags=["metrics"])
+
+    app.state.extraction_sync = None
+    if settings.sync.enabled:
+        cache = getattr(app.state, "response_cache", None)
+        app.state.extraction_sync = ExtractionSyncTask(
+            settings.sync,
+            engine_factory=get_engine,
+            on_change=cache.invalidate if cache is not None else None,
+        )
+
+    app.state.event_store = None
+    if settings.events.enabled:
+        app.state.event_store = EventStore(settings.events.extraction_db_path)
+        app.include_router(events.router, tags=["events"])
 
     if os.path.isdir(settings.storage.processed_data_dir):
         app.mount(
@@ -37,7 +236,9 @@ def create_app(cfg: DictConfig, project_root: str | None = None) -> FastAPI:
     app.include_router(health.router, tags=["health"])
     app.include_router(videos.router, tags=["videos"])
     app.include_router(audio.router, tags=["audio"])
+    app.include_router(batch.router, tags=["batch"])
     app.include_router(search.router, tags=["search"])
+    app.include_router(jobs.router, tags=["jobs"])
 
     return app
 
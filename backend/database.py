@@ -1,36 +1,238 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
-from typing import Generator
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy import Engine, create_engine, event, func, inspect, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
 from backend import models
+from backend.search_index import install_search_index
+from backend.settings import DatabaseSettings
+
+logger = logging.getLogger(__name__)
 
 _engine = None
-_SessionLocal: scoped_session | None = None
+_SessionLocal: sessionmaker[Session] | None = None
+_async_engine: AsyncEngine | None = None
+_AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+_search_index_enabled = False
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+# Async drivers substituted into the configured URL for the AsyncSession path.
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
 
+def init_database(
+    database_url: str,
+    database_settings: DatabaseSettings | None = None,
+    prepare_schema: bool = True,
+) -> None:
+    """Create the sync and async engines and their session factories.
 
-def init_database(database_url: str) -> None:
-    global _engine, _SessionLocal
+    With ``prepare_schema=False`` no connection is opened; tables, column
+    upgrades and the search index are set up by :func:`ensure_schema`, which
+    also runs on first use of a session or engine.
+    """
+    global _engine, _SessionLocal, _async_engine, _AsyncSessionLocal
+    global _schema_ready
 
+    database_settings = database_settings or DatabaseSettings(url=database_url)
     connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
-    _engine = create_engine(database_url, connect_args=connect_args, future=True)
-    factory = sessionmaker(
+    _engine = create_engine(
+        database_url,
+        connect_args=connect_args,
+        future=True,
+        **_pool_options(database_url, database_settings, QueuePool),
+    )
+    _install_pragmas(_engine, database_settings.pragmas)
+    # A plain factory rather than a thread-local ``scoped_session``: FastAPI runs
+    # sync dependencies and endpoints on whichever pool thread is free, so
+    # concurrent requests would otherwise share (and close) one session.
+    _SessionLocal = sessionmaker(
         autocommit=False,
         autoflush=False,
         bind=_engine,
         expire_on_commit=False,
         future=True,
     )
-    _SessionLocal = scoped_session(factory)
-    models.Base.metadata.create_all(bind=_engine)
+    _schema_ready = False
+
+    async_url = async_database_url(database_url)
+    _async_engine = create_async_engine(
+        async_url,
+        connect_args=connect_args,
+        **_pool_options(async_url, database_settings, AsyncAdaptedQueuePool),
+    )
+    _install_pragmas(_async_engine.sync_engine, database_settings.pragmas)
+    _AsyncSessionLocal = async_sessionmaker(
+        bind=_async_engine, autoflush=False, expire_on_commit=False
+    )
+    if prepare_schema:
+        ensure_schema()
+
+
+def ensure_schema() -> None:
+    """Create missing tables and columns and install the search index, once."""
+    global _schema_ready, _search_index_enabled
+    if _schema_ready:
+        return
+    if _engine is None:
+        raise RuntimeError("Database is not initialized. Call init_database first.")
+    with _schema_lock:
+        if _schema_ready:
+            return
+        models.Base.metadata.create_all(bind=_engine)
+        _add_missing_columns(_engine)
+        _search_index_enabled = install_search_index(_engine)
+        _schema_ready = True
+
+
+def schema_ready() -> bool:
+    return _schema_ready
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    """Add nullable columns and indexes introduced after a table existed.
+
+    ``create_all`` only creates missing tables, so older databases would
+    otherwise lack columns such as ``content_hash``.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in models.Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            missing = [
+                column for column in table.columns if column.name not in existing
+            ]
+            for column in missing:
+                if not column.nullable:
+                    raise RuntimeError(
+                        f"Cannot add non-nullable column {table.name}.{column.name}."
+                    )
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} "
+                        f"ADD COLUMN {column.name} {column_type}"
+                    )
+                )
+            indexes = {
+                index["name"]: index for index in inspector.get_indexes(table.name)
+            }
+            for index in table.indexes:
+                found = indexes.get(index.name)
+                if found is None:
+                    index.create(conn)
+                elif index.unique and not found["unique"]:
+                    _make_index_unique(conn, index)
+
+
+def _make_index_unique(conn: Any, index: Any) -> None:
+    """Rebuild an index that became unique, unless existing rows violate it.
+
+    Databases written before ``content_hash`` was unique may already hold
+    duplicates; those keep the plain index, so deduplication stays best-effort
+    until the extra rows are removed.
+    """
+    columns = list(index.columns)
+    duplicate = conn.execute(
+        select(*columns)
+        .where(*(column.is_not(None) for column in columns))
+        .group_by(*columns)
+        .having(func.count() > 1)
+        .limit(1)
+    ).first()
+    if duplicate is not None:
+        logger.warning(
+            f"Index {index.name} is not unique because {index.table.name} has "
+            f"duplicate rows (e.g. {tuple(duplicate)}); remove them to enforce it."
+        )
+        return
+    index.drop(conn)
+    index.create(conn)
+
+
+def async_database_url(database_url: str) -> str:
+    """Return ``database_url`` with its driver swapped for an asyncio one."""
+    url = make_url(database_url)
+    if url.get_dialect().is_async:
+        return database_url
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver is configured for {url.drivername}.")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+def _pool_options(
+    database_url: str, settings: DatabaseSettings, poolclass: type[Pool]
+) -> dict[str, Any]:
+    # In-memory SQLite uses a single shared connection and takes no pool sizing.
+    if make_url(database_url).database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.pool_size,
+        "max_overflow": settings.max_overflow,
+        "pool_timeout": settings.pool_timeout,
+        "pool_pre_ping": settings.pool_pre_ping,
+    }
+
+
+def _install_pragmas(engine: Engine, pragmas: dict[str, Any]) -> None:
+    """Apply SQLite ``PRAGMA`` settings to every new pooled connection."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def search_index_enabled() -> bool:
+    """Whether the FTS5 search index is installed for the current database."""
+    ensure_schema()
+    return _search_index_enabled
+
+
+def get_engine() -> Engine:
+    if _engine is None:
+        raise RuntimeError("Database is not initialized. Call init_database first.")
+    ensure_schema()
+    return _engine
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections of both engines."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
 
 
 def get_session() -> Generator[Session, None, None]:
     if _SessionLocal is None:
         raise RuntimeError("Database is not initialized. Call init_database first.")
+    ensure_schema()
     db = _SessionLocal()
     try:
         yield db
@@ -38,10 +240,36 @@ def get_session() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Session dependency for ``async def`` routes; queries never block the loop."""
+    async with new_async_session() as db:
+        yield db
+
+
+def new_session() -> Session:
+    """Return a new session; the caller closes it."""
+    if _SessionLocal is None:
+        raise RuntimeError("Database is not initialized. Call init_database first.")
+    ensure_schema()
+    return _SessionLocal()
+
+
+@asynccontextmanager
+async def new_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Open a session for async code; a missing schema is created off the loop."""
+    if _AsyncSessionLocal is None:
+        raise RuntimeError("Database is not initialized. Call init_database first.")
+    if not _schema_ready:
+        await asyncio.to_thread(ensure_schema)
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
 @contextmanager
 def session_scope() -> Generator[Session, None, None]:
     if _SessionLocal is None:
         raise RuntimeError("Database is not initialized. Call init_database first.")
+    ensure_schema()
     session = _SessionLocal()
     try:
         yield session
@@ -51,4 +279,3 @@ def session_scope() -> Generator[Session, None, None]:
         raise
     finally:
         session.close()
-
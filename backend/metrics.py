@@ -0,0 +1,410 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+A small registry of counters, gauges and histograms that needs no client
+library or external service. Metrics are module-level objects, so services
+record into them directly and ``GET /metrics`` renders the current values.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, contextmanager
+from typing import Any, Callable, Generic, Iterator, Sequence, TypeVar
+
+from fastapi import Response
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latencies are mostly milliseconds; processing stages run for seconds.
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)  # fmt: skip
+STAGE_BUCKETS = (
+    0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0
+)  # fmt: skip
+
+ChildT = TypeVar("ChildT")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = (f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric(ABC, Generic[ChildT]):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], ChildT] = {}
+        if not self.label_names:
+            self.labels()
+        REGISTRY.register(self)
+
+    def labels(self, *values: str) -> ChildT:
+        if len(values) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}.")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> ChildT:
+        """Create the value holder for one combination of label values."""
+
+    def _default(self) -> ChildT:
+        return self.labels()
+
+    @abstractmethod
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        """Yield ``(sample name, formatted labels, value)`` for rendering."""
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(
+            f"{name}{labels} {_format_value(value)}"
+            for name, labels, value in self.samples()
+        )
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("value", "function", "_lock")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        self.value = 0.0
+        self.function: Callable[[], float] | None = None
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read a total maintained elsewhere (e.g. by the OS) when rendering."""
+        self.function = function
+
+    def get(self) -> float:
+        return float(self.function()) if self.function is not None else self.value
+
+
+class Counter(_Metric[_CounterChild]):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild(self._lock)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._default().set_function(function)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for key, child in list(self._children.items()):
+            yield self.name, _format_labels(self.label_names, key), child.get()
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function", "_lock")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        self.value = 0.0
+        self.function: Callable[[], float] | None = None
+        self._lock = lock
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from ``function`` whenever metrics are rendered."""
+        self.function = function
+
+    def get(self) -> float:
+        return float(self.function()) if self.function is not None else self.value
+
+
+class Gauge(_Metric[_GaugeChild]):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild(self._lock)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._default().set_function(function)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for key, child in list(self._children.items()):
+            yield self.name, _format_labels(self.label_names, key), child.get()
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...], lock: threading.Lock) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = lock
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric[_HistogramChild]):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labels)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets, self._lock)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self) -> AbstractContextManager[None]:
+        return self._default().time()
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        label_names = (*self.label_names, "le")
+        for key, child in list(self._children.items()):
+            with self._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                labels = _format_labels(label_names, (*key, _format_value(bound)))
+                yield f"{self.name}_bucket", labels, cumulative
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric[Any]] = {}
+
+    def register(self, metric: _Metric[Any]) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status.",
+    ("method", "route", "status"),
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time until the response starts, by route.",
+    ("method", "route"),
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being handled.")
+UPLOAD_BYTES = Counter("upload_bytes_total", "Bytes written to storage by uploads.")
+UPLOADS = Counter("uploads_total", "Files written to storage by uploads.")
+STAGE_SECONDS = Histogram(
+    "processing_stage_duration_seconds",
+    "Duration of media processing stages.",
+    ("processor", "stage"),
+    buckets=STAGE_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time.", ("operation",)
+)
+JOB_QUEUE_DEPTH = Gauge("job_queue_depth", "Background jobs waiting for a worker.")
+INFERENCE_QUEUE_DEPTH = Gauge(
+    "inference_queue_depth", "Items waiting for a model batch.", ("model",)
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight", "Processing requests admitted and running."
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth", "Processing requests waiting for admission."
+)
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total",
+    "Processing requests refused by admission control.",
+    ("reason",),
+)
+PROCESS_RSS = Gauge("process_resident_memory_bytes", "Resident memory size in bytes.")
+PROCESS_CPU = Counter(
+    "process_cpu_seconds_total", "User and system CPU time in seconds."
+)
+PROCESS_START = Gauge("process_start_time_seconds", "Process start time (Unix epoch).")
+PROCESS_THREADS = Gauge("process_threads", "Live Python threads.")
+
+
+def _resident_memory_bytes() -> float:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return 0.0
+        # Peak rather than current RSS; ru_maxrss is KiB on Linux, bytes on macOS.
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system
+
+
+PROCESS_RSS.set_function(_resident_memory_bytes)
+PROCESS_CPU.set_function(_cpu_seconds)
+PROCESS_START.set(time.time())
+PROCESS_THREADS.set_function(threading.active_count)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
+
+def metrics_response() -> Response:
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """Record per-route request counts, latency and in-flight requests.
+
+    A plain ASGI middleware rather than ``@app.middleware("http")``, which
+    would add a task group and memory stream to every request. Routes are
+    labelled by their path template (``/jobs/{job_id}``) so label cardinality
+    stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+        elapsed: float | None = None
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status, elapsed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = time.perf_counter() - started
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            if elapsed is None:
+                elapsed = time.perf_counter() - started
+            path = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_LATENCY.labels(scope["method"], path).observe(elapsed)
+            HTTP_REQUESTS.labels(scope["method"], path, str(status)).inc()
+
+
+_QUERY_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+
+
+def instrument_queries() -> None:
+    """Time every SQL statement on every engine (sync and async)."""
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    started = conn.info["query_started"].pop()
+    keyword = statement.lstrip()[:6].upper()
+    operation = keyword if keyword in _QUERY_OPERATIONS else "OTHER"
+    DB_QUERY_SECONDS.labels(operation).observe(time.perf_counter() - started)
+
+
+def _handle_error(context: Any) -> None:
+    if context.connection is None:
+        return
+    stack = context.connection.info.get("query_started")
+    if stack:
+        stack.pop()
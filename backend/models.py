@@ -15,7 +15,11 @@ class Video(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
-    storage_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    storage_path: Mapped[str] = mapped_column(String(1024), nullable=False, index=True)
+    # Unique, so concurrent identical uploads cannot both insert a row.
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True, unique=True
+    )
     summary: Mapped[str] = mapped_column(Text, default="", nullable=False)
     detected_objects: Mapped[list[str]] = mapped_column(
         JSON, default=list, nullable=False
@@ -34,7 +38,11 @@ class Transcription(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
-    storage_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    storage_path: Mapped[str] = mapped_column(String(1024), nullable=False, index=True)
+    # Unique, so concurrent identical uploads cannot both insert a row.
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True, unique=True
+    )
     transcript: Mapped[str] = mapped_column(Text, nullable=False)
     confidence_score: Mapped[float] = mapped_column(default=0.0)
     created_at: Mapped[datetime] = mapped_column(
@@ -45,3 +53,44 @@ class Transcription(Base):
     )
     video: Mapped[Video | None] = relationship("Video", back_populates="transcriptions")
 
+
+class SyncState(Base):
+    """Last offline extraction event ids copied into ``videos``/``transcriptions``."""
+
+    __tablename__ = "sync_state"
+
+    source: Mapped[str] = mapped_column(String(1024), primary_key=True)
+    video_event_id: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    audio_event_id: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    synced_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(16), default="queued", nullable=False, index=True
+    )
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    storage_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    result: Mapped[list[dict] | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    video_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("videos.id"), nullable=True
+    )
+    transcription_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("transcriptions.id"), nullable=True
+    )
@@ -0,0 +1,129 @@
+"""Keyset (cursor) pagination helpers for list and search endpoints."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Literal, Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    String,
+    func,
+    select,
+    tuple_,
+    type_coerce,
+)
+from sqlalchemy.orm import Session
+
+from backend.serialization import ResponseFormat
+
+View = Literal["full", "summary"]
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+@dataclass(slots=True)
+class Page:
+    rows: list[Row[Any]]
+    next_cursor: str | None
+
+
+@dataclass(slots=True)
+class PageParams:
+    limit: int
+    cursor: str | None
+    include_total: bool
+    view: View
+    response_format: ResponseFormat
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor."),
+    include_total: bool = Query(False, description="Also return X-Total-Count."),
+    view: View = Query("full", description="'summary' omits large columns."),
+    response_format: ResponseFormat = Query(
+        "json", alias="format", description="'ndjson' streams one object per line."
+    ),
+) -> PageParams:
+    return PageParams(
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        view=view,
+        response_format=response_format,
+    )
+
+
+def created_at_keys(model: Any) -> list[ColumnElement[Any]]:
+    """Sort keys ``(created_at, id)`` with ``created_at`` compared as stored.
+
+    SQLite keeps timestamps as text; comparing the raw value avoids mismatches
+    between server-default and Python-formatted timestamps.
+    """
+    return [
+        type_coerce(model.created_at, String).label("_created_at_key"),
+        model.id.label("_id_key"),
+    ]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError) as error:
+        raise HTTPException(status_code=400, detail="Invalid cursor.") from error
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    return values
+
+
+def fetch_page(
+    db: Session,
+    stmt: Select[Any],
+    sort_keys: Sequence[ColumnElement[Any]],
+    cursor: str | None,
+    limit: int,
+) -> Page:
+    """Return up to ``limit`` rows of ``stmt`` after ``cursor``.
+
+    ``stmt`` must not be ordered or limited; the sort keys are appended to
+    every row and encoded into the next cursor.
+    """
+    stmt = stmt.add_columns(*sort_keys)
+    if cursor is not None:
+        values = decode_cursor(cursor, len(sort_keys))
+        stmt = stmt.where(tuple_(*sort_keys) > tuple_(*values))
+
+    rows = list(db.execute(stmt.order_by(*sort_keys).limit(limit + 1)).all())
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][-len(sort_keys) :])
+    return Page(rows=rows, next_cursor=next_cursor)
+
+
+def count_rows(db: Session, stmt: Select[Any]) -> int:
+    return db.scalar(select(func.count()).select_from(stmt.subquery())) or 0
+
+
+def set_page_headers(response: Response, page: Page, total: int | None) -> None:
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
@@ -0,0 +1,307 @@
+"""Bounded in-process cache for hot read-only GET responses.
+
+Entries are keyed by path and normalized query string, expire after a TTL and
+are dropped whenever a session commits changes to videos or transcriptions.
+An invalidation also replaces a stamp file that every server worker checks on
+each lookup, so commits in other workers and offline syncs (``touch_stamp``)
+clear it too. Every cached response carries an
+``ETag`` and ``Last-Modified`` header so pollers can revalidate with a cheap
+``304``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend import models
+
+logger = logging.getLogger(__name__)
+
+CACHE_HEADER = "X-Cache"
+CACHE_STAMP_FILE = ".response-cache-stamp"
+_WATCHED_MODELS = (models.Video, models.Transcription)
+_PASSTHROUGH_HEADERS = ("content-type", "x-next-cursor", "x-total-count")
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str]
+    etag: str
+    last_modified: str
+    expires_at: float
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with TTL expiry and whole-cache invalidation."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 30.0,
+        stamp_path: str | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stamp_path = stamp_path
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stamp = self._read_stamp()
+        self.version = 0
+        self._modified_at = _utc_now()
+        self.last_modified = format_datetime(self._modified_at, usegmt=True)
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            if self.stamp_path is not None:
+                stamp = self._read_stamp()
+                if stamp != self._stamp:
+                    self._stamp = stamp
+                    self._clear()
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, entry: CachedResponse, version: int) -> None:
+        """Store ``entry`` unless the data changed since ``version`` was read."""
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._clear()
+            if self.stamp_path is not None:
+                # The commit already happened; a stale peer beats a failed request.
+                try:
+                    self._stamp = self._write_stamp()
+                except OSError as error:
+                    logger.warning(f"Could not replace cache stamp: {error}")
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self.version += 1
+        # HTTP dates have whole seconds; a page fetched earlier in the same
+        # second must not still satisfy If-Modified-Since.
+        self._modified_at = max(_utc_now(), self._modified_at + timedelta(seconds=1))
+        self.last_modified = format_datetime(self._modified_at, usegmt=True)
+        self.invalidations += 1
+
+    def _read_stamp(self) -> tuple[int, int] | None:
+        if self.stamp_path is None:
+            return None
+        try:
+            stat = os.stat(self.stamp_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _write_stamp(self) -> tuple[int, int] | None:
+        touch_stamp(self.stamp_path)
+        return self._read_stamp()
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def record_revalidation(self) -> None:
+        with self._lock:
+            self.revalidations += 1
+
+
+def touch_stamp(path: str) -> None:
+    """Replace the stamp file at ``path``, clearing every cache that watches it."""
+    # The new file exists alongside the old one until the replace, so its
+    # inode always differs from the stamp the caches last saw.
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(str(time.time()))
+    os.replace(temp_path, path)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def cache_key(request: Request) -> str:
+    query = urlencode(sorted(parse_qsl(request.url.query, keep_blank_values=True)))
+    return f"{request.url.path}?{query}"
+
+
+def _not_modified(request: Request, etag: str, last_modified: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        return etag in candidates or "*" in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(
+            last_modified
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def _respond(
+    cache: ResponseCache, request: Request, entry: CachedResponse, status: str
+) -> Response:
+    validators = {"ETag": entry.etag, "Last-Modified": entry.last_modified}
+    if _not_modified(request, entry.etag, entry.last_modified):
+        cache.record_revalidation()
+        return Response(status_code=304, headers={**validators, CACHE_HEADER: status})
+    return Response(
+        content=entry.body,
+        headers={**entry.headers, **validators, CACHE_HEADER: status},
+    )
+
+
+def _sized(start: Message) -> bool:
+    """Whether a response declares its length, i.e. is not streamed."""
+    return any(name == b"content-length" for name, _ in start["headers"])
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving ``GET`` requests to ``paths`` from ``cache``.
+
+    A plain ASGI middleware like ``MetricsMiddleware``: a miss buffers the
+    route's body messages and a hit is answered without calling the route, so
+    no task group or memory stream is added per request. Only ``200``
+    responses with a ``Content-Length`` are stored. Anything else, including
+    streamed bodies such as ``?format=ndjson``, passes through unbuffered.
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache, paths: Iterable[str]):
+        self.app = app
+        self.cache = cache
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        key = cache_key(request)
+        entry = self.cache.get(key)
+        if entry is not None:
+            await _respond(self.cache, request, entry, "HIT")(scope, receive, send)
+            return
+
+        version = self.cache.version
+        last_modified = self.cache.last_modified
+        start: Message | None = None
+        passthrough = False
+        chunks: list[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                passthrough = message["status"] != 200 or not _sized(message)
+            elif message["type"] == "http.response.body" and not passthrough:
+                chunks.append(message.get("body", b""))
+                return
+            if passthrough:
+                await send(message)
+
+        await self.app(scope, receive, capture)
+        if start is None or passthrough:
+            return
+
+        body = b"".join(chunks)
+        headers = Headers(raw=start["headers"])
+        entry = CachedResponse(
+            body=body,
+            headers={
+                name: headers[name] for name in _PASSTHROUGH_HEADERS if name in headers
+            },
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            last_modified=last_modified,
+            expires_at=time.monotonic() + self.cache.ttl_seconds,
+        )
+        self.cache.put(key, entry, version)
+        await _respond(self.cache, request, entry, "MISS")(scope, receive, send)
+
+
+_watching_caches: "weakref.WeakSet[ResponseCache]" = weakref.WeakSet()
+
+
+def invalidate_on_media_commit(cache: ResponseCache) -> None:
+    """Clear ``cache`` after any commit that touched videos or transcriptions.
+
+    The listeners are attached to every ``Session`` so writes from request
+    handlers, background jobs and scripts all invalidate the cache.
+    """
+    if not event.contains(Session, "after_commit", _after_commit):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_soft_rollback", _after_rollback)
+    _watching_caches.add(cache)
+
+
+def _after_flush(session: Session, flush_context: object) -> None:
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, _WATCHED_MODELS) for obj in changed):
+        session.info["media_changed"] = True
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop("media_changed", False):
+        for cache in list(_watching_caches):
+            cache.invalidate()
+
+
+def _after_rollback(session: Session, previous_transaction: object) -> None:
+    session.info.pop("media_changed", None)
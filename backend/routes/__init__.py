@@ -1,4 +1,3 @@
-from . import audio, health, search, videos
-
-__all__ = ["audio", "health", "search", "videos"]
+from . import audio, batch, health, jobs, metrics, search, videos
 
+__all__ = ["audio", "batch", "health", "jobs", "metrics", "search", "videos"]
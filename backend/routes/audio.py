@@ -1,15 +1,51 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, File, Request, UploadFile
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend import models
-from backend.database import get_session
-from backend.schemas import TranscriptionRead
+from backend.database import get_async_session, get_session
+from backend.pagination import (
+    PageParams,
+    count_rows,
+    created_at_keys,
+    fetch_page,
+    page_params,
+    set_page_headers,
+)
+from backend.routes.jobs import get_job_runner, job_accepted_response
+from backend.schemas import JobRead, TranscriptionRead, TranscriptionSummary
+from backend.serialization import items_response, row_dicts, validated
 from backend.services.audio_processor import AudioProcessor
+from backend.services.job_runner import JobRunner
 
 router = APIRouter()
 
+TRANSCRIPTION_COLUMNS = (
+    models.Transcription.id,
+    models.Transcription.filename,
+    models.Transcription.transcript,
+    models.Transcription.confidence_score,
+    models.Transcription.storage_path,
+    models.Transcription.content_hash,
+    models.Transcription.video_id,
+    models.Transcription.created_at,
+)
+TRANSCRIPTION_SUMMARY_COLUMNS = (
+    models.Transcription.id,
+    models.Transcription.filename,
+    models.Transcription.confidence_score,
+    models.Transcription.storage_path,
+    models.Transcription.video_id,
+    models.Transcription.created_at,
+)
+TRANSCRIPTION_ADAPTER = TypeAdapter(list[TranscriptionRead])
+TRANSCRIPTION_SUMMARY_ADAPTER = TypeAdapter(list[TranscriptionSummary])
+
 
 def get_audio_processor(request: Request) -> AudioProcessor:
     return request.app.state.audio_processor
@@ -19,20 +55,64 @@ def get_audio_processor(request: Request) -> AudioProcessor:
     "/process/audio",
     response_model=TranscriptionRead,
     status_code=201,
+    responses={202: {"model": JobRead}},
 )
 async def process_audio(
     file: UploadFile = File(...),
-    db: Session = Depends(get_session),
+    async_mode: bool = Query(
+        False, description="Queue the upload and return a job instead of waiting."
+    ),
+    job_runner: JobRunner = Depends(get_job_runner),
+    db: AsyncSession = Depends(get_async_session),
     audio_processor: AudioProcessor = Depends(get_audio_processor),
-) -> TranscriptionRead:
+) -> TranscriptionRead | JSONResponse:
+    if async_mode:
+        job = await job_runner.submit(kind="audio", file=file)
+        return job_accepted_response(job)
+
     transcription = await audio_processor.process(file=file, db=db)
     return TranscriptionRead.model_validate(transcription)
 
 
-@router.get("/transcriptions", response_model=list[TranscriptionRead])
+@router.get(
+    "/transcriptions",
+    response_model=list[TranscriptionRead | TranscriptionSummary],
+)
 def list_transcriptions(
+    request: Request,
+    params: PageParams = Depends(page_params),
     db: Session = Depends(get_session),
-) -> list[TranscriptionRead]:
-    rows = db.query(models.Transcription).order_by(models.Transcription.created_at).all()
-    return [TranscriptionRead.model_validate(row) for row in rows]
+) -> Response:
+    """List transcriptions oldest first, one keyset page at a time."""
+    columns = (
+        TRANSCRIPTION_COLUMNS
+        if params.view == "full"
+        else TRANSCRIPTION_SUMMARY_COLUMNS
+    )
+    page = fetch_page(
+        db,
+        select(*columns),
+        sort_keys=created_at_keys(models.Transcription),
+        cursor=params.cursor,
+        limit=params.limit,
+    )
+    total = (
+        count_rows(db, select(models.Transcription.id))
+        if params.include_total
+        else None
+    )
 
+    serialization = request.app.state.settings.serialization
+    items = row_dicts(page.rows, columns)
+    if serialization.validate_rows:
+        adapter = (
+            TRANSCRIPTION_ADAPTER
+            if params.view == "full"
+            else TRANSCRIPTION_SUMMARY_ADAPTER
+        )
+        items = validated(items, adapter)
+    response = items_response(
+        items, params.response_format, serialization.ndjson_chunk_rows
+    )
+    set_page_headers(response, page, total)
+    return response
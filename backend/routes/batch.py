@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from fastapi import APIRouter, Depends, File, Query, Request, UploadFile
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import get_async_session
+from backend.routes.jobs import get_job_runner, job_accepted_response
+from backend.schemas import BatchItemResult, BatchResponse, JobRead
+from backend.services.batch_ingest import BatchIngestor
+from backend.services.job_runner import JobRunner
+
+router = APIRouter()
+
+
+def get_batch_ingestor(request: Request) -> BatchIngestor:
+    return request.app.state.batch_ingestor
+
+
+@router.post(
+    "/process/batch",
+    response_model=BatchResponse,
+    responses={202: {"model": JobRead}},
+)
+async def process_batch(
+    files: list[UploadFile] = File(
+        ..., description="Video/audio files, or a single zip/tar archive of them."
+    ),
+    async_mode: bool = Query(
+        False, description="Queue the batch and return a job instead of waiting."
+    ),
+    job_runner: JobRunner = Depends(get_job_runner),
+    db: AsyncSession = Depends(get_async_session),
+    batch_ingestor: BatchIngestor = Depends(get_batch_ingestor),
+) -> BatchResponse | JSONResponse:
+    entries = await batch_ingestor.store(files)
+    if async_mode:
+        job = await job_runner.submit_batch(entries)
+        return job_accepted_response(job)
+
+    items = await batch_ingestor.ingest(entries, db)
+    counts = Counter(item["status"] for item in items)
+    return BatchResponse(
+        items=[BatchItemResult(**item) for item in items],
+        created=counts["created"],
+        existing=counts["existing"],
+        failed=counts["failed"],
+        skipped=counts["skipped"],
+    )
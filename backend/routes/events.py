@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import Connection
+
+from backend.schemas import CoOccurrence, FileTimeline, ObjectInterval
+from backend.services.event_queries import (
+    EventStore,
+    co_occurrence,
+    file_timeline,
+    object_intervals,
+)
+
+router = APIRouter()
+
+
+def get_events_connection(request: Request) -> Iterator[Connection]:
+    store: EventStore = request.app.state.event_store
+    try:
+        conn = store.connect()
+    except FileNotFoundError as error:
+        raise HTTPException(status_code=503, detail=str(error)) from error
+    with conn:
+        yield conn
+
+
+def result_limit(
+    request: Request, limit: int = Query(1000, ge=1, description="Maximum rows.")
+) -> int:
+    return min(limit, request.app.state.settings.events.max_results)
+
+
+@router.get("/events/intervals", response_model=list[ObjectInterval])
+def get_object_intervals(
+    object_name: str = Query(..., alias="object", min_length=1),
+    file_name: str | None = Query(None, alias="file"),
+    start: float | None = Query(None, ge=0, description="Seconds into the video."),
+    end: float | None = Query(None, ge=0),
+    gap_seconds: float = Query(1.5, gt=0, description="Split runs at longer gaps."),
+    limit: int = Depends(result_limit),
+    conn: Connection = Depends(get_events_connection),
+) -> list[dict]:
+    """When ``object`` is visible, per file or within ``file``."""
+    return object_intervals(
+        conn,
+        object_name,
+        file_name=file_name,
+        start=start,
+        end=end,
+        gap_seconds=gap_seconds,
+        limit=limit,
+    )
+
+
+@router.get("/events/co-occurrence", response_model=list[CoOccurrence])
+def get_co_occurrence(
+    objects: list[str] = Query(..., min_length=1, description="Repeat per object."),
+    start: float | None = Query(None, ge=0),
+    end: float | None = Query(None, ge=0),
+    limit: int = Depends(result_limit),
+    conn: Connection = Depends(get_events_connection),
+) -> list[dict]:
+    """Files in which every one of ``objects`` is detected."""
+    return co_occurrence(conn, objects, start=start, end=end, limit=limit)
+
+
+@router.get("/events/files/{file_name}/timeline", response_model=FileTimeline)
+def get_file_timeline(
+    file_name: str,
+    bucket_seconds: float = Query(1.0, gt=0),
+    objects: list[str] | None = Query(None, description="Only these objects."),
+    start: float | None = Query(None, ge=0),
+    end: float | None = Query(None, ge=0),
+    limit: int = Depends(result_limit),
+    conn: Connection = Depends(get_events_connection),
+) -> dict:
+    """Detections per object and time bucket in one file."""
+    buckets = file_timeline(
+        conn,
+        file_name,
+        bucket_seconds=bucket_seconds,
+        objects=objects,
+        start=start,
+        end=end,
+        limit=limit,
+    )
+    if buckets is None:
+        raise HTTPException(status_code=404, detail="No events for this file.")
+    return {
+        "file_name": file_name,
+        "bucket_seconds": bucket_seconds,
+        "buckets": buckets,
+    }
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from typing import Any
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
@@ -15,3 +18,48 @@ def health_check(db: Session = Depends(get_session)) -> HealthResponse:
     db.execute(text("SELECT 1"))
     return HealthResponse(status="ok")
 
+
+@router.get("/health/live", response_model=HealthResponse)
+def liveness() -> HealthResponse:
+    """Answers while the process serves requests; touches no dependencies."""
+    return HealthResponse(status="ok")
+
+
+@router.get("/health/ready")
+def readiness(request: Request) -> JSONResponse:
+    """503 until the schema, job runner and models have finished warming up."""
+    status = request.app.state.readiness.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@router.get("/cache/stats")
+def cache_stats(request: Request) -> dict[str, float | int | bool]:
+    cache = getattr(request.app.state, "response_cache", None)
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/admission/stats")
+def admission_stats(request: Request) -> dict[str, Any]:
+    """Processing requests running, queued and rejected in this worker."""
+    admission = getattr(request.app.state, "admission", None)
+    if admission is None:
+        return {"enabled": False}
+    return {"enabled": True, **admission.stats()}
+
+
+@router.get("/inference/stats")
+def inference_stats(request: Request) -> dict[str, dict[str, Any]]:
+    """Queue depth, batch sizes and latency of the shared model batchers."""
+    batchers = request.app.state.batchers
+    return {name: batcher.stats() for name, batcher in batchers.items()}
+
+
+@router.get("/sync/status")
+def sync_status(request: Request) -> dict[str, Any]:
+    """Outcome of the last offline extraction sync, including rows/sec."""
+    sync = request.app.state.extraction_sync
+    if sync is None:
+        return {"enabled": False}
+    return sync.status()
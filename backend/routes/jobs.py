@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend import models
+from backend.database import get_session
+from backend.schemas import JobRead
+from backend.services.job_runner import JobRunner
+
+router = APIRouter()
+
+
+def get_job_runner(request: Request) -> JobRunner:
+    return request.app.state.job_runner
+
+
+def job_accepted_response(job: models.Job) -> JSONResponse:
+    return JSONResponse(
+        status_code=202,
+        content=JobRead.model_validate(job).model_dump(mode="json"),
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+
+@router.get("/jobs", response_model=list[JobRead])
+def list_jobs(
+    status: str | None = Query(None, description="Only return jobs in this state."),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_session),
+) -> list[JobRead]:
+    stmt = select(models.Job).order_by(models.Job.id.desc()).limit(limit)
+    if status is not None:
+        stmt = stmt.where(models.Job.status == status)
+    return [JobRead.model_validate(row) for row in db.scalars(stmt).all()]
+
+
+@router.get("/jobs/{job_id}", response_model=JobRead)
+def get_job(job_id: int, db: Session = Depends(get_session)) -> JobRead:
+    job = db.get(models.Job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return JobRead.model_validate(job)
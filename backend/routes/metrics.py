@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Response
+
+from backend.metrics import metrics_response
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=Response)
+def get_metrics() -> Response:
+    """Prometheus text exposition of request, pipeline and process metrics."""
+    return metrics_response()
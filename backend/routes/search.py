@@ -1,44 +1,138 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import String, cast, or_, select
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Integer,
+    Select,
+    String,
+    cast,
+    or_,
+    select,
+    text,
+)
 from sqlalchemy.orm import Session
 
 from backend import models
-from backend.database import get_session
-from backend.schemas import SearchResponse, TranscriptionRead, VideoRead
+from backend.database import get_session, search_index_enabled
+from backend.pagination import MAX_PAGE_SIZE, View, created_at_keys, fetch_page
+from backend.routes.audio import (
+    TRANSCRIPTION_ADAPTER,
+    TRANSCRIPTION_COLUMNS,
+    TRANSCRIPTION_SUMMARY_ADAPTER,
+    TRANSCRIPTION_SUMMARY_COLUMNS,
+)
+from backend.routes.videos import (
+    VIDEO_ADAPTER,
+    VIDEO_COLUMNS,
+    VIDEO_SUMMARY_ADAPTER,
+    VIDEO_SUMMARY_COLUMNS,
+)
+from backend.schemas import SearchResponse
+from backend.search_index import BM25_WEIGHTS, build_match_query, fts_table
+from backend.serialization import FastJSONResponse, row_dicts, validated
 
 router = APIRouter()
 
 
 @router.get("/search", response_model=SearchResponse)
 def search_media(
+    request: Request,
     term: str = Query(..., min_length=1, description="Full-text search query."),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE, description="Results per type."),
+    video_cursor: str | None = Query(None),
+    transcription_cursor: str | None = Query(None),
+    view: View = Query("full", description="'summary' omits large columns."),
     db: Session = Depends(get_session),
-) -> SearchResponse:
-    term_like = f"%{term.lower()}%"
+) -> Response:
+    match_query = build_match_query(term) if search_index_enabled() else None
+    full = view == "full"
 
-    video_stmt = select(models.Video).where(
-        or_(
-            models.Video.filename.ilike(term_like),
-            models.Video.summary.ilike(term_like),
-            cast(models.Video.detected_objects, String).ilike(term_like),
-        )
+    video_columns = VIDEO_COLUMNS if full else VIDEO_SUMMARY_COLUMNS
+    video_stmt, video_keys = _search_statement(
+        models.Video, video_columns, term, match_query
     )
-    transcription_stmt = select(models.Transcription).where(
-        or_(
-            models.Transcription.filename.ilike(term_like),
-            models.Transcription.transcript.ilike(term_like),
+    video_page = fetch_page(db, video_stmt, video_keys, video_cursor, limit)
+
+    transcription_columns = (
+        TRANSCRIPTION_COLUMNS if full else TRANSCRIPTION_SUMMARY_COLUMNS
+    )
+    transcription_stmt, transcription_keys = _search_statement(
+        models.Transcription, transcription_columns, term, match_query
+    )
+    transcription_page = fetch_page(
+        db, transcription_stmt, transcription_keys, transcription_cursor, limit
+    )
+
+    videos = row_dicts(video_page.rows, video_columns)
+    transcriptions = row_dicts(transcription_page.rows, transcription_columns)
+    if request.app.state.settings.serialization.validate_rows:
+        videos = validated(videos, VIDEO_ADAPTER if full else VIDEO_SUMMARY_ADAPTER)
+        transcriptions = validated(
+            transcriptions,
+            TRANSCRIPTION_ADAPTER if full else TRANSCRIPTION_SUMMARY_ADAPTER,
         )
+
+    return FastJSONResponse(
+        content={
+            "videos": videos,
+            "transcriptions": transcriptions,
+            "next_video_cursor": video_page.next_cursor,
+            "next_transcription_cursor": transcription_page.next_cursor,
+        }
     )
 
-    video_rows = db.scalars(video_stmt).all()
-    transcription_rows = db.scalars(transcription_stmt).all()
 
-    return SearchResponse(
-        videos=[VideoRead.model_validate(row) for row in video_rows],
-        transcriptions=[
-            TranscriptionRead.model_validate(row) for row in transcription_rows
-        ],
+def _search_statement(
+    model: Any,
+    columns: tuple[Any, ...],
+    term: str,
+    match_query: str | None,
+) -> tuple[Select[Any], list[ColumnElement[Any]]]:
+    """Build the unordered search query for ``model`` and its keyset sort keys."""
+    stmt = select(*columns)
+    if match_query is not None:
+        return _fts_search(stmt, model, match_query)
+    return _like_search(stmt, model, term)
+
+
+def _fts_search(
+    stmt: Select[Any], model: Any, match_query: str
+) -> tuple[Select[Any], list[ColumnElement[Any]]]:
+    """Match through the FTS5 index, best BM25 score first."""
+    table = model.__tablename__
+    fts = fts_table(table)
+    weights = ", ".join(str(weight) for weight in BM25_WEIGHTS[table])
+    ranked = (
+        text(
+            f"SELECT rowid AS id, bm25({fts}, {weights}) AS rank "
+            f"FROM {fts} WHERE {fts} MATCH :match_query"
+        )
+        .bindparams(match_query=match_query)
+        .columns(id=Integer, rank=Float)
+        .subquery()
     )
+    stmt = stmt.join(ranked, model.id == ranked.c.id)
+    return stmt, [ranked.c.rank.label("_rank_key"), model.id.label("_id_key")]
 
+
+def _like_search(
+    stmt: Select[Any], model: Any, term: str
+) -> tuple[Select[Any], list[ColumnElement[Any]]]:
+    """Unranked substring search used when FTS5 is unavailable."""
+    term_like = f"%{term.lower()}%"
+    if model is models.Video:
+        condition = or_(
+            models.Video.filename.ilike(term_like),
+            models.Video.summary.ilike(term_like),
+            cast(models.Video.detected_objects, String).ilike(term_like),
+        )
+    else:
+        condition = or_(
+            models.Transcription.filename.ilike(term_like),
+            models.Transcription.transcript.ilike(term_like),
+        )
+    return stmt.where(condition), created_at_keys(model)
@@ -1,16 +1,51 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, File, Request, UploadFile
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend import models
-from backend.database import get_session
-from backend.schemas import VideoRead
+from backend.database import get_async_session, get_session
+from backend.pagination import (
+    PageParams,
+    count_rows,
+    created_at_keys,
+    fetch_page,
+    page_params,
+    set_page_headers,
+)
+from backend.routes.jobs import get_job_runner, job_accepted_response
+from backend.schemas import JobRead, VideoRead, VideoSummary
+from backend.serialization import items_response, row_dicts, validated
+from backend.services.job_runner import JobRunner
 from backend.services.video_processor import VideoProcessor
 
 router = APIRouter()
 
+VIDEO_COLUMNS = (
+    models.Video.id,
+    models.Video.filename,
+    models.Video.summary,
+    models.Video.detected_objects,
+    models.Video.key_frames,
+    models.Video.storage_path,
+    models.Video.content_hash,
+    models.Video.created_at,
+)
+VIDEO_SUMMARY_COLUMNS = (
+    models.Video.id,
+    models.Video.filename,
+    models.Video.summary,
+    models.Video.detected_objects,
+    models.Video.storage_path,
+    models.Video.created_at,
+)
+VIDEO_ADAPTER = TypeAdapter(list[VideoRead])
+VIDEO_SUMMARY_ADAPTER = TypeAdapter(list[VideoSummary])
+
 
 def get_video_processor(request: Request) -> VideoProcessor:
     return request.app.state.video_processor
@@ -20,18 +55,49 @@ def get_video_processor(request: Request) -> VideoProcessor:
     "/process/video",
     response_model=VideoRead,
     status_code=201,
+    responses={202: {"model": JobRead}},
 )
 async def process_video(
     file: UploadFile = File(...),
-    db: Session = Depends(get_session),
+    async_mode: bool = Query(
+        False, description="Queue the upload and return a job instead of waiting."
+    ),
+    job_runner: JobRunner = Depends(get_job_runner),
+    db: AsyncSession = Depends(get_async_session),
     video_processor: VideoProcessor = Depends(get_video_processor),
-) -> VideoRead:
+) -> VideoRead | JSONResponse:
+    if async_mode:
+        job = await job_runner.submit(kind="video", file=file)
+        return job_accepted_response(job)
+
     video = await video_processor.process(file=file, db=db)
     return VideoRead.model_validate(video)
 
 
-@router.get("/videos", response_model=list[VideoRead])
-def list_videos(db: Session = Depends(get_session)) -> list[VideoRead]:
-    rows = db.scalars(select(models.Video).order_by(models.Video.created_at)).all()
-    return [VideoRead.model_validate(row) for row in rows]
+@router.get("/videos", response_model=list[VideoRead | VideoSummary])
+def list_videos(
+    request: Request,
+    params: PageParams = Depends(page_params),
+    db: Session = Depends(get_session),
+) -> Response:
+    """List videos oldest first, one keyset page at a time."""
+    columns = VIDEO_COLUMNS if params.view == "full" else VIDEO_SUMMARY_COLUMNS
+    page = fetch_page(
+        db,
+        select(*columns),
+        sort_keys=created_at_keys(models.Video),
+        cursor=params.cursor,
+        limit=params.limit,
+    )
+    total = count_rows(db, select(models.Video.id)) if params.include_total else None
 
+    serialization = request.app.state.settings.serialization
+    items = row_dicts(page.rows, columns)
+    if serialization.validate_rows:
+        adapter = VIDEO_ADAPTER if params.view == "full" else VIDEO_SUMMARY_ADAPTER
+        items = validated(items, adapter)
+    response = items_response(
+        items, params.response_format, serialization.ndjson_chunk_rows
+    )
+    set_page_headers(response, page, total)
+    return response
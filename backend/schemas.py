@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Literal
 
 from pydantic import BaseModel
 
@@ -20,6 +20,21 @@ class VideoBase(BaseModel):
 class VideoRead(VideoBase):
     id: int
     storage_path: str
+    content_hash: str | None = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class VideoSummary(BaseModel):
+    """Video without its key frame list, for lightweight listings."""
+
+    id: int
+    filename: str
+    summary: str
+    detected_objects: List[str]
+    storage_path: str
     created_at: datetime
 
     class Config:
@@ -35,6 +50,21 @@ class TranscriptionBase(BaseModel):
 class TranscriptionRead(TranscriptionBase):
     id: int
     storage_path: str
+    content_hash: str | None = None
+    video_id: int | None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TranscriptionSummary(BaseModel):
+    """Transcription without its transcript text, for lightweight listings."""
+
+    id: int
+    filename: str
+    confidence_score: float
+    storage_path: str
     video_id: int | None
     created_at: datetime
 
@@ -43,6 +73,68 @@ class TranscriptionRead(TranscriptionBase):
 
 
 class SearchResponse(BaseModel):
-    videos: List[VideoRead]
-    transcriptions: List[TranscriptionRead]
+    videos: List[VideoRead | VideoSummary]
+    transcriptions: List[TranscriptionRead | TranscriptionSummary]
+    next_video_cursor: str | None = None
+    next_transcription_cursor: str | None = None
+
+
+class BatchItemResult(BaseModel):
+    filename: str
+    kind: str | None
+    status: Literal["created", "existing", "failed", "skipped"]
+    id: int | None
+    error: str | None
+
+
+class BatchResponse(BaseModel):
+    items: List[BatchItemResult]
+    created: int
+    existing: int
+    failed: int
+    skipped: int
+
+
+class JobRead(BaseModel):
+    id: int
+    kind: str
+    status: str
+    filename: str
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+    video_id: int | None
+    transcription_id: int | None
+    result: List[BatchItemResult] | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class ObjectInterval(BaseModel):
+    file_name: str
+    start: float
+    end: float
+    detections: int
+    frames: int
+
+
+class CoOccurrence(BaseModel):
+    file_name: str
+    objects: Dict[str, int]
+    first_seen: float
+    last_seen: float
+
+
+class TimelineBucket(BaseModel):
+    object_name: str
+    start: float
+    detections: int
+    frames: int
+
 
+class FileTimeline(BaseModel):
+    file_name: str
+    bucket_seconds: float
+    buckets: List[TimelineBucket]
@@ -0,0 +1,130 @@
+"""SQLite FTS5 index over ``videos`` and ``transcriptions``.
+
+The virtual tables use the base tables as external content and are kept in
+sync by triggers, so every write path (ORM, raw SQL, offline sync) is covered.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+_INDEXES: dict[str, tuple[str, ...]] = {
+    "videos": ("filename", "summary", "detected_objects"),
+    "transcriptions": ("filename", "transcript"),
+}
+
+# Column weights for bm25(); filenames and detections matter most.
+BM25_WEIGHTS: dict[str, tuple[float, ...]] = {
+    "videos": (10.0, 1.0, 5.0),
+    "transcriptions": (10.0, 1.0),
+}
+
+# Mirrors the unicode61 tokenizer, which also splits on underscores.
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def fts_table(table: str) -> str:
+    return f"{table}_fts"
+
+
+def _index_statements(table: str, columns: tuple[str, ...]) -> list[str]:
+    fts = fts_table(table)
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{col}" for col in columns)
+    old_values = ", ".join(f"old.{col}" for col in columns)
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols}, content='{table}', content_rowid='id', prefix='2 3'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols})
+            VALUES ('delete', old.id, {old_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_values});
+        END
+        """,
+    ]
+
+
+def fts5_available(engine: Engine) -> bool:
+    if engine.dialect.name != "sqlite":
+        return False
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)"))
+            conn.execute(text("DROP TABLE temp.fts5_probe"))
+        return True
+    except OperationalError:
+        return False
+
+
+def install_search_index(engine: Engine) -> bool:
+    """Create the FTS5 tables and triggers, backfilling new indexes.
+
+    Returns ``False`` when FTS5 is unavailable and search should fall back to
+    ``LIKE`` matching.
+    """
+    if not fts5_available(engine):
+        logger.warning("SQLite FTS5 is not available; search falls back to LIKE.")
+        return False
+
+    with engine.begin() as conn:
+        existing = {
+            row[0]
+            for row in conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'table'")
+            )
+        }
+        for table, columns in _INDEXES.items():
+            for statement in _index_statements(table, columns):
+                conn.execute(text(statement))
+            if fts_table(table) not in existing:
+                _rebuild(conn, table)
+    return True
+
+
+def rebuild_search_index(engine: Engine) -> None:
+    """Rebuild every FTS5 index from its base table."""
+    with engine.begin() as conn:
+        for table in _INDEXES:
+            _rebuild(conn, table)
+
+
+def _rebuild(conn, table: str) -> None:
+    fts = fts_table(table)
+    logger.info(f"Rebuilding full-text index {fts}.")
+    conn.execute(text(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')"))
+
+
+def build_match_query(term: str) -> str | None:
+    """Turn free text into an FTS5 query that prefix-matches every word.
+
+    Words are quoted so user input can never produce FTS5 syntax errors.
+    Returns ``None`` when the term contains no indexable words.
+    """
+    tokens = _TOKEN_PATTERN.findall(term)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
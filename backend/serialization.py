@@ -0,0 +1,78 @@
+"""Bulk serialization of database rows for list and search responses.
+
+Rows are selected as plain column tuples and encoded straight to JSON bytes,
+skipping per-row ORM objects and Pydantic models. ``orjson`` is used when it is
+installed; otherwise the standard library encoder is the fallback.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any, Iterator, Literal, Sequence
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+ResponseFormat = Literal["json", "ndjson"]
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with :func:`dumps`."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def row_dicts(rows: Sequence[Row[Any]], columns: Sequence[Any]) -> list[dict[str, Any]]:
+    """Map the leading ``columns`` of each row to a dict keyed by column name.
+
+    Trailing columns (keyset sort keys, ranks) are dropped.
+    """
+    names = [column.key for column in columns]
+    return [dict(zip(names, row)) for row in rows]
+
+
+def validated(items: list[dict[str, Any]], adapter: TypeAdapter[Any]) -> list[Any]:
+    """Validate ``items`` with one ``TypeAdapter`` call and return JSON-ready data."""
+    return adapter.dump_python(adapter.validate_python(items), mode="json")
+
+
+def _ndjson_chunks(items: list[Any], chunk_rows: int) -> Iterator[bytes]:
+    for start in range(0, len(items), chunk_rows):
+        chunk = items[start : start + chunk_rows]
+        yield b"".join(dumps(item) + b"\n" for item in chunk)
+
+
+def items_response(
+    items: list[Any], response_format: ResponseFormat, chunk_rows: int = 500
+) -> Response:
+    """Encode a list body as one JSON array or as streamed NDJSON lines."""
+    if response_format == "ndjson":
+        return StreamingResponse(
+            _ndjson_chunks(items, chunk_rows), media_type=NDJSON_MEDIA_TYPE
+        )
+    return FastJSONResponse(content=items)
@@ -1,5 +1,21 @@
 from .audio_processor import AudioProcessor
+from .batch_ingest import BatchIngestor
+from .batching import MicroBatcher
+from .detector import YoloDetector
+from .extraction_sync import ExtractionSyncTask, SyncReport, sync_extraction_db
+from .job_runner import JobRunner
+from .transcriber import WhisperTranscriber
 from .video_processor import VideoProcessor
 
-__all__ = ["AudioProcessor", "VideoProcessor"]
-
+__all__ = [
+    "AudioProcessor",
+    "BatchIngestor",
+    "ExtractionSyncTask",
+    "JobRunner",
+    "MicroBatcher",
+    "SyncReport",
+    "VideoProcessor",
+    "WhisperTranscriber",
+    "YoloDetector",
+    "sync_extraction_db",
+]
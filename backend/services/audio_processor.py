@@ -1,52 +1,109 @@
 from __future__ import annotations
 
+import contextlib
 import hashlib
 import os
+from concurrent.futures import Executor
 
-from fastapi import UploadFile
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend import models
+from backend.metrics import STAGE_SECONDS
+from backend.services.executor import run_blocking
+from backend.services.storage import (
+    StoredUpload,
+    file_sha256,
+    find_by_content_hash,
+    save_processed,
+    stream_upload,
+)
+from backend.services.transcriber import AudioDecodeError, WhisperTranscriber
 from backend.settings import AppSettings
 
 
 class AudioProcessor:
     """Persist audio uploads and generate lightweight transcripts."""
 
-    def __init__(self, settings: AppSettings) -> None:
+    def __init__(
+        self,
+        settings: AppSettings,
+        executor: Executor | None = None,
+        transcriber: WhisperTranscriber | None = None,
+    ) -> None:
         self.settings = settings
+        self.executor = executor
+        self.transcriber = transcriber
 
-    async def process(self, file: UploadFile, db: Session) -> models.Transcription:
-        storage_path = await self._persist_file(file)
-        transcript, confidence = await self._transcribe(storage_path)
+    async def process(self, file: UploadFile, db: AsyncSession) -> models.Transcription:
+        with STAGE_SECONDS.labels("audio", "persist").time():
+            stored = await self._persist_file(file)
+        try:
+            return await self.process_path(
+                stored.path, filename=file.filename, db=db, content_hash=stored.sha256
+            )
+        except AudioDecodeError as error:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(stored.path)
+            raise HTTPException(status_code=415, detail=str(error)) from error
 
-        transcription = models.Transcription(
-            filename=file.filename,
+    async def process_path(
+        self,
+        storage_path: str,
+        filename: str,
+        db: AsyncSession,
+        content_hash: str | None = None,
+    ) -> models.Transcription:
+        """Transcribe audio that is already in storage and record the results.
+
+        Content that was transcribed before is answered with the stored row.
+        """
+        if content_hash is None:
+            content_hash = await run_blocking(self.executor, file_sha256, storage_path)
+        existing = await find_by_content_hash(db, models.Transcription, content_hash)
+        if existing is not None:
+            return existing
+
+        transcription = await self.analyse(
+            storage_path, filename=filename, content_hash=content_hash
+        )
+        with STAGE_SECONDS.labels("audio", "db_commit").time():
+            return await save_processed(db, transcription)
+
+    async def analyse(
+        self, storage_path: str, filename: str, content_hash: str
+    ) -> models.Transcription:
+        """Transcribe audio into an unsaved ``Transcription``."""
+        with STAGE_SECONDS.labels("audio", "transcription").time():
+            transcript, confidence = await self._transcribe(storage_path)
+        return models.Transcription(
+            filename=filename,
             storage_path=storage_path,
+            content_hash=content_hash,
             transcript=transcript,
             confidence_score=confidence,
         )
-        db.add(transcription)
-        db.commit()
-        db.refresh(transcription)
-        return transcription
 
-    async def _persist_file(self, file: UploadFile) -> str:
-        dest_path = os.path.join(self.settings.storage.audio_input_dir, file.filename)
-        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-
-        contents = await file.read()
-        with open(dest_path, "wb") as buffer:
-            buffer.write(contents)
-        await file.seek(0)
-        return dest_path
+    async def _persist_file(self, file: UploadFile) -> StoredUpload:
+        return await stream_upload(
+            file,
+            dest_dir=self.settings.storage.audio_input_dir,
+            upload_settings=self.settings.upload,
+        )
 
     async def _transcribe(self, audio_path: str) -> tuple[str, float]:
+        if self.transcriber is not None:
+            return await self.transcriber.transcribe(audio_path)
+        return await run_blocking(self.executor, self._transcribe_sync, audio_path)
+
+    def _transcribe_sync(self, audio_path: str) -> tuple[str, float]:
         """Placeholder transcription that hashes audio content."""
+        hasher = hashlib.sha256()
         with open(audio_path, "rb") as audio_file:
-            data = audio_file.read()
+            while chunk := audio_file.read(self.settings.upload.chunk_size):
+                hasher.update(chunk)
 
-        digest = hashlib.sha256(data).hexdigest()
+        digest = hasher.hexdigest()
         transcript = f"Placeholder transcription (sha256={digest[:12]})."
         confidence = 0.5
         return transcript, confidence
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import tarfile
+import uuid
+import zipfile
+from dataclasses import asdict, dataclass
+from typing import Any, BinaryIO, Iterator, List, Sequence
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.metrics import STAGE_SECONDS
+from backend.services.audio_processor import AudioProcessor
+from backend.services.storage import save_processed, store_stream, stream_upload
+from backend.services.video_processor import VideoProcessor
+from backend.settings import AppSettings
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = frozenset({".mp4", ".mov", ".avi", ".mkv", ".webm", ".m4v"})
+AUDIO_EXTENSIONS = frozenset({".wav", ".mp3", ".flac", ".m4a", ".ogg"})
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+
+@dataclass(slots=True)
+class BatchEntry:
+    """One file of a batch, stored under its content hash or skipped."""
+
+    filename: str
+    kind: str | None
+    path: str | None = None
+    sha256: str | None = None
+    error: str | None = None
+
+
+def media_kind(filename: str) -> str | None:
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in VIDEO_EXTENSIONS:
+        return "video"
+    if extension in AUDIO_EXTENSIONS:
+        return "audio"
+    return None
+
+
+def is_archive(filename: str | None) -> bool:
+    return bool(filename) and filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+class BatchIngestor:
+    """Store many uploads or archive members and process them in bulk.
+
+    Entries are analysed concurrently up to ``max_concurrency`` at a time and
+    the resulting rows are inserted ``commit_size`` per transaction. Content
+    that was processed before (or repeats within the batch) is not analysed
+    again.
+    """
+
+    def __init__(
+        self,
+        settings: AppSettings,
+        video_processor: VideoProcessor,
+        audio_processor: AudioProcessor,
+    ) -> None:
+        self.settings = settings
+        self.processors: dict[str, VideoProcessor | AudioProcessor] = {
+            "video": video_processor,
+            "audio": audio_processor,
+        }
+        self.models: dict[str, type[models.Video] | type[models.Transcription]] = {
+            "video": models.Video,
+            "audio": models.Transcription,
+        }
+
+    async def store(self, files: Sequence[UploadFile]) -> List[BatchEntry]:
+        """Persist every upload, expanding a single zip/tar archive entry by entry."""
+        if len(files) == 1 and is_archive(files[0].filename):
+            return await asyncio.to_thread(self._store_archive, files[0])
+
+        if len(files) > self.settings.batch.max_entries:
+            raise _too_many(self.settings.batch.max_entries)
+        entries = []
+        for file in files:
+            filename = os.path.basename(file.filename or "upload")
+            kind = media_kind(filename)
+            if kind is None:
+                entries.append(_unsupported(filename))
+                continue
+            stored = await stream_upload(
+                file,
+                dest_dir=self._dest_dir(kind),
+                upload_settings=self.settings.upload,
+            )
+            entries.append(BatchEntry(filename, kind, stored.path, stored.sha256))
+        return entries
+
+    def _store_archive(self, file: UploadFile) -> List[BatchEntry]:
+        entries = []
+        try:
+            for name, member in self._archive_members(file.file, file.filename or ""):
+                if len(entries) >= self.settings.batch.max_entries:
+                    raise _too_many(self.settings.batch.max_entries)
+                filename = os.path.basename(name)
+                kind = media_kind(filename)
+                if kind is None:
+                    entries.append(_unsupported(filename))
+                    continue
+                with member as source:
+                    stored = store_stream(
+                        source,
+                        filename=filename,
+                        dest_dir=self._dest_dir(kind),
+                        upload_settings=self.settings.upload,
+                    )
+                entries.append(BatchEntry(filename, kind, stored.path, stored.sha256))
+        except (zipfile.BadZipFile, tarfile.TarError) as error:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid archive: {error}"
+            ) from error
+        return entries
+
+    @staticmethod
+    def _archive_members(
+        fileobj: BinaryIO, filename: str
+    ) -> Iterator[tuple[str, BinaryIO]]:
+        """Yield ``(name, stream)`` for regular files without extracting to memory."""
+        fileobj.seek(0)
+        if filename.lower().endswith(".zip"):
+            with zipfile.ZipFile(fileobj) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        yield info.filename, archive.open(info)
+            return
+
+        # Stream mode reads members sequentially from the spooled upload.
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for member in archive:
+                if member.isfile():
+                    source = archive.extractfile(member)
+                    if source is not None:
+                        yield member.name, source
+
+    def _dest_dir(self, kind: str) -> str:
+        storage = self.settings.storage
+        return storage.video_input_dir if kind == "video" else storage.audio_input_dir
+
+    async def ingest(
+        self, entries: Sequence[BatchEntry], db: AsyncSession
+    ) -> List[dict[str, Any]]:
+        """Analyse stored entries and insert their rows; return per-file results."""
+        results = [
+            {
+                "filename": entry.filename,
+                "kind": entry.kind,
+                "status": "skipped" if entry.path is None else "pending",
+                "id": None,
+                "error": entry.error,
+            }
+            for entry in entries
+        ]
+        pending = [i for i, entry in enumerate(entries) if entry.path is not None]
+
+        known: dict[tuple[str, str], int] = {}
+        for kind, model in self.models.items():
+            hashes = {entries[i].sha256 for i in pending if entries[i].kind == kind}
+            if hashes:
+                rows = await db.execute(
+                    select(model.content_hash, model.id).where(
+                        model.content_hash.in_(hashes)
+                    )
+                )
+                for content_hash, row_id in rows.all():
+                    known.setdefault((kind, content_hash), row_id)
+
+        # First occurrence of each new (kind, hash) is analysed; repeats reuse it.
+        to_analyse: dict[tuple[str, str], int] = {}
+        for i in pending:
+            key = (entries[i].kind, entries[i].sha256)
+            if key not in known and key not in to_analyse:
+                to_analyse[key] = i
+
+        budget = asyncio.Semaphore(self.settings.batch.max_concurrency)
+
+        async def analyse(index: int) -> Any:
+            entry = entries[index]
+            async with budget:
+                return await self.processors[entry.kind].analyse(
+                    entry.path, filename=entry.filename, content_hash=entry.sha256
+                )
+
+        analysed = await asyncio.gather(
+            *(analyse(i) for i in to_analyse.values()), return_exceptions=True
+        )
+
+        rows_to_insert = []
+        for (key, index), outcome in zip(to_analyse.items(), analysed):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Failed to process {entries[index].filename}: {outcome}")
+                results[index].update(status="failed", error=str(outcome))
+            else:
+                rows_to_insert.append((key, index, outcome))
+
+        commit_size = self.settings.batch.commit_size
+        for start in range(0, len(rows_to_insert), commit_size):
+            chunk = rows_to_insert[start : start + commit_size]
+            db.add_all(row for _, _, row in chunk)
+            try:
+                with STAGE_SECONDS.labels("batch", "db_commit").time():
+                    await db.commit()
+            except IntegrityError:
+                # Another request stored some of this content meanwhile: insert
+                # row by row so the others are kept and the repeats reused.
+                await db.rollback()
+                await self._insert_one_by_one(db, chunk, known, results)
+                continue
+            except Exception as error:
+                await db.rollback()
+                logger.exception("Failed to insert a batch of processed files.")
+                for _, index, _ in chunk:
+                    results[index].update(status="failed", error=str(error))
+                continue
+            for key, index, row in chunk:
+                known[key] = row.id
+                results[index].update(status="created", id=row.id)
+
+        for i in pending:
+            if results[i]["status"] != "pending":
+                continue
+            row_id = known.get((entries[i].kind, entries[i].sha256))
+            if row_id is None:
+                results[i].update(status="failed", error="Duplicate of a failed file.")
+            else:
+                results[i].update(status="existing", id=row_id)
+        return results
+
+    async def _insert_one_by_one(
+        self,
+        db: AsyncSession,
+        chunk: Sequence[tuple[tuple[str, str], int, Any]],
+        known: dict[tuple[str, str], int],
+        results: List[dict[str, Any]],
+    ) -> None:
+        for key, index, row in chunk:
+            try:
+                stored = await save_processed(db, row)
+            except Exception as error:
+                await db.rollback()
+                logger.exception(f"Failed to insert {row.filename}.")
+                results[index].update(status="failed", error=str(error))
+                continue
+            known[key] = stored.id
+            status = "created" if stored is row else "existing"
+            results[index].update(status=status, id=stored.id)
+
+    def write_manifest(self, entries: Sequence[BatchEntry]) -> str:
+        """Save stored entries for a background job and return the manifest path."""
+        manifest_dir = os.path.join(self.settings.storage.raw_data_dir, "batches")
+        os.makedirs(manifest_dir, exist_ok=True)
+        path = os.path.join(manifest_dir, f"{uuid.uuid4().hex}.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump([asdict(entry) for entry in entries], file)
+        return path
+
+    @staticmethod
+    def read_manifest(path: str) -> List[BatchEntry]:
+        with open(path, encoding="utf-8") as file:
+            return [BatchEntry(**entry) for entry in json.load(file)]
+
+
+def _unsupported(filename: str) -> BatchEntry:
+    return BatchEntry(filename, kind=None, error="Unsupported file type.")
+
+
+def _too_many(max_entries: int) -> HTTPException:
+    return HTTPException(
+        status_code=413, detail=f"Batches are limited to {max_entries} files."
+    )
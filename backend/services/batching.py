@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Sequence, TypeVar
+
+from backend.services.executor import lower_thread_priority, run_blocking
+
+logger = logging.getLogger(__name__)
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+
+@dataclass(slots=True)
+class _Pending(Generic[ItemT, ResultT]):
+    item: ItemT
+    future: asyncio.Future[ResultT]
+    enqueued_at: float
+
+
+class MicroBatcher(Generic[ItemT, ResultT]):
+    """Coalesce concurrent single-item requests into batched model calls.
+
+    ``submit`` queues one item and waits for its result. A collector task takes
+    the first queued item, keeps adding items for up to ``max_wait_ms`` or until
+    ``max_batch_size`` is reached, and runs ``batch_fn`` on a dedicated thread
+    pool. At most ``max_concurrency`` batches run at once; while they do, new
+    items keep queueing and join the next, larger batch. Items submitted while
+    the model is still loading wait for ``start`` (or fail after ``abort``);
+    ``expect_start`` extends that to items submitted before ``start`` is called.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[list[ItemT]], Sequence[ResultT]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        max_concurrency: int = 1,
+        latency_window: int = 1024,
+        thread_nice: int = 0,
+    ) -> None:
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix=f"{name}-inference",
+            initializer=lower_thread_priority,
+            initargs=(thread_nice,),
+        )
+        self._queue: asyncio.Queue[_Pending[ItemT, ResultT]] | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._collector: asyncio.Task[None] | None = None
+        self._running: set[asyncio.Task[None]] = set()
+        self._started = asyncio.Event()
+        self._failure: BaseException | None = None
+        self._warming_up = False
+
+        self.batch_sizes: Counter[int] = Counter()
+        self.latencies: deque[float] = deque(maxlen=latency_window)
+        self.inference_seconds = 0.0
+        self.items = 0
+        self.failed_batches = 0
+        self.max_queue_depth = 0
+
+    def expect_start(self) -> None:
+        """Make submits wait for ``start`` instead of failing until it runs."""
+        self._warming_up = True
+
+    async def start(self, warm_up: Awaitable[Any] | None = None) -> None:
+        """Start collecting, after ``warm_up`` (e.g. loading the model) finishes.
+
+        Items submitted while ``warm_up`` runs wait for it instead of failing.
+        """
+        self._warming_up = True
+        try:
+            if warm_up is not None:
+                await warm_up
+        except BaseException as error:
+            self.abort(error)
+            raise
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._collector = asyncio.create_task(
+            self._collect(), name=f"{self.name}-batcher"
+        )
+        self._started.set()
+
+    def abort(self, error: BaseException) -> None:
+        """Fail pending and future submits with ``error``."""
+        self._failure = error
+        self._started.set()
+
+    @property
+    def started(self) -> bool:
+        return self._started.is_set() and self._failure is None
+
+    async def stop(self) -> None:
+        if not self._started.is_set():
+            self.abort(RuntimeError(f"{self.name} batcher stopped."))
+        if self._collector is not None:
+            self._collector.cancel()
+            await asyncio.gather(self._collector, return_exceptions=True)
+            self._collector = None
+        await asyncio.gather(*self._running, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending = self._queue.get_nowait()
+                if not pending.future.done():
+                    pending.future.set_exception(
+                        RuntimeError(f"{self.name} batcher stopped.")
+                    )
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def submit(self, item: ItemT) -> ResultT:
+        if self._warming_up:
+            await self._started.wait()
+        if self._failure is not None:
+            raise RuntimeError(f"{self.name} failed to start.") from self._failure
+        if self._queue is None:
+            raise RuntimeError(f"{self.name} batcher is not started.")
+        future: asyncio.Future[ResultT] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Pending(item, future, time.perf_counter()))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return await future
+
+    async def _collect(self) -> None:
+        assert self._queue is not None and self._slots is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            await self._slots.acquire()
+            # Items that arrived while waiting for a free slot ride along.
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            task = asyncio.create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: list[_Pending[ItemT, ResultT]]) -> None:
+        assert self._slots is not None
+        started = time.perf_counter()
+        try:
+            results = await run_blocking(
+                self._executor, self.batch_fn, [pending.item for pending in batch]
+            )
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"{self.name} returned {len(results)} results for "
+                    f"{len(batch)} items."
+                )
+        except Exception as error:
+            logger.exception(f"{self.name} batch of {len(batch)} failed.")
+            self.failed_batches += 1
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(error)
+        else:
+            for pending, result in zip(batch, results):
+                if not pending.future.done():
+                    pending.future.set_result(result)
+        finally:
+            self._slots.release()
+
+        finished = time.perf_counter()
+        self.inference_seconds += finished - started
+        self.batch_sizes[len(batch)] += 1
+        self.items += len(batch)
+        self.latencies.extend(finished - pending.enqueued_at for pending in batch)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict[str, Any]:
+        batches = sum(self.batch_sizes.values())
+        latencies = sorted(self.latencies)
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "running_batches": len(self._running),
+            "batches": batches,
+            "items": self.items,
+            "failed_batches": self.failed_batches,
+            "mean_batch_size": self.items / batches if batches else 0.0,
+            "batch_size_histogram": {
+                str(size): count for size, count in sorted(self.batch_sizes.items())
+            },
+            "inference_seconds": self.inference_seconds,
+            "latency_ms": _percentiles_ms(latencies),
+        }
+
+
+def _percentiles_ms(sorted_samples: list[float]) -> dict[str, float]:
+    if not sorted_samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    if len(sorted_samples) == 1:
+        value = sorted_samples[0] * 1000
+        return {"p50": value, "p95": value, "p99": value, "max": value}
+    cuts = statistics.quantiles(sorted_samples, n=100, method="inclusive")
+    return {
+        "p50": cuts[49] * 1000,
+        "p95": cuts[94] * 1000,
+        "p99": cuts[98] * 1000,
+        "max": sorted_samples[-1] * 1000,
+    }
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, List, Sequence
+
+from backend.services.batching import MicroBatcher
+from backend.services.executor import run_blocking
+from backend.settings import DetectionSettings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class YoloDetector:
+    """Shared YOLO model that labels key frames from concurrent uploads in batches.
+
+    Uses the checkpoint configured for the offline ``ExtractionPipeline`` and
+    the same class-name mapping, so ``detected_objects`` match the object names
+    stored in ``video_events``. The model is loaded once, by ``start`` or
+    ``preload``.
+    """
+
+    def __init__(
+        self,
+        settings: DetectionSettings,
+        executor: Executor | None = None,
+        thread_nice: int = 0,
+    ) -> None:
+        self.settings = settings
+        self.executor = executor
+        self.batcher: MicroBatcher[np.ndarray, List[str]] = MicroBatcher(
+            name="yolo",
+            batch_fn=self._predict,
+            max_batch_size=settings.max_batch_size,
+            max_wait_ms=settings.max_wait_ms,
+            max_concurrency=settings.max_concurrency,
+            thread_nice=thread_nice,
+        )
+        self._model: Any = None
+        self._device = "cpu"
+
+    def preload(self) -> None:
+        """Load the model now, e.g. in the server process before it forks workers."""
+        if self._model is None:
+            self._load_model()
+
+    async def start(self) -> None:
+        if self._model is not None:
+            await self.batcher.start()
+            return
+        await self.batcher.start(run_blocking(self.executor, self._load_model))
+
+    async def stop(self) -> None:
+        await self.batcher.stop()
+
+    async def detect(self, frames: Sequence[np.ndarray]) -> List[str]:
+        """Return the sorted set of object names found in ``frames``."""
+        labels = await asyncio.gather(*(self.batcher.submit(frame) for frame in frames))
+        return sorted({name for frame_labels in labels for name in frame_labels})
+
+    def _load_model(self) -> None:
+        import torch
+        from ultralytics.models import YOLO
+
+        self._device = "cuda" if torch.cuda.is_available() else "cpu"
+        logger.info(f"Loading {self.settings.model} on {self._device}.")
+        self._model = YOLO(model=self.settings.model).to(self._device)
+
+    def _predict(self, frames: List[np.ndarray]) -> List[List[str]]:
+        """Run one batched ``predict`` over decoded BGR frames."""
+        results = self._model.predict(
+            source=frames,
+            conf=self.settings.confidence,
+            batch=len(frames),
+            verbose=False,
+        )
+        labels = []
+        for result in results:
+            names = []
+            if result.boxes is not None:
+                for cls_id in result.boxes.cls.tolist():
+                    names.append(self._model.names.get(int(cls_id), str(int(cls_id))))
+            labels.append(names)
+        return labels
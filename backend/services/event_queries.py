@@ -0,0 +1,263 @@
+"""Temporal queries over ``video_events`` in the offline extraction database.
+
+Every question is answered by one aggregate statement, so SQLite does the
+grouping and only the result rows reach Python:
+
+- ``object_intervals``: when an object is visible, as runs of detections no
+  more than ``gap_seconds`` apart (gaps-and-islands over window functions);
+- ``co_occurrence``: files that contain every one of several objects;
+- ``file_timeline``: detections per object and time bucket within one file.
+
+The pipeline creates the two indexes these rely on (``video_event_indexes`` in
+``extract_config.yaml``). Both end in ``timestamp``, so the statements are
+answered from the indexes without reading the table.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Sequence
+
+from sqlalchemy import Connection, Engine, bindparam, create_engine, text
+
+logger = logging.getLogger(__name__)
+
+EVENT_INDEXES = ("idx_video_events_file_object_time", "idx_video_events_object")
+
+_INTERVALS = """
+WITH hits AS (
+    SELECT
+        file_name,
+        timestamp,
+        CASE
+            WHEN timestamp - lag(timestamp) OVER (
+                PARTITION BY file_name ORDER BY timestamp
+            ) > :gap THEN 1
+            ELSE 0
+        END AS starts_run
+    FROM video_events
+    WHERE {where}
+),
+runs AS (
+    SELECT
+        file_name,
+        timestamp,
+        sum(starts_run) OVER (
+            PARTITION BY file_name ORDER BY timestamp
+            ROWS UNBOUNDED PRECEDING
+        ) AS run
+    FROM hits
+)
+SELECT
+    file_name,
+    min(timestamp) AS start,
+    max(timestamp) AS end,
+    count(*) AS detections,
+    count(DISTINCT timestamp) AS frames
+FROM runs
+GROUP BY file_name, run
+ORDER BY file_name, start
+LIMIT :limit
+"""
+
+# Grouped by (object_name, file_name) first, the order of idx_video_events_object,
+# so the inner aggregate streams the index without a temporary B-tree.
+_CO_OCCURRENCE = """
+SELECT
+    file_name,
+    json_group_object(object_name, detections) AS objects,
+    min(first_seen) AS first_seen,
+    max(last_seen) AS last_seen
+FROM (
+    SELECT
+        object_name,
+        file_name,
+        count(*) AS detections,
+        min(timestamp) AS first_seen,
+        max(timestamp) AS last_seen
+    FROM video_events
+    WHERE {where}
+    GROUP BY object_name, file_name
+)
+GROUP BY file_name
+HAVING count(*) = :wanted
+ORDER BY file_name
+LIMIT :limit
+"""
+
+_TIMELINE = """
+SELECT
+    object_name,
+    CAST(timestamp / :bucket AS INTEGER) * :bucket AS start,
+    count(*) AS detections,
+    count(DISTINCT timestamp) AS frames
+FROM video_events
+WHERE {where}
+GROUP BY object_name, CAST(timestamp / :bucket AS INTEGER)
+ORDER BY object_name, start
+LIMIT :limit
+"""
+
+_FILE_EXISTS = "SELECT 1 FROM video_events WHERE file_name = :file_name LIMIT 1"
+
+
+def _time_range(start: float | None, end: float | None) -> list[str]:
+    conditions = []
+    if start is not None:
+        conditions.append("timestamp >= :start")
+    if end is not None:
+        conditions.append("timestamp <= :end")
+    return conditions
+
+
+def object_intervals(
+    conn: Connection,
+    object_name: str,
+    file_name: str | None = None,
+    start: float | None = None,
+    end: float | None = None,
+    gap_seconds: float = 1.5,
+    limit: int = 1000,
+) -> list[dict[str, Any]]:
+    """Time ranges in which ``object_name`` is detected, per file.
+
+    Detections closer than ``gap_seconds`` belong to the same interval. The
+    pipeline samples about one frame per second, so the default joins
+    consecutive samples and splits wherever a sample misses the object.
+    """
+    conditions = ["object_name = :object_name"]
+    if file_name is not None:
+        conditions.append("file_name = :file_name")
+    conditions += _time_range(start, end)
+    statement = text(_INTERVALS.format(where=" AND ".join(conditions)))
+    rows = conn.execute(
+        statement,
+        {
+            "object_name": object_name,
+            "file_name": file_name,
+            "start": start,
+            "end": end,
+            "gap": gap_seconds,
+            "limit": limit,
+        },
+    )
+    return [dict(row) for row in rows.mappings()]
+
+
+def co_occurrence(
+    conn: Connection,
+    objects: Sequence[str],
+    start: float | None = None,
+    end: float | None = None,
+    limit: int = 1000,
+) -> list[dict[str, Any]]:
+    """Files in which every one of ``objects`` is detected, with counts per object."""
+    wanted = sorted(set(objects))
+    if not wanted:
+        return []
+    where = " AND ".join(["object_name IN :objects", *_time_range(start, end)])
+    statement = text(_CO_OCCURRENCE.format(where=where)).bindparams(
+        bindparam("objects", expanding=True)
+    )
+    rows = conn.execute(
+        statement,
+        {
+            "objects": wanted,
+            "wanted": len(wanted),
+            "start": start,
+            "end": end,
+            "limit": limit,
+        },
+    )
+    return [{**row, "objects": json.loads(row["objects"])} for row in rows.mappings()]
+
+
+def file_timeline(
+    conn: Connection,
+    file_name: str,
+    bucket_seconds: float = 1.0,
+    objects: Sequence[str] | None = None,
+    start: float | None = None,
+    end: float | None = None,
+    limit: int = 1000,
+) -> list[dict[str, Any]] | None:
+    """Detections per object and ``bucket_seconds`` bucket in ``file_name``.
+
+    Returns ``None`` when the file has no events at all, and an empty list when
+    it has none matching the filters.
+    """
+    if conn.execute(text(_FILE_EXISTS), {"file_name": file_name}).first() is None:
+        return None
+    conditions = ["file_name = :file_name"]
+    if objects:
+        conditions.append("object_name IN :objects")
+    conditions += _time_range(start, end)
+    statement = text(_TIMELINE.format(where=" AND ".join(conditions)))
+    if objects:
+        statement = statement.bindparams(bindparam("objects", expanding=True))
+    rows = conn.execute(
+        statement,
+        {
+            "file_name": file_name,
+            "objects": sorted(set(objects or ())),
+            "bucket": bucket_seconds,
+            "start": start,
+            "end": end,
+            "limit": limit,
+        },
+    )
+    return [dict(row) for row in rows.mappings()]
+
+
+class EventStore:
+    """Read-only engine over the extraction database, opened on first use.
+
+    The file is written by the offline pipeline, possibly while the backend
+    runs, so it is opened with ``mode=ro`` and only once it exists.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._engine: Engine | None = None
+        self._lock = threading.Lock()
+
+    def engine(self) -> Engine:
+        with self._lock:
+            if self._engine is None:
+                if not os.path.exists(self.db_path):
+                    raise FileNotFoundError(
+                        f"Extraction database not found: {self.db_path}"
+                    )
+                self._engine = create_engine(
+                    f"sqlite:///file:{self.db_path}?mode=ro&uri=true"
+                )
+                self._warn_missing_indexes(self._engine)
+            return self._engine
+
+    def connect(self) -> Connection:
+        return self.engine().connect()
+
+    def dispose(self) -> None:
+        with self._lock:
+            if self._engine is not None:
+                self._engine.dispose()
+                self._engine = None
+
+    def _warn_missing_indexes(self, engine: Engine) -> None:
+        with engine.connect() as conn:
+            present = {
+                name
+                for (name,) in conn.exec_driver_sql(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' "
+                    "AND tbl_name = 'video_events'"
+                )
+            }
+        missing = [name for name in EVENT_INDEXES if name not in present]
+        if missing:
+            logger.warning(
+                f"{self.db_path} lacks indexes {missing}; events queries will scan "
+                "video_events. Re-run the extraction pipeline to create them."
+            )
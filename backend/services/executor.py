@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from backend.settings import AppSettings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def create_processing_executor(settings: AppSettings) -> ThreadPoolExecutor:
+    """Bounded pool for CPU-heavy media work that must stay off the event loop."""
+    return ThreadPoolExecutor(
+        max_workers=settings.processing.max_workers,
+        thread_name_prefix="media-processing",
+        initializer=lower_thread_priority,
+        initargs=(settings.processing.nice,),
+    )
+
+
+def lower_thread_priority(increment: int) -> None:
+    """Raise the calling thread's nice value by ``increment`` (pool initializer).
+
+    Linux schedules threads individually and accepts a thread id for
+    ``PRIO_PROCESS``, so only this worker thread yields the CPU to the event
+    loop and request handlers. Elsewhere this is a no-op.
+    """
+    if increment <= 0 or not hasattr(os, "setpriority"):
+        return
+    if not os.path.isdir("/proc/self/task"):
+        return
+    thread_id = threading.get_native_id()
+    try:
+        current = os.getpriority(os.PRIO_PROCESS, thread_id)
+        os.setpriority(os.PRIO_PROCESS, thread_id, current + increment)
+    except OSError as error:
+        logger.debug(f"Could not lower thread priority: {error}")
+
+
+async def run_blocking(
+    executor: Executor | None, func: Callable[..., T], *args: Any
+) -> T:
+    """Run ``func(*args)`` on ``executor`` (or the loop default) and await it."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func, *args)
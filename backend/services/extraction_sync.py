@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from sqlalchemy import Connection, Engine, text
+
+from backend.settings import SyncSettings
+
+logger = logging.getLogger(__name__)
+
+SOURCE_SCHEMA = "extraction"
+
+# Files whose events fall in the current id window, aggregated over all of
+# their events up to the window end so a re-synced file is rebuilt in full.
+_STAGE_VIDEOS = f"""
+CREATE TEMP TABLE sync_videos AS
+SELECT
+    file_name,
+    :media_prefix || file_name AS storage_path,
+    'Detected objects: ' || group_concat(object_name, ', ') AS summary,
+    json_group_array(object_name) AS detected_objects,
+    first_seen AS created_at
+FROM (
+    SELECT
+        e.file_name,
+        e.object_name,
+        min(min(e.created_at)) OVER (PARTITION BY e.file_name) AS first_seen
+    FROM {SOURCE_SCHEMA}.video_events AS e
+    WHERE e.id <= :high
+      AND e.file_name IN (
+          SELECT file_name FROM {SOURCE_SCHEMA}.video_events
+          WHERE id > :low AND id <= :high
+      )
+    GROUP BY e.file_name, e.object_name
+    ORDER BY e.file_name, e.object_name
+)
+GROUP BY file_name
+"""
+
+# Latest transcript per file in the window; audio is extracted next to its
+# video as ``<name>.wav``, so the matching video row is linked when present.
+_STAGE_TRANSCRIPTS = f"""
+CREATE TEMP TABLE sync_transcripts AS
+SELECT
+    a.file_name,
+    :media_prefix || a.file_name AS storage_path,
+    a.transcript,
+    coalesce(a.confidence, 0.0) AS confidence_score,
+    a.created_at,
+    (
+        SELECT v.id FROM main.videos AS v
+        WHERE v.storage_path = :media_prefix || replace(a.file_name, '.wav', '.mp4')
+        ORDER BY v.id LIMIT 1
+    ) AS video_id
+FROM {SOURCE_SCHEMA}.audio_events AS a
+JOIN (
+    SELECT max(id) AS id FROM {SOURCE_SCHEMA}.audio_events
+    WHERE id > :low AND id <= :high
+    GROUP BY file_name
+) AS latest ON latest.id = a.id
+"""
+
+_UPDATE_VIDEOS = """
+UPDATE main.videos
+SET summary = s.summary, detected_objects = s.detected_objects
+FROM temp.sync_videos AS s
+WHERE videos.storage_path = s.storage_path
+"""
+
+_INSERT_VIDEOS = """
+INSERT INTO main.videos
+    (filename, storage_path, summary, detected_objects, key_frames, created_at)
+SELECT
+    s.file_name, s.storage_path, s.summary, s.detected_objects, '[]',
+    coalesce(s.created_at, CURRENT_TIMESTAMP)
+FROM temp.sync_videos AS s
+WHERE NOT EXISTS (
+    SELECT 1 FROM main.videos AS v WHERE v.storage_path = s.storage_path
+)
+"""
+
+_UPDATE_TRANSCRIPTS = """
+UPDATE main.transcriptions
+SET
+    transcript = s.transcript,
+    confidence_score = s.confidence_score,
+    video_id = coalesce(s.video_id, transcriptions.video_id)
+FROM temp.sync_transcripts AS s
+WHERE transcriptions.storage_path = s.storage_path
+"""
+
+_INSERT_TRANSCRIPTS = """
+INSERT INTO main.transcriptions
+    (filename, storage_path, transcript, confidence_score, video_id, created_at)
+SELECT
+    s.file_name, s.storage_path, s.transcript, s.confidence_score, s.video_id,
+    coalesce(s.created_at, CURRENT_TIMESTAMP)
+FROM temp.sync_transcripts AS s
+WHERE NOT EXISTS (
+    SELECT 1 FROM main.transcriptions AS t WHERE t.storage_path = s.storage_path
+)
+"""
+
+
+@dataclass(slots=True)
+class SyncReport:
+    """Rows read from ``extraction.db`` and written to the backend tables."""
+
+    video_events: int = 0
+    audio_events: int = 0
+    videos_created: int = 0
+    videos_updated: int = 0
+    transcriptions_created: int = 0
+    transcriptions_updated: int = 0
+    seconds: float = 0.0
+
+    @property
+    def events(self) -> int:
+        return self.video_events + self.audio_events
+
+    @property
+    def changed(self) -> bool:
+        return bool(
+            self.videos_created
+            or self.videos_updated
+            or self.transcriptions_created
+            or self.transcriptions_updated
+        )
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "rows_per_second": self.rows_per_second}
+
+
+def sync_extraction_db(engine: Engine, settings: SyncSettings) -> SyncReport:
+    """Copy new offline extraction events into ``videos`` and ``transcriptions``.
+
+    ``extraction.db`` is attached to a backend connection and applied with a
+    handful of set-based statements per window of at most ``chunk_events``
+    event ids. Progress is kept in ``sync_state``, so each run only reads
+    events past the stored watermark, and re-running a window rewrites the
+    same rows instead of duplicating them. Offline rows are keyed by their
+    media path (``media_dir``/``file_name``).
+    """
+    if engine.dialect.name != "sqlite":
+        raise RuntimeError("Extraction sync requires a SQLite backend database.")
+    if not os.path.exists(settings.extraction_db_path):
+        raise FileNotFoundError(
+            f"Extraction database not found: {settings.extraction_db_path}"
+        )
+
+    report = SyncReport()
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        conn.exec_driver_sql(
+            f"ATTACH DATABASE ? AS {SOURCE_SCHEMA}", (settings.extraction_db_path,)
+        )
+        try:
+            while _sync_window(conn, settings, report):
+                pass
+        finally:
+            conn.rollback()
+            conn.exec_driver_sql(f"DETACH DATABASE {SOURCE_SCHEMA}")
+    report.seconds = time.perf_counter() - started
+
+    logger.info(
+        f"Synced {report.events} extraction events in {report.seconds:.2f}s "
+        f"({report.rows_per_second:.0f} rows/s): "
+        f"{report.videos_created} videos created, {report.videos_updated} updated; "
+        f"{report.transcriptions_created} transcriptions created, "
+        f"{report.transcriptions_updated} updated."
+    )
+    return report
+
+
+def _sync_window(conn: Connection, settings: SyncSettings, report: SyncReport) -> bool:
+    """Apply one window of events in a single transaction; False when caught up."""
+    source = settings.extraction_db_path
+    media_prefix = os.path.join(settings.media_dir, "")
+    video_low, audio_low = _watermarks(conn, source)
+    video_max, audio_max = (
+        _max_event_id(conn, "video_events"),
+        _max_event_id(conn, "audio_events"),
+    )
+    # A smaller max id means extraction.db was recreated; start over.
+    if video_max < video_low or audio_max < audio_low:
+        logger.warning(f"{source} was reset; syncing it from the beginning.")
+        video_low = audio_low = 0
+    if video_max == video_low and audio_max == audio_low:
+        return False
+
+    video_high = min(video_max, video_low + settings.chunk_events)
+    audio_high = min(audio_max, audio_low + settings.chunk_events)
+    try:
+        # Videos first, so transcripts in the same window can link to them.
+        video_params = {
+            "low": video_low,
+            "high": video_high,
+            "media_prefix": media_prefix,
+        }
+        conn.execute(text(_STAGE_VIDEOS), video_params)
+        report.videos_updated += conn.execute(text(_UPDATE_VIDEOS)).rowcount
+        report.videos_created += conn.execute(text(_INSERT_VIDEOS)).rowcount
+
+        audio_params = {**video_params, "low": audio_low, "high": audio_high}
+        conn.execute(text(_STAGE_TRANSCRIPTS), audio_params)
+        report.transcriptions_updated += conn.execute(
+            text(_UPDATE_TRANSCRIPTS)
+        ).rowcount
+        report.transcriptions_created += conn.execute(
+            text(_INSERT_TRANSCRIPTS)
+        ).rowcount
+
+        report.video_events += _count_events(
+            conn, "video_events", video_low, video_high
+        )
+        report.audio_events += _count_events(
+            conn, "audio_events", audio_low, audio_high
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO main.sync_state
+                    (source, video_event_id, audio_event_id, synced_at)
+                VALUES (:source, :video, :audio, CURRENT_TIMESTAMP)
+                ON CONFLICT (source) DO UPDATE SET
+                    video_event_id = excluded.video_event_id,
+                    audio_event_id = excluded.audio_event_id,
+                    synced_at = excluded.synced_at
+                """
+            ),
+            {"source": source, "video": video_high, "audio": audio_high},
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.exec_driver_sql("DROP TABLE IF EXISTS temp.sync_videos")
+        conn.exec_driver_sql("DROP TABLE IF EXISTS temp.sync_transcripts")
+        conn.commit()
+    return True
+
+
+def _watermarks(conn: Connection, source: str) -> tuple[int, int]:
+    row = conn.execute(
+        text(
+            "SELECT video_event_id, audio_event_id FROM main.sync_state "
+            "WHERE source = :source"
+        ),
+        {"source": source},
+    ).first()
+    return (row[0], row[1]) if row is not None else (0, 0)
+
+
+def _max_event_id(conn: Connection, table: str) -> int:
+    return conn.execute(
+        text(f"SELECT coalesce(max(id), 0) FROM {SOURCE_SCHEMA}.{table}")
+    ).scalar_one()
+
+
+def _count_events(conn: Connection, table: str, low: int, high: int) -> int:
+    return conn.execute(
+        text(
+            f"SELECT count(*) FROM {SOURCE_SCHEMA}.{table} "
+            "WHERE id > :low AND id <= :high"
+        ),
+        {"low": low, "high": high},
+    ).scalar_one()
+
+
+class ExtractionSyncTask:
+    """Run :func:`sync_extraction_db` at startup and then every ``interval_seconds``.
+
+    Each pass runs in a worker thread; ``on_change`` is called after a pass
+    that wrote rows (e.g. to clear the response cache, which only sees ORM
+    commits).
+    """
+
+    def __init__(
+        self,
+        settings: SyncSettings,
+        engine_factory: Callable[[], Engine],
+        on_change: Callable[[], None] | None = None,
+    ) -> None:
+        self.settings = settings
+        self.engine_factory = engine_factory
+        self.on_change = on_change
+        self.last_report: SyncReport | None = None
+        self.last_error: str | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._loop(), name="extraction-sync")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self) -> SyncReport | None:
+        try:
+            report = await asyncio.to_thread(
+                sync_extraction_db, self.engine_factory(), self.settings
+            )
+        except Exception as error:
+            logger.exception("Extraction sync failed.")
+            self.last_error = str(error)
+            return None
+        self.last_report, self.last_error = report, None
+        if report.changed and self.on_change is not None:
+            self.on_change()
+        return report
+
+    async def _loop(self) -> None:
+        while True:
+            await self.run_once()
+            if self.settings.interval_seconds <= 0:
+                return
+            await asyncio.sleep(self.settings.interval_seconds)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "enabled": True,
+            "source": self.settings.extraction_db_path,
+            "last_report": self.last_report.to_dict() if self.last_report else None,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Sequence
+
+from fastapi import UploadFile
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.database import new_async_session
+from backend.services.audio_processor import AudioProcessor
+from backend.services.batch_ingest import BatchEntry, BatchIngestor
+from backend.services.video_processor import VideoProcessor
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("video", "audio", "batch")
+
+
+async def recover_interrupted_jobs() -> int:
+    """Requeue jobs left ``running`` by a stopped process; returns their count."""
+    async with new_async_session() as db:
+        result = await db.execute(
+            update(models.Job)
+            .where(models.Job.status == "running")
+            .values(status="queued", started_at=None)
+        )
+        await db.commit()
+    return result.rowcount
+
+
+class JobRunner:
+    """Process uploads in the background, tracking progress in the ``jobs`` table.
+
+    Jobs are persisted before they are queued, so anything still queued or
+    running when the process stops is picked up again by the next ``start``.
+    With several server workers, only the parent recovers running jobs
+    (``recover_running=False`` in the workers) and each queued job is claimed
+    by exactly one worker.
+    """
+
+    def __init__(
+        self,
+        video_processor: VideoProcessor,
+        audio_processor: AudioProcessor,
+        workers: int = 2,
+        batch_ingestor: BatchIngestor | None = None,
+        recover_running: bool = True,
+    ) -> None:
+        self.processors: dict[str, VideoProcessor | AudioProcessor] = {
+            "video": video_processor,
+            "audio": audio_processor,
+        }
+        self.batch_ingestor = batch_ingestor
+        self.workers = workers
+        self.recover_running = recover_running
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        if self.recover_running:
+            await recover_interrupted_jobs()
+        async with new_async_session() as db:
+            pending = (
+                await db.scalars(
+                    select(models.Job.id)
+                    .where(models.Job.status == "queued")
+                    .order_by(models.Job.id)
+                )
+            ).all()
+
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+        if pending:
+            logger.info(f"Resuming {len(pending)} queued jobs.")
+
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, kind: str, file: UploadFile) -> models.Job:
+        """Store the upload, record a queued job and return it."""
+        stored = await self.processors[kind]._persist_file(file)
+        return await self._enqueue(
+            kind=kind, filename=file.filename, storage_path=stored.path
+        )
+
+    async def _enqueue(self, kind: str, filename: str, storage_path: str) -> models.Job:
+        async with new_async_session() as db:
+            job = models.Job(
+                kind=kind,
+                status="queued",
+                filename=filename,
+                storage_path=storage_path,
+            )
+            db.add(job)
+            await db.commit()
+            await db.refresh(job)
+
+        self._queue.put_nowait(job.id)
+        return job
+
+    async def submit_batch(self, entries: Sequence[BatchEntry]) -> models.Job:
+        """Record a queued job for files already stored by ``BatchIngestor``."""
+        if self.batch_ingestor is None:
+            raise RuntimeError("Batch jobs need a BatchIngestor.")
+        manifest_path = await asyncio.to_thread(
+            self.batch_ingestor.write_manifest, entries
+        )
+        return await self._enqueue(
+            kind="batch", filename=f"{len(entries)} files", storage_path=manifest_path
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception:
+                logger.exception(f"Job {job_id} crashed.")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: int) -> None:
+        async with new_async_session() as db:
+            claimed = await db.execute(
+                update(models.Job)
+                .where(models.Job.id == job_id, models.Job.status == "queued")
+                .values(status="running", started_at=datetime.now(timezone.utc))
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                return
+            job = await db.get(models.Job, job_id)
+            if job is None:
+                return
+
+            try:
+                if job.kind == "batch":
+                    result = await self._run_batch(job.storage_path, db)
+                else:
+                    result = await self.processors[job.kind].process_path(
+                        job.storage_path, filename=job.filename, db=db
+                    )
+            except Exception as error:
+                logger.exception(f"Job {job_id} failed.")
+                await db.rollback()
+                await db.refresh(job)
+                job.status = "failed"
+                job.error = str(error) or error.__class__.__name__
+            else:
+                job.status = "done"
+                if isinstance(result, models.Video):
+                    job.video_id = result.id
+                elif isinstance(result, models.Transcription):
+                    job.transcription_id = result.id
+                else:
+                    job.result = result
+
+            job.finished_at = datetime.now(timezone.utc)
+            await db.commit()
+
+    async def _run_batch(
+        self, manifest_path: str, db: AsyncSession
+    ) -> list[dict[str, Any]]:
+        if self.batch_ingestor is None:
+            raise RuntimeError("Batch jobs need a BatchIngestor.")
+        entries = await asyncio.to_thread(
+            self.batch_ingestor.read_manifest, manifest_path
+        )
+        return await self.batch_ingestor.ingest(entries, db)
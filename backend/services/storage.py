@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, TypeVar
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import models
+from backend.metrics import UPLOAD_BYTES, UPLOADS
+from backend.settings import UploadSettings
+
+ProcessedT = TypeVar("ProcessedT", models.Video, models.Transcription)
+
+
+@dataclass(slots=True)
+class StoredUpload:
+    path: str
+    sha256: str
+    size: int
+
+
+async def stream_upload(
+    file: UploadFile, dest_dir: str, upload_settings: UploadSettings
+) -> StoredUpload:
+    """Copy an upload to ``dest_dir`` in chunks, hashing it on the way.
+
+    The upload is written to a temporary file next to its destination and only
+    renamed into place once complete, so readers never see partial files. Files
+    are named by their SHA-256, so identical uploads share one file and
+    different files with the same name never overwrite each other.
+    """
+    max_bytes = upload_settings.max_upload_bytes
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    os.makedirs(dest_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix=".upload-", suffix=".part")
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := await file.read(upload_settings.chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                await asyncio.to_thread(_write_chunk, buffer, hasher, chunk)
+
+        sha256 = hasher.hexdigest()
+        dest_path = os.path.join(dest_dir, content_filename(sha256, file.filename))
+        await asyncio.to_thread(os.replace, tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    await file.seek(0)
+    _count_upload(size)
+    return StoredUpload(path=dest_path, sha256=sha256, size=size)
+
+
+def store_stream(
+    source: BinaryIO,
+    filename: str | None,
+    dest_dir: str,
+    upload_settings: UploadSettings,
+) -> StoredUpload:
+    """Blocking counterpart of :func:`stream_upload` for plain file objects.
+
+    Used for archive members, which are read and written chunk by chunk.
+    """
+    max_bytes = upload_settings.max_upload_bytes
+    os.makedirs(dest_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix=".upload-", suffix=".part")
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := source.read(upload_settings.chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                _write_chunk(buffer, hasher, chunk)
+
+        sha256 = hasher.hexdigest()
+        dest_path = os.path.join(dest_dir, content_filename(sha256, filename))
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    _count_upload(size)
+    return StoredUpload(path=dest_path, sha256=sha256, size=size)
+
+
+def content_filename(sha256: str, filename: str | None) -> str:
+    """Name a stored file by its digest, keeping the original extension."""
+    return sha256 + os.path.splitext(filename or "")[1].lower()
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+async def find_by_content_hash(
+    db: AsyncSession, model: type[ProcessedT], content_hash: str
+) -> ProcessedT | None:
+    """Return the earliest processed row for ``content_hash``, if any."""
+    return await db.scalar(
+        select(model)
+        .where(model.content_hash == content_hash)
+        .order_by(model.id)
+        .limit(1)
+    )
+
+
+async def save_processed(db: AsyncSession, row: ProcessedT) -> ProcessedT:
+    """Insert ``row``, or return the row stored first for its ``content_hash``.
+
+    ``content_hash`` is unique, so when identical uploads race past
+    :func:`find_by_content_hash`, the later commit fails and is answered with
+    the earlier row.
+    """
+    db.add(row)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        if row.content_hash is None:
+            raise
+        existing = await find_by_content_hash(db, type(row), row.content_hash)
+        if existing is None:
+            raise
+        return existing
+    await db.refresh(row)
+    return row
+
+
+def _count_upload(size: int) -> None:
+    UPLOADS.inc()
+    UPLOAD_BYTES.inc(size)
+
+
+def _write_chunk(buffer: BinaryIO, hasher: "hashlib._Hash", chunk: bytes) -> None:
+    hasher.update(chunk)
+    buffer.write(chunk)
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Upload exceeds the maximum size of {max_bytes} bytes.",
+    )
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import shutil
+import statistics
+import subprocess
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, List
+
+from backend.services.batching import MicroBatcher
+from backend.services.executor import run_blocking
+from backend.settings import TranscriptionSettings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16_000
+
+
+class AudioDecodeError(ValueError):
+    """The file is not audio that the installed decoders can read."""
+
+
+def _ffmpeg_decode(audio_path: str) -> np.ndarray:
+    """Decode with ffmpeg to 16 kHz mono, as the offline pipeline does.
+
+    Its resampler low-pass filters, so 44.1/48 kHz input does not alias.
+    """
+    import numpy as np
+
+    command = [
+        "ffmpeg", "-nostdin", "-v", "error", "-i", audio_path,
+        "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-",
+    ]  # fmt: skip
+    try:
+        completed = subprocess.run(command, capture_output=True, check=True)
+    except subprocess.CalledProcessError as error:
+        reason = error.stderr.decode(errors="replace").strip().splitlines()
+        raise AudioDecodeError(
+            f"Could not decode audio: {reason[-1] if reason else 'unknown format'}"
+        ) from error
+    return np.frombuffer(completed.stdout, dtype=np.float32)
+
+
+def load_audio(audio_path: str) -> np.ndarray:
+    """Read audio as 16 kHz mono float32.
+
+    16 kHz files that libsndfile reads are used as they are; every other format
+    or sample rate is decoded and resampled by ffmpeg.
+    """
+    import soundfile as sf
+
+    try:
+        audio, sample_rate = sf.read(audio_path, dtype="float32", always_2d=True)
+    except sf.LibsndfileError as error:
+        if shutil.which("ffmpeg") is None:
+            raise AudioDecodeError(
+                f"Unsupported audio format ({error}); install ffmpeg for more."
+            ) from error
+        return _ffmpeg_decode(audio_path)
+    if sample_rate == SAMPLE_RATE:
+        return audio.mean(axis=1)
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError(f"ffmpeg is required to resample {sample_rate} Hz audio.")
+    return _ffmpeg_decode(audio_path)
+
+
+def load_audio_windows(audio_path: str, window_seconds: float) -> List[np.ndarray]:
+    """Read audio as 16 kHz mono float32 and cut it into Whisper-sized windows."""
+    audio = load_audio(audio_path)
+    window = int(window_seconds * SAMPLE_RATE)
+    return [audio[start : start + window] for start in range(0, len(audio), window)]
+
+
+class WhisperTranscriber:
+    """Shared Whisper model that transcribes concurrent requests in micro-batches.
+
+    Uses the same checkpoint and decoding setup as the offline
+    ``ExtractionPipeline``. The model is loaded once, by ``start`` or ``preload``.
+    """
+
+    def __init__(
+        self,
+        settings: TranscriptionSettings,
+        executor: Executor | None = None,
+        thread_nice: int = 0,
+    ) -> None:
+        self.settings = settings
+        self.executor = executor
+        self.batcher: MicroBatcher[np.ndarray, tuple[str, float]] = MicroBatcher(
+            name="whisper",
+            batch_fn=self._generate,
+            max_batch_size=settings.max_batch_size,
+            max_wait_ms=settings.max_wait_ms,
+            max_concurrency=settings.max_concurrency,
+            thread_nice=thread_nice,
+        )
+        self._processor: Any = None
+        self._model: Any = None
+        self._forced_decoder_ids: Any = None
+        self._device = "cpu"
+
+    def preload(self) -> None:
+        """Load the model now, e.g. in the server process before it forks workers."""
+        if self._model is None:
+            self._load_model()
+
+    async def start(self) -> None:
+        if self._model is not None:
+            await self.batcher.start()
+            return
+        await self.batcher.start(run_blocking(self.executor, self._load_model))
+
+    async def stop(self) -> None:
+        await self.batcher.stop()
+
+    async def transcribe(self, audio_path: str) -> tuple[str, float]:
+        """Transcribe a file, returning its text and mean token probability."""
+        windows = await run_blocking(
+            self.executor, load_audio_windows, audio_path, self.settings.window_seconds
+        )
+        results = await asyncio.gather(
+            *(self.batcher.submit(window) for window in windows)
+        )
+        texts = [text.strip() for text, _ in results if text.strip()]
+        confidence = statistics.fmean(score for _, score in results) if results else 0.0
+        return " ".join(texts), confidence
+
+    def _load_model(self) -> None:
+        import torch
+        from transformers import WhisperForConditionalGeneration, WhisperProcessor
+
+        self._device = "cuda" if torch.cuda.is_available() else "cpu"
+        logger.info(f"Loading {self.settings.model} on {self._device}.")
+        self._processor = WhisperProcessor.from_pretrained(
+            pretrained_model_name_or_path=self.settings.model
+        )
+        self._model = WhisperForConditionalGeneration.from_pretrained(
+            pretrained_model_name_or_path=self.settings.model
+        ).to(self._device)
+        self._model.eval()
+        self._forced_decoder_ids = self._processor.get_decoder_prompt_ids(
+            language=self.settings.language, task=self.settings.task
+        )
+
+    def _generate(self, windows: List[np.ndarray]) -> List[tuple[str, float]]:
+        """Run one batched ``generate`` over audio windows."""
+        import numpy as np
+        import torch
+
+        inputs = self._processor(
+            windows, sampling_rate=SAMPLE_RATE, return_tensors="pt"
+        )
+        with torch.inference_mode():
+            outputs: Any = self._model.generate(
+                input_features=inputs.input_features.to(self._device),
+                return_dict_in_generate=True,
+                output_scores=True,
+                forced_decoder_ids=self._forced_decoder_ids,
+            )
+            transition_scores = self._model.compute_transition_scores(
+                outputs.sequences, outputs.scores, normalize_logits=True
+            )
+
+        texts = self._processor.batch_decode(
+            outputs.sequences, skip_special_tokens=True
+        )
+        generated = outputs.sequences[:, -transition_scores.shape[1] :].cpu().numpy()
+        log_probs = transition_scores.cpu().numpy()
+        eos_token_ids = np.atleast_1d(self._model.generation_config.eos_token_id)
+
+        results = []
+        for text, tokens, scores in zip(texts, generated, log_probs):
+            # Tokens after the first end-of-text are batch padding.
+            ends = np.flatnonzero(np.isin(tokens, eos_token_ids))
+            length = int(ends[0]) + 1 if len(ends) else len(tokens)
+            confidence = float(np.mean(np.exp(scores[:length]))) if length else 0.0
+            results.append((text, confidence))
+        return results
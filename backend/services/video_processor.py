@@ -1,83 +1,203 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, List, Sequence, Tuple
 
-import cv2
 from fastapi import UploadFile
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend import models
+from backend.metrics import STAGE_SECONDS
+from backend.services.detector import YoloDetector
+from backend.services.executor import lower_thread_priority, run_blocking
+from backend.services.storage import (
+    StoredUpload,
+    file_sha256,
+    find_by_content_hash,
+    save_processed,
+    stream_upload,
+)
 from backend.settings import AppSettings
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class VideoProcessor:
     """Process uploaded videos by extracting key frames and object summaries."""
 
-    def __init__(self, settings: AppSettings, frame_interval: int = 30, max_frames: int = 5) -> None:
+    def __init__(
+        self,
+        settings: AppSettings,
+        frame_interval: int = 30,
+        max_frames: int = 5,
+        executor: Executor | None = None,
+        seek_threshold: int = 300,
+        encode_workers: int = 4,
+        detector: YoloDetector | None = None,
+    ) -> None:
         self.settings = settings
+        self.detector = detector
         self.frame_interval = frame_interval
         self.max_frames = max_frames
+        self.executor = executor
+        # Intervals at least this long seek instead of grabbing every frame.
+        # Grabbing is cheaper for dense sampling, so the default interval of
+        # 30 frames never seeks; only sparse sampling (300 frames is about
+        # 10 s at 30 fps) does.
+        self.seek_threshold = seek_threshold
+        # Encoding is processing work too, so it yields the CPU like the
+        # processing executor does.
+        self._encode_pool = ThreadPoolExecutor(
+            max_workers=encode_workers,
+            thread_name_prefix="keyframe-encode",
+            initializer=lower_thread_priority,
+            initargs=(settings.processing.nice,),
+        )
+
+    def close(self) -> None:
+        """Wait for pending key-frame writes and stop the encoder threads."""
+        self._encode_pool.shutdown(wait=True)
 
-    async def process(self, file: UploadFile, db: Session) -> models.Video:
-        video_path = await self._persist_file(file)
-        key_frames = self._extract_key_frames(video_path)
-        detected_objects = self._detect_objects(key_frames)
+    async def process(self, file: UploadFile, db: AsyncSession) -> models.Video:
+        with STAGE_SECONDS.labels("video", "persist").time():
+            stored = await self._persist_file(file)
+        return await self.process_path(
+            stored.path, filename=file.filename, db=db, content_hash=stored.sha256
+        )
+
+    async def process_path(
+        self,
+        video_path: str,
+        filename: str,
+        db: AsyncSession,
+        content_hash: str | None = None,
+    ) -> models.Video:
+        """Analyse a video that is already in storage and record the results.
+
+        Content that was analysed before is answered with the stored row
+        without decoding the video again.
+        """
+        if content_hash is None:
+            content_hash = await run_blocking(self.executor, file_sha256, video_path)
+        existing = await find_by_content_hash(db, models.Video, content_hash)
+        if existing is not None:
+            return existing
+
+        video = await self.analyse(
+            video_path, filename=filename, content_hash=content_hash
+        )
+        with STAGE_SECONDS.labels("video", "db_commit").time():
+            return await save_processed(db, video)
+
+    async def analyse(
+        self, video_path: str, filename: str, content_hash: str
+    ) -> models.Video:
+        """Extract key frames and detections into an unsaved ``Video``."""
+        with STAGE_SECONDS.labels("video", "key_frames").time():
+            key_frames, frames = await run_blocking(
+                self.executor, self._extract_key_frames_with_images, video_path
+            )
+        with STAGE_SECONDS.labels("video", "detection").time():
+            if self.detector is not None:
+                detected_objects = await self.detector.detect(frames)
+            else:
+                detected_objects = await run_blocking(
+                    self.executor, self._detect_objects, frames
+                )
         summary = self._summarize(detected_objects)
 
-        video = models.Video(
-            filename=file.filename,
+        return models.Video(
+            filename=filename,
             storage_path=video_path,
+            content_hash=content_hash,
             key_frames=key_frames,
             detected_objects=detected_objects,
             summary=summary,
         )
-        db.add(video)
-        db.commit()
-        db.refresh(video)
-        return video
-
-    async def _persist_file(self, file: UploadFile) -> str:
-        dest_path = os.path.join(self.settings.storage.video_input_dir, file.filename)
-        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-        contents = await file.read()
-        with open(dest_path, "wb") as buffer:
-            buffer.write(contents)
-        await file.seek(0)
-        return dest_path
+
+    async def _persist_file(self, file: UploadFile) -> StoredUpload:
+        return await stream_upload(
+            file,
+            dest_dir=self.settings.storage.video_input_dir,
+            upload_settings=self.settings.upload,
+        )
 
     def _extract_key_frames(self, video_path: str) -> List[str]:
+        key_frames, _ = self._extract_key_frames_with_images(video_path)
+        return key_frames
+
+    def _extract_key_frames_with_images(
+        self, video_path: str
+    ) -> Tuple[List[str], List[np.ndarray]]:
+        """Sample every ``frame_interval``-th frame and save it as a JPEG.
+
+        Skipped frames are only grabbed (or seeked over for sparse sampling),
+        never converted, and JPEG encoding runs in parallel with decoding. The
+        decoded frames are returned alongside their paths for detection.
+        """
+        import cv2
+
+        os.makedirs(self.settings.storage.key_frame_dir, exist_ok=True)
         capture = cv2.VideoCapture(video_path)
-        saved_frames: List[str] = []
-        success, frame = capture.read()
+        seek = self.frame_interval >= self.seek_threshold
+        frames: List[np.ndarray] = []
+        writes: List[Tuple[str, Future[bool]]] = []
         frame_idx = 0
 
-        while success and len(saved_frames) < self.max_frames:
-            if frame_idx % self.frame_interval == 0:
+        try:
+            while len(frames) < self.max_frames:
+                if seek and frame_idx:
+                    capture.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                if not capture.grab():
+                    break
+                success, frame = capture.retrieve()
+                if not success:
+                    break
+
                 frame_name = f"{Path(video_path).stem}_frame_{frame_idx:04d}.jpg"
                 frame_path = os.path.join(self.settings.storage.key_frame_dir, frame_name)
-                os.makedirs(os.path.dirname(frame_path), exist_ok=True)
-                cv2.imwrite(frame_path, frame)
-                rel_path = os.path.relpath(
+                write = self._encode_pool.submit(cv2.imwrite, frame_path, frame)
+                writes.append((frame_path, write))
+                frames.append(frame)
+                if len(frames) >= self.max_frames:
+                    break
+
+                if seek:
+                    frame_idx += self.frame_interval
+                    continue
+                for _ in range(self.frame_interval - 1):
+                    if not capture.grab():
+                        break
+                frame_idx += self.frame_interval
+        finally:
+            capture.release()
+
+        saved_frames: List[str] = []
+        saved_images: List[np.ndarray] = []
+        for (frame_path, write), frame in zip(writes, frames):
+            if not write.result():
+                continue
+            saved_frames.append(
+                os.path.relpath(
                     frame_path, start=self.settings.storage.processed_data_dir
                 ).replace("\\", "/")
-                saved_frames.append(rel_path)
-            success, frame = capture.read()
-            frame_idx += 1
+            )
+            saved_images.append(frame)
+        return saved_frames, saved_images
 
-        capture.release()
-        return saved_frames
+    def _detect_objects(self, key_frames: Sequence[str | np.ndarray]) -> List[str]:
+        """Label key frames given either as decoded images or stored paths.
 
-    def _detect_objects(self, key_frames: List[str]) -> List[str]:
+        Heuristic fallback used when no YOLO detector is configured.
+        """
         objects: set[str] = set()
-        for frame_path in key_frames:
-            full_path = os.path.normpath(
-                frame_path
-                if os.path.isabs(frame_path)
-                else os.path.join(self.settings.storage.processed_data_dir, frame_path)
+        for key_frame in key_frames:
+            frame = (
+                self._load_frame(key_frame) if isinstance(key_frame, str) else key_frame
             )
-            frame = cv2.imread(full_path)
             if frame is None:
                 continue
             brightness = frame.mean()
@@ -95,6 +215,16 @@ class VideoProcessor:
 
         return sorted(objects) if objects else ["unclassified"]
 
+    def _load_frame(self, frame_path: str) -> np.ndarray | None:
+        import cv2
+
+        full_path = os.path.normpath(
+            frame_path
+            if os.path.isabs(frame_path)
+            else os.path.join(self.settings.storage.processed_data_dir, frame_path)
+        )
+        return cv2.imread(full_path)
+
     def _summarize(self, detected_objects: List[str]) -> str:
         return (
             "Detected objects: " + ", ".join(detected_objects)
@@ -0,0 +1,238 @@
+"""Run the backend under uvicorn with one or more worker processes.
+
+Several uvicorn workers need an import string instead of an app object, so
+``serve`` writes the resolved config to a file named by ``BACKEND_CONFIG`` and
+``app_factory`` rebuilds the app from it in each worker. The same factory
+works from the command line:
+
+    BACKEND_CONFIG=config/backend_app.yaml \\
+        uvicorn backend.serving:app_factory --factory --workers 4
+
+On POSIX with ``backend.preload_models`` on, ``serve`` uses a pre-fork model
+instead. The parent builds the app, prepares the schema, requeues interrupted
+jobs and loads the models. It then forks ``backend.workers`` children, which
+share the listening socket and, copy-on-write, the model weights.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI
+from omegaconf import DictConfig, OmegaConf
+
+from backend.database import dispose_engines, ensure_schema, init_database
+from backend.services.job_runner import recover_interrupted_jobs
+from backend.settings import AppSettings, build_settings
+
+logger = logging.getLogger(__name__)
+
+CONFIG_ENV = "BACKEND_CONFIG"
+PROJECT_ROOT_ENV = "BACKEND_PROJECT_ROOT"
+APP_FACTORY = "backend.serving:app_factory"
+
+# A worker that exits sooner than this after being forked is restarted only
+# after a pause, so a startup error does not turn into a fork loop.
+_MIN_WORKER_LIFETIME = 5.0
+
+
+def app_factory() -> FastAPI:
+    """Build the app from ``$BACKEND_CONFIG`` (for ``uvicorn --factory``)."""
+    from backend.app import create_app
+
+    config_path = os.environ.get(CONFIG_ENV)
+    if not config_path:
+        raise RuntimeError(f"Set {CONFIG_ENV} to the backend config file.")
+    return create_app(
+        OmegaConf.load(config_path), project_root=os.environ.get(PROJECT_ROOT_ENV)
+    )
+
+
+def export_config(cfg: DictConfig, project_root: str | None) -> str:
+    """Write the resolved ``cfg`` where ``app_factory`` finds it; returns the path."""
+    handle, path = tempfile.mkstemp(prefix="backend_app_", suffix=".yaml")
+    os.close(handle)
+    OmegaConf.save(OmegaConf.create(OmegaConf.to_container(cfg, resolve=True)), path)
+    os.environ[CONFIG_ENV] = path
+    if project_root is not None:
+        os.environ[PROJECT_ROOT_ENV] = project_root
+    return path
+
+
+def serve(cfg: DictConfig, project_root: str | None = None) -> None:
+    """Serve the app with ``backend.workers`` processes."""
+    from backend.app import create_app
+
+    settings = _build_settings(cfg, project_root)
+    server = settings.server
+    if server.workers == 1 and not server.reload:
+        uvicorn.run(
+            create_app(cfg=cfg, project_root=project_root),
+            host=server.host,
+            port=server.port,
+        )
+        return
+
+    if server.reload and server.workers > 1:
+        logger.warning("backend.reload is set; serving with a single worker.")
+    if server.workers > 1 and server.preload_models and hasattr(os, "fork"):
+        app = create_app(cfg=cfg, project_root=project_root)
+        prepare_database(settings)
+        preload_models(app)
+        serve_prefork(app, settings)
+        return
+
+    config_path = export_config(cfg, project_root)
+    try:
+        if server.workers > 1:
+            prepare_database(settings)
+        uvicorn.run(
+            APP_FACTORY,
+            factory=True,
+            host=server.host,
+            port=server.port,
+            reload=server.reload,
+            workers=1 if server.reload else server.workers,
+        )
+    finally:
+        os.unlink(config_path)
+
+
+def prepare_database(settings: AppSettings) -> None:
+    """Create the schema and requeue interrupted jobs once, before any worker.
+
+    Workers then find the schema in place instead of racing to create it, and
+    none of them resets jobs that another worker is running.
+    """
+    init_database(settings.database.url, settings.database, prepare_schema=False)
+    ensure_schema()
+    recovered = asyncio.run(recover_interrupted_jobs())
+    if recovered:
+        logger.info(f"Requeued {recovered} interrupted jobs.")
+    # No pooled connection may be shared with forked children.
+    asyncio.run(dispose_engines())
+
+
+def preload_models(app: FastAPI) -> list[str]:
+    """Load the app's models in this process so forked workers share them."""
+    models = app.state.models
+    if not models:
+        return []
+    try:
+        import torch
+    except ImportError:
+        logger.warning("torch is not installed; workers will report model errors.")
+        return []
+    if torch.cuda.is_available():
+        # A CUDA context does not survive fork; each worker loads its own copy.
+        logger.info("CUDA is available; models are loaded in each worker.")
+        return []
+
+    loaded = []
+    for model in models:
+        name = model.batcher.name
+        try:
+            model.preload()
+        except Exception:
+            logger.exception(f"Preloading {name} failed; workers will load it.")
+        else:
+            loaded.append(name)
+    logger.info(f"Preloaded {loaded} before forking workers.")
+    return loaded
+
+
+def serve_prefork(app: FastAPI, settings: AppSettings) -> None:
+    """Fork ``backend.workers`` uvicorn servers on one shared socket.
+
+    The parent only supervises: it restarts workers that exit unexpectedly and
+    forwards ``SIGINT``/``SIGTERM`` so every worker shuts down gracefully.
+    """
+    server = settings.server
+    config = uvicorn.Config(app, host=server.host, port=server.port)
+    sock = config.bind_socket()
+    children: dict[int, tuple[int, float]] = {}
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(config, sock, server.workers)
+        children[pid] = (index, time.monotonic())
+
+    def stop(signum: int, frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    # Move everything allocated so far (app, model weights) out of the
+    # collector's reach so the children's GC passes do not dirty those pages.
+    gc.freeze()
+    for index in range(server.workers):
+        spawn(index)
+    logger.info(
+        f"Serving on {server.host}:{server.port} with {server.workers} workers "
+        f"(pids {sorted(children)})."
+    )
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index, started = children.pop(pid, (None, 0.0))
+        if index is None or stopping:
+            continue
+        code = os.waitstatus_to_exitcode(status)
+        logger.warning(f"Worker {pid} exited with {code}; restarting it.")
+        if time.monotonic() - started < _MIN_WORKER_LIFETIME:
+            time.sleep(1.0)
+        if not stopping:
+            spawn(index)
+    sock.close()
+
+
+def _run_worker(config: uvicorn.Config, sock: socket.socket, workers: int) -> None:
+    """Child side of the fork: serve until signalled, then exit the process."""
+    code = 0
+    try:
+        # Own process group: a terminal Ctrl+C reaches only the parent, which
+        # then stops each worker once instead of twice (a forced exit).
+        os.setpgid(0, 0)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        if "torch" in sys.modules:
+            # Split the cores between workers instead of oversubscribing them.
+            torch = sys.modules["torch"]
+            torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+        uvicorn.Server(config).run(sockets=[sock])
+    except SystemExit as error:
+        code = error.code if isinstance(error.code, int) else 1
+    except BaseException:
+        logger.exception("Worker crashed.")
+        code = 1
+    finally:
+        logging.shutdown()
+        os._exit(code)
+
+
+def _build_settings(cfg: DictConfig, project_root: str | None) -> AppSettings:
+    resolved: dict[str, Any] = OmegaConf.to_container(
+        cfg, resolve=True, throw_on_missing=True
+    )  # type: ignore[assignment]
+    return build_settings(resolved, project_root=project_root)
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict
 
+from omegaconf import OmegaConf
+
+# Applied to every SQLite connection unless ``database.pragmas`` overrides them.
+DEFAULT_SQLITE_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+}
+
 
 @dataclass(slots=True)
 class StorageSettings:
@@ -18,6 +27,11 @@ class StorageSettings:
 @dataclass(slots=True)
 class DatabaseSettings:
     url: str
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_pre_ping: bool = False
+    pragmas: Dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass(slots=True)
@@ -25,6 +39,100 @@ class ServerSettings:
     host: str
     port: int
     reload: bool
+    workers: int
+    preload_models: bool
+
+
+@dataclass(slots=True)
+class UploadSettings:
+    chunk_size: int
+    max_upload_bytes: int
+    max_request_bytes: int
+
+
+@dataclass(slots=True)
+class ProcessingSettings:
+    max_workers: int
+    nice: int
+
+
+@dataclass(slots=True)
+class AdmissionSettings:
+    enabled: bool
+    max_in_flight: int
+    max_queue: int
+    queue_timeout_seconds: float
+    per_client_limit: int
+    client_header: str | None
+    retry_after_seconds: int
+
+
+@dataclass(slots=True)
+class JobSettings:
+    workers: int
+
+
+@dataclass(slots=True)
+class BatchSettings:
+    max_entries: int
+    max_concurrency: int
+    commit_size: int
+
+
+@dataclass(slots=True)
+class CacheSettings:
+    enabled: bool
+    max_entries: int
+    ttl_seconds: float
+
+
+@dataclass(slots=True)
+class MetricsSettings:
+    enabled: bool
+
+
+@dataclass(slots=True)
+class SerializationSettings:
+    validate_rows: bool
+    ndjson_chunk_rows: int
+
+
+@dataclass(slots=True)
+class TranscriptionSettings:
+    enabled: bool
+    model: str
+    task: str
+    language: str
+    window_seconds: float
+    max_batch_size: int
+    max_wait_ms: float
+    max_concurrency: int
+
+
+@dataclass(slots=True)
+class DetectionSettings:
+    enabled: bool
+    model: str
+    confidence: float
+    max_batch_size: int
+    max_wait_ms: float
+    max_concurrency: int
+
+
+@dataclass(slots=True)
+class SyncSettings:
+    enabled: bool
+    extraction_db_path: str
+    media_dir: str
+    interval_seconds: float
+    chunk_events: int
+
+
+@dataclass(slots=True)
+class EventsSettings:
+    enabled: bool
+    extraction_db_path: str
+    max_results: int
 
 
 @dataclass(slots=True)
@@ -32,6 +140,18 @@ class AppSettings:
     storage: StorageSettings
     database: DatabaseSettings
     server: ServerSettings
+    upload: UploadSettings
+    processing: ProcessingSettings
+    admission: AdmissionSettings
+    jobs: JobSettings
+    batch: BatchSettings
+    cache: CacheSettings
+    metrics: MetricsSettings
+    serialization: SerializationSettings
+    transcription: TranscriptionSettings
+    detection: DetectionSettings
+    sync: SyncSettings
+    events: EventsSettings
     project_root: str
 
 
@@ -65,23 +185,178 @@ def build_settings(config: Dict[str, Any], project_root: str | None = None) -> A
         sqlite_path = database_url.replace("sqlite:///", "", 1)
         database_url = f"sqlite:///{_resolve(sqlite_path)}"
 
-    database = DatabaseSettings(url=database_url)
+    database = DatabaseSettings(
+        url=database_url,
+        pool_size=int(database_config.get("pool_size", 5)),
+        max_overflow=int(database_config.get("max_overflow", 10)),
+        pool_timeout=float(database_config.get("pool_timeout", 30.0)),
+        pool_pre_ping=bool(database_config.get("pool_pre_ping", False)),
+        pragmas=dict(database_config.get("pragmas", DEFAULT_SQLITE_PRAGMAS)),
+    )
 
     backend_config: Dict[str, Any] = config.get("backend", {})
     server = ServerSettings(
         host=backend_config.get("host", "0.0.0.0"),
         port=int(backend_config.get("port", 8000)),
         reload=bool(backend_config.get("reload", False)),
+        workers=max(1, int(backend_config.get("workers", 1))),
+        preload_models=bool(backend_config.get("preload_models", True)),
+    )
+    if server.workers > 1 and database.url.startswith("sqlite"):
+        # Several processes share the file: readers must not block the writer,
+        # and a writer waits for the lock instead of failing with "locked".
+        database.pragmas["journal_mode"] = "WAL"
+        database.pragmas.setdefault(
+            "busy_timeout", DEFAULT_SQLITE_PRAGMAS["busy_timeout"]
+        )
+
+    upload_config: Dict[str, Any] = config.get("upload", {})
+    max_upload_bytes = int(upload_config.get("max_upload_mb", 2048)) * 1024 * 1024
+    max_request_mb = upload_config.get("max_request_mb")
+    upload = UploadSettings(
+        chunk_size=int(upload_config.get("chunk_size_bytes", 1024 * 1024)),
+        max_upload_bytes=max_upload_bytes,
+        # One maximum-size file plus room for the multipart framing.
+        max_request_bytes=(
+            int(max_request_mb) * 1024 * 1024
+            if max_request_mb is not None
+            else max_upload_bytes + 1024 * 1024
+        ),
+    )
+
+    processing_config: Dict[str, Any] = config.get("processing", {})
+    processing = ProcessingSettings(
+        max_workers=int(processing_config.get("max_workers", 2)),
+        nice=max(0, int(processing_config.get("nice", 10))),
+    )
+
+    admission_config: Dict[str, Any] = config.get("admission", {})
+    admission = AdmissionSettings(
+        enabled=bool(admission_config.get("enabled", True)),
+        max_in_flight=max(1, int(admission_config.get("max_in_flight", 4))),
+        max_queue=max(0, int(admission_config.get("max_queue", 16))),
+        queue_timeout_seconds=float(
+            admission_config.get("queue_timeout_seconds", 30.0)
+        ),
+        per_client_limit=max(0, int(admission_config.get("per_client_limit", 0))),
+        client_header=admission_config.get("client_header") or None,
+        retry_after_seconds=max(
+            1, int(admission_config.get("retry_after_seconds", 5))
+        ),
+    )
+
+    jobs_config: Dict[str, Any] = config.get("jobs", {})
+    jobs = JobSettings(workers=int(jobs_config.get("workers", 2)))
+
+    batch_config: Dict[str, Any] = config.get("batch", {})
+    batch = BatchSettings(
+        max_entries=int(batch_config.get("max_entries", 1000)),
+        max_concurrency=int(batch_config.get("max_concurrency", 4)),
+        commit_size=int(batch_config.get("commit_size", 50)),
+    )
+
+    cache_config: Dict[str, Any] = config.get("cache", {})
+    cache = CacheSettings(
+        enabled=bool(cache_config.get("enabled", True)),
+        max_entries=int(cache_config.get("max_entries", 256)),
+        ttl_seconds=float(cache_config.get("ttl_seconds", 30.0)),
+    )
+
+    metrics_config: Dict[str, Any] = config.get("metrics", {})
+    metrics = MetricsSettings(enabled=bool(metrics_config.get("enabled", True)))
+
+    serialization_config: Dict[str, Any] = config.get("serialization", {})
+    serialization = SerializationSettings(
+        validate_rows=bool(serialization_config.get("validate_rows", False)),
+        ndjson_chunk_rows=int(serialization_config.get("ndjson_chunk_rows", 500)),
+    )
+
+    transcription_config: Dict[str, Any] = config.get("transcription", {})
+    transcription = TranscriptionSettings(
+        enabled=bool(transcription_config.get("enabled", False)),
+        model=str(transcription_config.get("model", "openai/whisper-small.en")),
+        task=str(transcription_config.get("task", "transcribe")),
+        language=str(transcription_config.get("language", "en")),
+        window_seconds=float(transcription_config.get("window_seconds", 30.0)),
+        max_batch_size=int(transcription_config.get("max_batch_size", 8)),
+        max_wait_ms=float(transcription_config.get("max_wait_ms", 10.0)),
+        max_concurrency=int(transcription_config.get("max_concurrency", 1)),
+    )
+
+    detection_config: Dict[str, Any] = config.get("detection", {})
+    extract_config_path = _resolve(
+        detection_config.get("extract_config", "config/extract_config.yaml")
+    )
+    detection = DetectionSettings(
+        enabled=bool(detection_config.get("enabled", False)),
+        model=str(
+            detection_config.get("model")
+            or _extraction_setting(
+                extract_config_path, "video.video_model", "yolov8s.pt"
+            )
+        ),
+        confidence=float(detection_config.get("confidence", 0.25)),
+        max_batch_size=int(detection_config.get("max_batch_size", 16)),
+        max_wait_ms=float(detection_config.get("max_wait_ms", 10.0)),
+        max_concurrency=int(detection_config.get("max_concurrency", 1)),
+    )
+
+    extraction_db_path = _extraction_setting(
+        extract_config_path,
+        "database.db_path",
+        os.path.join(preprocessing_dir, "extraction.db"),
+    )
+    sync_config: Dict[str, Any] = config.get("sync", {})
+    sync = SyncSettings(
+        enabled=bool(sync_config.get("enabled", False)),
+        extraction_db_path=_resolve(
+            sync_config.get("extraction_db") or extraction_db_path
+        ),
+        media_dir=_resolve(
+            sync_config.get("media_dir")
+            or _extraction_setting(extract_config_path, "dir_path", raw_dir)
+        ),
+        interval_seconds=float(sync_config.get("interval_seconds", 60.0)),
+        chunk_events=int(sync_config.get("chunk_events", 100_000)),
+    )
+
+    events_config: Dict[str, Any] = config.get("events", {})
+    events = EventsSettings(
+        enabled=bool(events_config.get("enabled", True)),
+        extraction_db_path=_resolve(
+            events_config.get("extraction_db") or extraction_db_path
+        ),
+        max_results=max(1, int(events_config.get("max_results", 10_000))),
     )
 
     return AppSettings(
         storage=storage,
         database=database,
         server=server,
+        upload=upload,
+        processing=processing,
+        admission=admission,
+        jobs=jobs,
+        batch=batch,
+        cache=cache,
+        metrics=metrics,
+        serialization=serialization,
+        transcription=transcription,
+        detection=detection,
+        sync=sync,
+        events=events,
         project_root=base_path,
     )
 
 
+def _extraction_setting(extract_config_path: str, key: str, default: str) -> str:
+    """Value of ``key`` in the offline extraction pipeline's config."""
+    if not os.path.exists(extract_config_path):
+        return default
+    extract_config = OmegaConf.load(extract_config_path)
+    return str(OmegaConf.select(extract_config, key, default=default))
+
+
 def ensure_storage_dirs(settings: AppSettings) -> None:
     os.makedirs(settings.storage.raw_data_dir, exist_ok=True)
     os.makedirs(settings.storage.preprocessing_data_dir, exist_ok=True)
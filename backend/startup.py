@@ -0,0 +1,52 @@
+"""Readiness tracking for work deferred from ``create_app`` to the lifespan.
+
+``create_app`` only wires objects together; schema preparation, the job
+runner and model loading run in a background warm-up task once the server is
+accepting connections. ``/health/live`` answers as soon as the process serves
+requests, while ``/health/ready`` reports 503 until every component is up.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Awaitable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    def __init__(self, components: Iterable[str]) -> None:
+        self.components: dict[str, bool] = {name: False for name in components}
+        self.errors: dict[str, str] = {}
+        self.seconds: dict[str, float] = {}
+        self._created = time.perf_counter()
+
+    @property
+    def ready(self) -> bool:
+        return all(self.components.values())
+
+    async def run(self, component: str, step: Awaitable[Any]) -> bool:
+        """Await one warm-up ``step`` and record whether ``component`` is up."""
+        started = time.perf_counter()
+        try:
+            await step
+        except Exception as error:
+            logger.exception(f"Warm-up of {component} failed.")
+            self.errors[component] = str(error)
+            return False
+        finally:
+            self.seconds[component] = time.perf_counter() - started
+        self.components[component] = True
+        if self.ready:
+            elapsed = time.perf_counter() - self._created
+            logger.info(f"Ready {elapsed:.2f}s after app creation.")
+        return True
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "components": dict(self.components),
+            "errors": dict(self.errors),
+            "seconds": dict(self.seconds),
+        }
@@ -0,0 +1,238 @@
+"""Tests for admission control on the processing endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from omegaconf import OmegaConf
+
+from backend.admission import AdmissionController, AdmissionMiddleware, Rejected
+from backend.app import create_app
+from backend.services.executor import lower_thread_priority
+from backend.settings import AdmissionSettings, AppSettings
+
+
+def admission_settings(**overrides) -> AdmissionSettings:
+    values = {
+        "enabled": True,
+        "max_in_flight": 1,
+        "max_queue": 1,
+        "queue_timeout_seconds": 5.0,
+        "per_client_limit": 0,
+        "client_header": None,
+        "retry_after_seconds": 7,
+    }
+    values.update(overrides)
+    return AdmissionSettings(**values)
+
+
+def gated_app(controller: AdmissionController, gate: asyncio.Event) -> FastAPI:
+    """App whose processing route holds its slot until ``gate`` is set."""
+    app = FastAPI()
+
+    @app.post("/process/video")
+    async def process() -> dict[str, bool]:
+        await gate.wait()
+        return {"processed": True}
+
+    @app.get("/videos")
+    async def videos() -> list:
+        return []
+
+    app.add_middleware(
+        AdmissionMiddleware, controller=controller, paths=("/process/video",)
+    )
+    return app
+
+
+class TestAdmissionController:
+    """Test the slot accounting of the admission controller."""
+
+    def test_waiters_are_admitted_in_order(self):
+        """Test that released slots go to queued requests first in, first out."""
+        controller = AdmissionController(admission_settings(max_queue=2))
+        admitted: list[str] = []
+
+        async def request(name: str) -> None:
+            await controller.acquire(name)
+            admitted.append(name)
+
+        async def scenario() -> None:
+            await controller.acquire("first")
+            waiters = [asyncio.create_task(request(n)) for n in ("second", "third")]
+            await asyncio.sleep(0)
+            assert controller.queue_depth == 2
+            controller.release("first", 1.0)
+            await waiters[0]
+            controller.release("second", 1.0)
+            await waiters[1]
+
+        asyncio.run(scenario())
+
+        assert admitted == ["second", "third"]
+        assert controller.in_flight == 1
+        assert controller.queue_depth == 0
+
+    def test_full_queue_and_timeout_are_rejected(self):
+        """Test that overflow and expired waits get 503 with a Retry-After."""
+        controller = AdmissionController(admission_settings(queue_timeout_seconds=0.05))
+
+        async def scenario() -> list[Rejected]:
+            await controller.acquire("a")
+            waiter = asyncio.create_task(controller.acquire("b"))
+            await asyncio.sleep(0)
+            with pytest.raises(Rejected) as overflow:
+                await controller.acquire("c")
+            with pytest.raises(Rejected) as timeout:
+                await waiter
+            return [overflow.value, timeout.value]
+
+        overflow, timeout = asyncio.run(scenario())
+
+        assert (overflow.status_code, overflow.reason) == (503, "queue_full")
+        assert (timeout.status_code, timeout.reason) == (503, "queue_timeout")
+        assert timeout.retry_after == 7
+        assert controller.queue_depth == 0
+        assert controller.stats()["rejected"] == {"queue_full": 1, "queue_timeout": 1}
+
+    def test_per_client_limit_counts_queued_requests(self):
+        """Test that one client cannot hold more than its share of slots."""
+        controller = AdmissionController(
+            admission_settings(max_in_flight=2, max_queue=4, per_client_limit=2)
+        )
+
+        async def scenario() -> Rejected:
+            await controller.acquire("greedy")
+            await controller.acquire("greedy")
+            waiter = asyncio.create_task(controller.acquire("polite"))
+            await asyncio.sleep(0)
+            with pytest.raises(Rejected) as rejected:
+                await controller.acquire("greedy")
+            controller.release("greedy", 0.5)
+            await waiter
+            return rejected.value
+
+        rejected = asyncio.run(scenario())
+
+        assert (rejected.status_code, rejected.reason) == (429, "client_limit")
+        assert controller.in_flight == 2
+
+    def test_cancelled_waiter_leaves_the_queue(self):
+        """Test that a client that disconnects while queued frees its place."""
+        controller = AdmissionController(admission_settings())
+
+        async def scenario() -> None:
+            await controller.acquire("a")
+            waiter = asyncio.create_task(controller.acquire("b"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            assert controller.queue_depth == 0
+            controller.release("a", 0.1)
+
+        asyncio.run(scenario())
+
+        assert controller.in_flight == 0
+        assert controller.stats()["clients"] == 0
+
+    def test_retry_after_follows_measured_service_time(self):
+        """Test that Retry-After scales with processing time and queue length."""
+        controller = AdmissionController(admission_settings(max_in_flight=2))
+        assert controller.retry_after() == 7
+
+        async def scenario() -> None:
+            await controller.acquire("a")
+            controller.release("a", 10.0)
+
+        asyncio.run(scenario())
+
+        assert controller.retry_after() == 5
+
+
+class TestAdmissionMiddleware:
+    """Test admission control in front of a running app."""
+
+    def test_saturated_processing_leaves_reads_fast(self):
+        """Test that reads are served while uploads are queued and refused."""
+
+        async def scenario() -> list[httpx.Response]:
+            gate = asyncio.Event()
+            controller = AdmissionController(admission_settings())
+            transport = httpx.ASGITransport(app=gated_app(controller, gate))
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                running = asyncio.create_task(client.post("/process/video"))
+                queued = asyncio.create_task(client.post("/process/video"))
+                while controller.queue_depth < 1:
+                    await asyncio.sleep(0.001)
+                refused = await client.post("/process/video")
+                read = await asyncio.wait_for(client.get("/videos"), timeout=1)
+                gate.set()
+                return [refused, read, await running, await queued]
+
+        refused, read, running, queued = asyncio.run(scenario())
+
+        assert refused.status_code == 503
+        assert refused.headers["Retry-After"] == "7"
+        assert refused.json()["reason"] == "queue_full"
+        assert read.status_code == 200
+        assert running.status_code == 200 and queued.status_code == 200
+
+    def test_client_header_identifies_clients(self):
+        """Test that the configured header overrides the remote address."""
+        controller = AdmissionController(admission_settings(client_header="X-Api-Key"))
+        scope = {"headers": [(b"x-api-key", b"team-a")], "client": ("10.0.0.1", 1)}
+
+        assert controller.client_id(scope) == "team-a"
+        assert controller.client_id({"headers": [], "client": ("10.0.0.1", 1)}) == (
+            "10.0.0.1"
+        )
+
+    def test_app_exposes_admission_stats(self, test_settings: AppSettings):
+        """Test that the app gates uploads and reports admission state."""
+        cfg = OmegaConf.create(
+            {
+                "raw_data_dir": test_settings.storage.raw_data_dir,
+                "preprocessing_data_dir": test_settings.storage.preprocessing_data_dir,
+                "processed_data_dir": test_settings.storage.processed_data_dir,
+                "database": {"url": test_settings.database.url},
+                "admission": {"max_in_flight": 3, "max_queue": 0},
+            }
+        )
+        with TestClient(create_app(cfg, project_root=test_settings.project_root)) as c:
+            stats = c.get("/admission/stats").json()
+            metrics = c.get("/metrics").text
+
+        assert stats["enabled"] is True
+        assert stats["max_in_flight"] == 3 and stats["in_flight"] == 0
+        assert "admission_queue_depth 0" in metrics
+
+
+@pytest.mark.skipif(
+    not os.path.isdir("/proc/self/task"), reason="per-thread nice needs Linux"
+)
+class TestThreadPriority:
+    """Test that processing threads yield the CPU to request handling."""
+
+    def test_only_the_calling_thread_is_reniced(self):
+        """Test that the pool initializer lowers its own thread's priority."""
+        before = os.getpriority(os.PRIO_PROCESS, 0)
+        seen: list[int] = []
+
+        def worker() -> None:
+            lower_thread_priority(3)
+            seen.append(os.getpriority(os.PRIO_PROCESS, threading.get_native_id()))
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert seen == [before + 3]
+        assert os.getpriority(os.PRIO_PROCESS, 0) == before
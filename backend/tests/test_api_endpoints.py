@@ -2,13 +2,26 @@
 
 from __future__ import annotations
 
+import json
 import os
+import tarfile
+import threading
+import time
+import zipfile
+from email.utils import parsedate_to_datetime
 from io import BytesIO
 
 import cv2
 import numpy as np
 import pytest
 from fastapi.testclient import TestClient
+from omegaconf import OmegaConf
+
+from backend.app import create_app
+from backend.models import Job, Video
+from backend.schemas import VideoRead
+from backend.services.transcriber import WhisperTranscriber
+from backend.settings import AppSettings
 
 
 class TestVideoEndpoints:
@@ -119,6 +132,31 @@ class TestAudioEndpoints:
         assert len(data["transcript"]) > 0
         assert isinstance(data["transcript"], str)
 
+    def test_undecodable_audio_is_rejected_and_removed(
+        self, test_settings: AppSettings, monkeypatch
+    ):
+        """Test that audio the decoders cannot read gets a 415, not a 500."""
+        monkeypatch.setattr(WhisperTranscriber, "_load_model", lambda self: None)
+        cfg = OmegaConf.create(
+            {
+                "raw_data_dir": test_settings.storage.raw_data_dir,
+                "preprocessing_data_dir": test_settings.storage.preprocessing_data_dir,
+                "processed_data_dir": test_settings.storage.processed_data_dir,
+                "database": {"url": test_settings.database.url},
+                "transcription": {"enabled": True},
+            }
+        )
+        app = create_app(cfg, project_root=test_settings.project_root)
+
+        with TestClient(app) as client:
+            response = client.post(
+                "/process/audio",
+                files={"file": ("voice.m4a", b"not really aac", "audio/mp4")},
+            )
+
+        assert response.status_code == 415
+        assert os.listdir(test_settings.storage.audio_input_dir) == []
+
 
 class TestSearchEndpoints:
     """Test search functionality across both media types."""
@@ -210,3 +248,670 @@ class TestSearchEndpoints:
         assert isinstance(data["videos"], list)
         assert isinstance(data["transcriptions"], list)
 
+
+class TestEventLoopResponsiveness:
+    """Test that media processing does not block other requests."""
+
+    def test_health_latency_stays_flat_during_video_processing(
+        self, test_app, sample_video_file: str
+    ):
+        """Test that /health answers quickly while a slow upload is processed."""
+        processor = test_app.state.video_processor
+        started = threading.Event()
+
+        def slow_extract(video_path: str) -> tuple[list[str], list]:
+            started.set()
+            time.sleep(1.5)
+            return [], []
+
+        processor._extract_key_frames_with_images = slow_extract
+
+        def upload() -> None:
+            with open(sample_video_file, "rb") as f:
+                client.post(
+                    "/process/video",
+                    files={"file": ("test_video.mp4", f, "video/mp4")},
+                )
+
+        # Entering the client keeps one event loop for all requests, as uvicorn does.
+        with TestClient(test_app) as client:
+            uploader = threading.Thread(target=upload)
+            uploader.start()
+            assert started.wait(timeout=10)
+
+            latencies = []
+            for _ in range(5):
+                start = time.perf_counter()
+                response = client.get("/health")
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200
+
+            uploader.join()
+        assert max(latencies) < 0.5
+
+
+class TestJobEndpoints:
+    """Test asynchronous processing through the job queue."""
+
+    def _wait_for_job(self, client: TestClient, job_id: int) -> dict:
+        for _ in range(100):
+            job = client.get(f"/jobs/{job_id}").json()
+            if job["status"] in ("done", "failed"):
+                return job
+            time.sleep(0.05)
+        raise AssertionError(f"Job {job_id} did not finish.")
+
+    def test_async_video_upload_returns_job_and_completes(
+        self, test_app, sample_video_file: str
+    ):
+        """Test that async mode returns 202 and the job links to the video."""
+        with TestClient(test_app) as client:
+            with open(sample_video_file, "rb") as f:
+                response = client.post(
+                    "/process/video?async_mode=true",
+                    files={"file": ("test_video.mp4", f, "video/mp4")},
+                )
+
+            assert response.status_code == 202
+            job = response.json()
+            assert job["status"] == "queued"
+            assert response.headers["location"] == f"/jobs/{job['id']}"
+
+            job = self._wait_for_job(client, job["id"])
+            assert job["status"] == "done"
+            assert job["started_at"] is not None
+            assert job["finished_at"] is not None
+
+            videos = client.get("/videos").json()
+            assert any(v["id"] == job["video_id"] for v in videos)
+
+    def test_async_audio_upload_links_transcription(
+        self, test_app, sample_audio_file: str
+    ):
+        """Test that async audio jobs link to the created transcription."""
+        with TestClient(test_app) as client:
+            with open(sample_audio_file, "rb") as f:
+                response = client.post(
+                    "/process/audio?async_mode=true",
+                    files={"file": ("test_audio.wav", f, "audio/wav")},
+                )
+
+            job = self._wait_for_job(client, response.json()["id"])
+            assert job["status"] == "done"
+            assert job["transcription_id"] is not None
+
+            jobs = client.get("/jobs").json()
+            assert [j["id"] for j in jobs] == [job["id"]]
+
+    def test_get_unknown_job_returns_404(self, client: TestClient):
+        """Test that polling a missing job returns 404."""
+        response = client.get("/jobs/999")
+
+        assert response.status_code == 404
+
+    def test_queued_jobs_resume_on_startup(
+        self, test_app, db_session, sample_video_file: str
+    ):
+        """Test that jobs persisted before a restart are processed at startup."""
+        job = Job(
+            kind="video",
+            status="running",
+            filename="test_video.mp4",
+            storage_path=sample_video_file,
+        )
+        db_session.add(job)
+        db_session.commit()
+
+        with TestClient(test_app) as client:
+            finished = self._wait_for_job(client, job.id)
+
+        assert finished["status"] == "done"
+        assert finished["video_id"] is not None
+
+
+class TestFullTextSearch:
+    """Test the FTS5-backed search index."""
+
+    def _add_video(self, db_session, filename: str, summary: str, objects: list[str]):
+        video = Video(
+            filename=filename,
+            storage_path=f"/tmp/{filename}",
+            summary=summary,
+            detected_objects=objects,
+            key_frames=[],
+        )
+        db_session.add(video)
+        db_session.commit()
+        return video
+
+    def test_search_ranks_filename_matches_first(
+        self, client: TestClient, db_session
+    ):
+        """Test that results are ordered by BM25 relevance."""
+        self._add_video(db_session, "beach.mp4", "A truck drives by", ["truck"])
+        self._add_video(db_session, "truck_convoy.mp4", "Trucks", ["truck", "person"])
+
+        data = client.get("/search?term=truck").json()
+
+        assert [v["filename"] for v in data["videos"]] == [
+            "truck_convoy.mp4",
+            "beach.mp4",
+        ]
+
+    def test_search_supports_prefix_queries(self, client: TestClient, db_session):
+        """Test that partial words match as prefixes."""
+        self._add_video(db_session, "harbour.mp4", "Boats at the harbour", ["boat"])
+
+        data = client.get("/search?term=harb").json()
+
+        assert [v["filename"] for v in data["videos"]] == ["harbour.mp4"]
+
+    def test_search_index_follows_updates_and_deletes(
+        self, client: TestClient, db_session
+    ):
+        """Test that triggers keep the index in sync with the base table."""
+        video = self._add_video(db_session, "clip.mp4", "A cat sleeps", ["cat"])
+
+        video.summary = "A dog barks"
+        video.detected_objects = ["dog"]
+        db_session.commit()
+        assert client.get("/search?term=cat").json()["videos"] == []
+        assert len(client.get("/search?term=dog").json()["videos"]) == 1
+
+        db_session.delete(video)
+        db_session.commit()
+        assert client.get("/search?term=dog").json()["videos"] == []
+
+    def test_search_falls_back_to_like_without_fts(
+        self, client: TestClient, db_session, monkeypatch
+    ):
+        """Test that substring matching is used when FTS5 is unavailable."""
+        monkeypatch.setattr("backend.routes.search.search_index_enabled", lambda: False)
+        self._add_video(db_session, "harbour.mp4", "Boats", ["boat"])
+
+        data = client.get("/search?term=arbou").json()
+
+        assert [v["filename"] for v in data["videos"]] == ["harbour.mp4"]
+
+
+class TestPagination:
+    """Test keyset pagination and summary projections."""
+
+    def _add_videos(self, db_session, count: int) -> None:
+        for i in range(count):
+            db_session.add(
+                Video(
+                    filename=f"clip_{i}.mp4",
+                    storage_path=f"/tmp/clip_{i}.mp4",
+                    summary="Detected objects: person",
+                    detected_objects=["person"],
+                    key_frames=[f"keyframes/clip_{i}_frame_0000.jpg"],
+                )
+            )
+        db_session.commit()
+
+    def test_list_videos_follows_cursor_through_all_pages(
+        self, client: TestClient, db_session
+    ):
+        """Test that following X-Next-Cursor visits every row exactly once."""
+        self._add_videos(db_session, 5)
+
+        filenames = []
+        cursor = None
+        for _ in range(5):
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/videos", params=params)
+            assert response.status_code == 200
+            filenames.extend(v["filename"] for v in response.json())
+            cursor = response.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+
+        assert filenames == [f"clip_{i}.mp4" for i in range(5)]
+
+    def test_list_videos_reports_total_when_requested(
+        self, client: TestClient, db_session
+    ):
+        """Test that X-Total-Count is only sent when include_total is set."""
+        self._add_videos(db_session, 3)
+
+        assert "x-total-count" not in client.get("/videos?limit=1").headers
+        response = client.get("/videos?limit=1&include_total=true")
+        assert response.headers["x-total-count"] == "3"
+
+    def test_list_videos_summary_view_omits_key_frames(
+        self, client: TestClient, db_session
+    ):
+        """Test that the summary projection drops the key frame list."""
+        self._add_videos(db_session, 1)
+
+        data = client.get("/videos?view=summary").json()
+
+        assert data[0]["filename"] == "clip_0.mp4"
+        assert "key_frames" not in data[0]
+
+    def test_list_transcriptions_summary_view_omits_transcript(
+        self, client: TestClient, sample_audio_file: str
+    ):
+        """Test that the summary projection drops the transcript text."""
+        with open(sample_audio_file, "rb") as f:
+            client.post("/process/audio", files={"file": ("test_audio.wav", f, "audio/wav")})
+
+        data = client.get("/transcriptions?view=summary").json()
+
+        assert data[0]["filename"] == "test_audio.wav"
+        assert "transcript" not in data[0]
+
+    def test_invalid_cursor_returns_400(self, client: TestClient):
+        """Test that malformed cursors are rejected."""
+        response = client.get("/videos?cursor=not-a-cursor")
+
+        assert response.status_code == 400
+
+    def test_search_paginates_each_media_type(self, client: TestClient, db_session):
+        """Test that search returns per-type cursors until results run out."""
+        self._add_videos(db_session, 3)
+
+        first = client.get("/search?term=person&limit=2").json()
+        assert len(first["videos"]) == 2
+        assert first["next_video_cursor"] is not None
+        assert first["next_transcription_cursor"] is None
+
+        second = client.get(
+            "/search",
+            params={
+                "term": "person",
+                "limit": 2,
+                "video_cursor": first["next_video_cursor"],
+            },
+        ).json()
+        seen = {v["filename"] for v in first["videos"] + second["videos"]}
+        assert seen == {"clip_0.mp4", "clip_1.mp4", "clip_2.mp4"}
+        assert second["next_video_cursor"] is None
+
+
+class TestResponseCache:
+    """Test the response cache, conditional requests and invalidation."""
+
+    def test_repeated_get_is_served_from_cache(self, client: TestClient):
+        """Test that a second identical GET hits the cache with the same ETag."""
+        first = client.get("/videos")
+        second = client.get("/videos")
+
+        assert first.headers["x-cache"] == "MISS"
+        assert second.headers["x-cache"] == "HIT"
+        assert first.headers["etag"] == second.headers["etag"]
+        assert first.json() == second.json()
+
+    def test_if_none_match_returns_304(self, client: TestClient):
+        """Test that a matching ETag is answered with an empty 304."""
+        etag = client.get("/videos").headers["etag"]
+
+        response = client.get("/videos", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_if_modified_since_returns_304(self, client: TestClient):
+        """Test that revalidating with Last-Modified is answered with 304."""
+        last_modified = client.get("/videos").headers["last-modified"]
+
+        response = client.get("/videos", headers={"If-Modified-Since": last_modified})
+
+        assert response.status_code == 304
+
+    def test_write_invalidates_cached_responses(self, client: TestClient, db_session):
+        """Test that committing a new video drops stale cached listings."""
+        etag = client.get("/videos").headers["etag"]
+        db_session.add(
+            Video(
+                filename="fresh.mp4",
+                storage_path="/tmp/fresh.mp4",
+                summary="Detected objects: person",
+                detected_objects=["person"],
+                key_frames=[],
+            )
+        )
+        db_session.commit()
+
+        response = client.get("/videos", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["x-cache"] == "MISS"
+        assert [v["filename"] for v in response.json()] == ["fresh.mp4"]
+
+    def test_same_second_write_fails_if_modified_since(
+        self, client: TestClient, db_session
+    ):
+        """Test that a write in the same second moves Last-Modified forward."""
+        last_modified = client.get("/videos").headers["last-modified"]
+        db_session.add(
+            Video(
+                filename="fresh.mp4",
+                storage_path="/tmp/fresh.mp4",
+                summary="Detected objects: person",
+                detected_objects=["person"],
+                key_frames=[],
+            )
+        )
+        db_session.commit()
+
+        response = client.get("/videos", headers={"If-Modified-Since": last_modified})
+
+        assert response.status_code == 200
+        assert [v["filename"] for v in response.json()] == ["fresh.mp4"]
+        assert parsedate_to_datetime(
+            response.headers["last-modified"]
+        ) > parsedate_to_datetime(last_modified)
+
+    def test_query_parameter_order_shares_cache_entry(self, client: TestClient):
+        """Test that reordered query parameters map to the same cache entry."""
+        client.get("/videos?limit=5&view=summary")
+
+        response = client.get("/videos?view=summary&limit=5")
+
+        assert response.headers["x-cache"] == "HIT"
+
+    def test_error_responses_pass_through_uncached(self, client: TestClient):
+        """Test that non-200 responses are forwarded unchanged and never stored."""
+        first = client.get("/videos?limit=-1")
+        second = client.get("/videos?limit=-1")
+
+        assert first.status_code == second.status_code == 422
+        assert "x-cache" not in second.headers
+        assert second.json() == first.json()
+        assert client.get("/cache/stats").json()["entries"] == 0
+
+    def test_streamed_ndjson_is_not_cached(self, client: TestClient):
+        """Test that NDJSON lists stream through without being buffered."""
+        first = client.get("/videos?format=ndjson")
+        second = client.get("/videos?format=ndjson")
+
+        assert second.status_code == 200
+        assert second.headers["content-type"] == "application/x-ndjson"
+        assert "x-cache" not in first.headers and "x-cache" not in second.headers
+        assert client.get("/cache/stats").json()["entries"] == 0
+
+    def test_cache_stats_report_hit_ratio(self, client: TestClient):
+        """Test that cache statistics count hits and misses."""
+        client.get("/transcriptions")
+        client.get("/transcriptions")
+
+        stats = client.get("/cache/stats").json()
+
+        assert stats["enabled"] is True
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+
+class TestBulkSerialization:
+    """Test the column-tuple serialization path for list responses."""
+
+    def _add_videos(self, db_session, count: int) -> None:
+        db_session.add_all(
+            Video(
+                filename=f"clip_{i}.mp4",
+                storage_path=f"/tmp/clip_{i}.mp4",
+                summary="Detected objects: person",
+                detected_objects=["person"],
+                key_frames=[f"keyframes/clip_{i}_frame_0000.jpg"],
+            )
+            for i in range(count)
+        )
+        db_session.commit()
+
+    def test_list_matches_pydantic_serialization(self, client: TestClient, db_session):
+        """Test that bulk-encoded rows equal VideoRead dumps of the ORM objects."""
+        self._add_videos(db_session, 3)
+        expected = [
+            VideoRead.model_validate(video).model_dump(mode="json")
+            for video in db_session.query(Video).order_by(Video.id)
+        ]
+
+        assert client.get("/videos").json() == expected
+
+    def test_validated_rows_match_trusted_rows(self, test_app, db_session):
+        """Test that enabling row validation does not change the payload."""
+        self._add_videos(db_session, 2)
+        client = TestClient(test_app)
+        trusted = client.get("/videos?view=summary").json()
+
+        test_app.state.settings.serialization.validate_rows = True
+        test_app.state.response_cache.invalidate()
+
+        assert client.get("/videos?view=summary").json() == trusted
+
+    def test_ndjson_streams_one_object_per_line(self, client: TestClient, db_session):
+        """Test that format=ndjson returns newline-delimited JSON objects."""
+        self._add_videos(db_session, 3)
+
+        response = client.get("/videos?format=ndjson&limit=2")
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert [json.loads(line)["filename"] for line in lines] == [
+            "clip_0.mp4",
+            "clip_1.mp4",
+        ]
+        assert response.headers["x-next-cursor"]
+
+
+class TestContentDeduplication:
+    """Test content-addressed storage and reuse of processed results."""
+
+    def test_reupload_returns_stored_video_without_processing(
+        self, client: TestClient, test_app, sample_video_file: str, monkeypatch
+    ):
+        """Test that identical content is answered from the database."""
+        with open(sample_video_file, "rb") as f:
+            first = client.post(
+                "/process/video", files={"file": ("first.mp4", f, "video/mp4")}
+            ).json()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("duplicate upload was decoded again")
+
+        processor = test_app.state.video_processor
+        monkeypatch.setattr(processor, "_extract_key_frames_with_images", fail)
+        with open(sample_video_file, "rb") as f:
+            second = client.post(
+                "/process/video", files={"file": ("renamed.mp4", f, "video/mp4")}
+            )
+
+        assert second.status_code == 201
+        assert second.json()["id"] == first["id"]
+        assert second.json()["content_hash"] == first["content_hash"]
+        assert len(client.get("/videos").json()) == 1
+
+    def test_concurrent_duplicate_returns_the_first_row(
+        self, client: TestClient, sample_video_file: str, monkeypatch
+    ):
+        """Test that losing an insert race answers with the stored row."""
+        with open(sample_video_file, "rb") as f:
+            first = client.post(
+                "/process/video", files={"file": ("first.mp4", f, "video/mp4")}
+            ).json()
+
+        async def not_found_yet(*args, **kwargs):
+            # As if the first request had not committed when this one looked.
+            return None
+
+        monkeypatch.setattr(
+            "backend.services.video_processor.find_by_content_hash", not_found_yet
+        )
+        with open(sample_video_file, "rb") as f:
+            second = client.post(
+                "/process/video", files={"file": ("second.mp4", f, "video/mp4")}
+            )
+
+        assert second.status_code == 201
+        assert second.json()["id"] == first["id"]
+        assert len(client.get("/videos").json()) == 1
+
+    def test_same_filename_different_content_is_stored_separately(
+        self, client: TestClient, temp_dir: str, sample_audio_file: str
+    ):
+        """Test that two different files named alike both survive."""
+        other_audio = os.path.join(temp_dir, "other.wav")
+        with open(sample_audio_file, "rb") as src, open(other_audio, "wb") as dst:
+            dst.write(src.read() + b"\x01" * 100)
+
+        responses = []
+        for path in (sample_audio_file, other_audio):
+            with open(path, "rb") as f:
+                responses.append(
+                    client.post(
+                        "/process/audio",
+                        files={"file": ("clip.wav", f, "audio/wav")},
+                    ).json()
+                )
+
+        assert responses[0]["id"] != responses[1]["id"]
+        assert responses[0]["storage_path"] != responses[1]["storage_path"]
+        assert all(os.path.exists(r["storage_path"]) for r in responses)
+
+
+class TestBatchIngest:
+    """Test multi-file and archive ingest through /process/batch."""
+
+    def _read(self, path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_multiple_files_are_processed_with_summary(
+        self, client: TestClient, sample_video_file: str, sample_audio_file: str
+    ):
+        """Test that each file gets a row and a per-file status."""
+        response = client.post(
+            "/process/batch",
+            files=[
+                ("files", ("a.mp4", self._read(sample_video_file), "video/mp4")),
+                ("files", ("b.wav", self._read(sample_audio_file), "audio/wav")),
+                ("files", ("notes.txt", b"hello", "text/plain")),
+            ],
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["status"] for item in data["items"]] == [
+            "created",
+            "created",
+            "skipped",
+        ]
+        assert (data["created"], data["skipped"]) == (2, 1)
+        assert len(client.get("/videos").json()) == 1
+        assert len(client.get("/transcriptions").json()) == 1
+
+    def test_rows_stored_meanwhile_are_reused(
+        self,
+        client: TestClient,
+        test_app,
+        db_session,
+        sample_video_file: str,
+        sample_audio_file: str,
+    ):
+        """Test that a batch insert racing another upload keeps the other rows."""
+        processor = test_app.state.video_processor
+        analyse = processor.analyse
+
+        async def analyse_while_another_upload_commits(*args, **kwargs):
+            video = await analyse(*args, **kwargs)
+            db_session.add(
+                Video(
+                    filename="other.mp4",
+                    storage_path=video.storage_path,
+                    content_hash=video.content_hash,
+                    summary=video.summary,
+                    detected_objects=[],
+                    key_frames=[],
+                )
+            )
+            db_session.commit()
+            return video
+
+        processor.analyse = analyse_while_another_upload_commits
+        response = client.post(
+            "/process/batch",
+            files=[
+                ("files", ("a.mp4", self._read(sample_video_file), "video/mp4")),
+                ("files", ("b.wav", self._read(sample_audio_file), "audio/wav")),
+            ],
+        )
+
+        items = response.json()["items"]
+        assert [item["status"] for item in items] == ["existing", "created"]
+        assert [v["filename"] for v in client.get("/videos").json()] == ["other.mp4"]
+        assert len(client.get("/transcriptions").json()) == 1
+
+    def test_zip_archive_entries_are_ingested(
+        self, client: TestClient, sample_video_file: str, sample_audio_file: str
+    ):
+        """Test that zip members are stored and duplicates reuse one row."""
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.write(sample_video_file, "clips/one.mp4")
+            zf.write(sample_video_file, "clips/copy.mp4")
+            zf.write(sample_audio_file, "audio/voice.wav")
+            zf.writestr("clips/", "")
+
+        response = client.post(
+            "/process/batch",
+            files={"files": ("media.zip", archive.getvalue(), "application/zip")},
+        )
+
+        data = response.json()
+        statuses = {item["filename"]: item["status"] for item in data["items"]}
+        assert statuses == {
+            "one.mp4": "created",
+            "copy.mp4": "existing",
+            "voice.wav": "created",
+        }
+        ids = {item["filename"]: item["id"] for item in data["items"]}
+        assert ids["one.mp4"] == ids["copy.mp4"]
+        assert len(client.get("/videos").json()) == 1
+
+    def test_tar_archive_entries_are_ingested(
+        self, client: TestClient, sample_audio_file: str
+    ):
+        """Test that tar.gz archives are read member by member."""
+        archive = BytesIO()
+        with tarfile.open(fileobj=archive, mode="w:gz") as tf:
+            tf.add(sample_audio_file, arcname="voice.wav")
+
+        response = client.post(
+            "/process/batch",
+            files={"files": ("media.tar.gz", archive.getvalue(), "application/gzip")},
+        )
+
+        assert response.json()["created"] == 1
+
+    def test_invalid_archive_returns_400(self, client: TestClient):
+        """Test that corrupt archives are rejected."""
+        response = client.post(
+            "/process/batch",
+            files={"files": ("broken.zip", b"not a zip", "application/zip")},
+        )
+
+        assert response.status_code == 400
+
+    def test_async_batch_returns_job_with_results(
+        self, test_app, sample_video_file: str
+    ):
+        """Test that async batches run as one job that records per-file results."""
+        with TestClient(test_app) as client:
+            response = client.post(
+                "/process/batch?async_mode=true",
+                files=[
+                    ("files", ("a.mp4", self._read(sample_video_file), "video/mp4")),
+                    ("files", ("b.mp4", self._read(sample_video_file), "video/mp4")),
+                ],
+            )
+            assert response.status_code == 202
+
+            job = TestJobEndpoints._wait_for_job(None, client, response.json()["id"])
+
+        assert job["status"] == "done"
+        assert job["kind"] == "batch"
+        assert [item["status"] for item in job["result"]] == ["created", "existing"]
@@ -0,0 +1,221 @@
+"""Unit tests for micro-batched inference."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from backend.services.audio_processor import AudioProcessor
+from backend.services.batching import MicroBatcher
+from backend.services.detector import YoloDetector
+from backend.services.transcriber import (
+    SAMPLE_RATE,
+    AudioDecodeError,
+    WhisperTranscriber,
+    load_audio,
+)
+from backend.settings import DetectionSettings, TranscriptionSettings, build_settings
+
+
+class TestMicroBatcher:
+    """Test request coalescing, limits, errors and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submits_share_one_batch(self):
+        """Test that items arriving within the wait window form a single batch."""
+        calls: list[list[int]] = []
+
+        def double(items: list[int]) -> list[int]:
+            calls.append(items)
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher("double", double, max_batch_size=8, max_wait_ms=50)
+        await batcher.start()
+        try:
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        finally:
+            await batcher.stop()
+
+        assert results == [0, 2, 4, 6, 8]
+        assert calls == [[0, 1, 2, 3, 4]]
+        stats = batcher.stats()
+        assert stats["batch_size_histogram"] == {"5": 1}
+        assert stats["items"] == 5
+        assert stats["max_queue_depth"] == 5
+        assert stats["latency_ms"]["p50"] > 0
+
+    @pytest.mark.asyncio
+    async def test_batches_never_exceed_max_size(self):
+        """Test that large bursts are split at max_batch_size."""
+        sizes: list[int] = []
+
+        def record(items: list[int]) -> list[int]:
+            sizes.append(len(items))
+            return items
+
+        batcher = MicroBatcher("record", record, max_batch_size=3, max_wait_ms=20)
+        await batcher.start()
+        try:
+            await asyncio.gather(*(batcher.submit(i) for i in range(7)))
+        finally:
+            await batcher.stop()
+
+        assert max(sizes) <= 3
+        assert sum(sizes) == 7
+
+    @pytest.mark.asyncio
+    async def test_items_queue_while_a_batch_runs(self):
+        """Test that work submitted during inference joins the next batch."""
+        release = threading.Event()
+        sizes: list[int] = []
+
+        def slow(items: list[int]) -> list[int]:
+            sizes.append(len(items))
+            release.wait(timeout=5)
+            return items
+
+        batcher = MicroBatcher("slow", slow, max_batch_size=16, max_wait_ms=1)
+        await batcher.start()
+        try:
+            first = asyncio.ensure_future(batcher.submit(0))
+            await asyncio.sleep(0.05)
+            rest = [asyncio.ensure_future(batcher.submit(i)) for i in range(1, 6)]
+            await asyncio.sleep(0.05)
+            release.set()
+            await asyncio.gather(first, *rest)
+        finally:
+            await batcher.stop()
+
+        assert sizes == [1, 5]
+
+    @pytest.mark.asyncio
+    async def test_batch_errors_reach_every_caller(self):
+        """Test that a failing batch raises in each waiting coroutine."""
+
+        def fail(items: list[int]) -> list[int]:
+            raise ValueError("model crashed")
+
+        batcher = MicroBatcher("fail", fail, max_batch_size=4, max_wait_ms=20)
+        await batcher.start()
+        try:
+            results = await asyncio.gather(
+                *(batcher.submit(i) for i in range(3)), return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert batcher.stats()["failed_batches"] == 1
+
+
+class TestWhisperTranscriber:
+    """Test windowing and result assembly around the batched model call."""
+
+    @pytest.mark.asyncio
+    async def test_long_audio_is_split_and_joined(self, temp_dir: str, test_settings):
+        """Test that windows from one file are batched and stitched in order."""
+        audio_path = f"{temp_dir}/long.wav"
+        silence = np.zeros(int(SAMPLE_RATE * 2.5), dtype=np.float32)
+        sf.write(audio_path, silence, SAMPLE_RATE)
+        settings = TranscriptionSettings(
+            enabled=True,
+            model="unused",
+            task="transcribe",
+            language="en",
+            window_seconds=1.0,
+            max_batch_size=8,
+            max_wait_ms=20,
+            max_concurrency=1,
+        )
+        transcriber = WhisperTranscriber(settings)
+        batches: list[int] = []
+
+        def fake_generate(windows):
+            batches.append(len(windows))
+            return [(f" part{i} ", 0.5 + 0.1 * i) for i in range(len(windows))]
+
+        transcriber.batcher.batch_fn = fake_generate
+        await transcriber.batcher.start()
+        try:
+            processor = AudioProcessor(settings=test_settings, transcriber=transcriber)
+            transcript, confidence = await processor._transcribe(audio_path)
+        finally:
+            await transcriber.stop()
+
+        assert batches == [3]
+        assert transcript == "part0 part1 part2"
+        assert confidence == pytest.approx(0.6)
+
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+    def test_44k_audio_is_resampled_without_aliasing(self, temp_dir: str):
+        """Test that a tone above 8 kHz is filtered out instead of folding down."""
+        audio_path = f"{temp_dir}/tone.wav"
+        t = np.arange(44_100) / 44_100
+        sf.write(audio_path, 0.5 * np.sin(2 * np.pi * 12_000 * t), 44_100)
+
+        audio = load_audio(audio_path)
+
+        assert abs(len(audio) - SAMPLE_RATE) <= 1
+        assert np.sqrt(np.mean(audio**2)) < 0.01
+
+    def test_unreadable_audio_raises_decode_error(self, temp_dir: str):
+        """Test that a file no decoder can read is reported as such."""
+        audio_path = f"{temp_dir}/voice.m4a"
+        with open(audio_path, "wb") as file:
+            file.write(b"not really aac")
+
+        with pytest.raises(AudioDecodeError):
+            load_audio(audio_path)
+
+
+class TestYoloDetector:
+    """Test that key frames from concurrent videos share detector batches."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_videos_share_batches(self, test_settings):
+        """Test that frames of two uploads are coalesced into one predict call."""
+        settings = DetectionSettings(
+            enabled=True,
+            model="unused.pt",
+            confidence=0.25,
+            max_batch_size=16,
+            max_wait_ms=50,
+            max_concurrency=1,
+        )
+        detector = YoloDetector(settings)
+        batches: list[int] = []
+
+        def fake_predict(frames):
+            batches.append(len(frames))
+            return [["person"] if frame.mean() > 100 else ["car"] for frame in frames]
+
+        detector.batcher.batch_fn = fake_predict
+        await detector.batcher.start()
+        try:
+            bright = [np.full((8, 8, 3), 200, dtype=np.uint8)] * 3
+            dark = [np.zeros((8, 8, 3), dtype=np.uint8)] * 2
+            labels = await asyncio.gather(
+                detector.detect(bright), detector.detect(dark + bright[:1])
+            )
+        finally:
+            await detector.stop()
+
+        assert batches == [6]
+        assert labels == [["person"], ["car", "person"]]
+
+    def test_model_defaults_to_extraction_checkpoint(self, temp_dir: str):
+        """Test that the backend reads the YOLO checkpoint from extract_config."""
+        with open(os.path.join(temp_dir, "extract.yaml"), "w") as f:
+            f.write("video:\n  video_model: yolov8n.pt\n")
+
+        settings = build_settings(
+            {"detection": {"extract_config": "extract.yaml"}}, project_root=temp_dir
+        )
+
+        assert settings.detection.model == "yolov8n.pt"
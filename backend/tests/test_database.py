@@ -0,0 +1,142 @@
+"""Tests for engine configuration and the async session path."""
+
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy import create_engine, inspect, text
+
+from backend import database, models
+from backend.database import async_database_url, init_database, new_async_session
+from backend.settings import AppSettings
+
+
+class TestDatabaseSetup:
+    """Test URL mapping, connection pragmas and AsyncSession access."""
+
+    def test_async_database_url_swaps_driver(self):
+        """Test that sync URLs are mapped to their asyncio driver."""
+        assert async_database_url("sqlite:///data/app.db") == (
+            "sqlite+aiosqlite:///data/app.db"
+        )
+        assert async_database_url("sqlite+aiosqlite:///app.db") == (
+            "sqlite+aiosqlite:///app.db"
+        )
+
+    def test_pragmas_are_applied_to_both_engines(self, test_settings: AppSettings):
+        """Test that WAL mode and busy timeout are set on every connection.
+
+        Foreign key enforcement keeps SQLite's default (off) unless configured.
+        """
+        init_database(test_settings.database.url, test_settings.database)
+
+        with database.get_engine().connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 0
+
+        async def read_pragma() -> str:
+            async with new_async_session() as db:
+                return (await db.execute(text("PRAGMA journal_mode"))).scalar()
+
+        assert asyncio.run(read_pragma()) == "wal"
+        asyncio.run(database.dispose_engines())
+
+    def test_pool_size_comes_from_settings(self, test_settings: AppSettings):
+        """Test that the configured pool size is used by the sync engine."""
+        test_settings.database.pool_size = 3
+        init_database(test_settings.database.url, test_settings.database)
+
+        assert database.get_engine().pool.size() == 3
+        asyncio.run(database.dispose_engines())
+
+    def test_missing_columns_are_added_to_existing_tables(
+        self, test_settings: AppSettings
+    ):
+        """Test that databases created before content_hash are upgraded."""
+        engine = create_engine(test_settings.database.url)
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE videos (id INTEGER PRIMARY KEY, filename VARCHAR(255) "
+                    "NOT NULL, storage_path VARCHAR(1024) NOT NULL, summary TEXT NOT "
+                    "NULL, detected_objects JSON NOT NULL, key_frames JSON NOT NULL, "
+                    "created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL)"
+                )
+            )
+        engine.dispose()
+
+        init_database(test_settings.database.url, test_settings.database)
+
+        inspector = inspect(database.get_engine())
+        assert "content_hash" in {c["name"] for c in inspector.get_columns("videos")}
+        assert "ix_videos_content_hash" in {
+            index["name"] for index in inspector.get_indexes("videos")
+        }
+        asyncio.run(database.dispose_engines())
+
+    def test_content_hash_index_is_made_unique(self, test_settings: AppSettings):
+        """Test that a plain content_hash index is rebuilt as a unique one."""
+        engine = create_engine(test_settings.database.url)
+        models.Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_videos_content_hash"))
+            conn.execute(
+                text("CREATE INDEX ix_videos_content_hash ON videos (content_hash)")
+            )
+        engine.dispose()
+
+        init_database(test_settings.database.url, test_settings.database)
+
+        indexes = inspect(database.get_engine()).get_indexes("videos")
+        assert {"name": "ix_videos_content_hash", "unique": 1} in [
+            {"name": index["name"], "unique": index["unique"]} for index in indexes
+        ]
+        asyncio.run(database.dispose_engines())
+
+    def test_existing_duplicates_keep_the_plain_index(
+        self, test_settings: AppSettings, caplog
+    ):
+        """Test that duplicate hashes leave the index non-unique with a warning."""
+        engine = create_engine(test_settings.database.url)
+        models.Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_videos_content_hash"))
+            conn.execute(
+                text("CREATE INDEX ix_videos_content_hash ON videos (content_hash)")
+            )
+            for name in ("a.mp4", "b.mp4"):
+                conn.execute(
+                    text(
+                        "INSERT INTO videos (filename, storage_path, content_hash, "
+                        "summary, detected_objects, key_frames) "
+                        "VALUES (:name, '/tmp/x.mp4', 'abc', '', '[]', '[]')"
+                    ),
+                    {"name": name},
+                )
+        engine.dispose()
+
+        with caplog.at_level("WARNING"):
+            init_database(test_settings.database.url, test_settings.database)
+
+        indexes = inspect(database.get_engine()).get_indexes("videos")
+        assert {"name": "ix_videos_content_hash", "unique": 0} in [
+            {"name": index["name"], "unique": index["unique"]} for index in indexes
+        ]
+        assert "duplicate rows" in caplog.text
+        asyncio.run(database.dispose_engines())
+
+    def test_sessions_are_not_shared_within_a_thread(self, test_settings: AppSettings):
+        """Test that two requests served by one pool thread get separate sessions."""
+        init_database(test_settings.database.url, test_settings.database)
+        first = database.get_session()
+        second = database.get_session()
+
+        session = next(first)
+        other = next(second)
+        first.close()
+
+        assert session is not other
+        assert other.execute(text("SELECT 1")).scalar() == 1
+        second.close()
+        asyncio.run(database.dispose_engines())
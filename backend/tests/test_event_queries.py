@@ -0,0 +1,192 @@
+"""Tests for temporal queries over extraction video_events."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from omegaconf import OmegaConf
+from sqlalchemy import create_engine
+
+from backend.app import create_app
+from backend.services.event_queries import (
+    EVENT_INDEXES,
+    co_occurrence,
+    file_timeline,
+    object_intervals,
+)
+from backend.settings import AppSettings
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+EXTRACT_CONFIG = OmegaConf.load(
+    os.path.join(PROJECT_ROOT, "config", "extract_config.yaml")
+)
+
+# One sample per second, as the pipeline writes them: a.mp4 shows a person
+# at 0-2s and 5-6s (two boxes at 1s) and a dog at 5s; b.mp4 only a person.
+VIDEO_EVENTS = [
+    ("a.mp4", "person", 0, 0.0),
+    ("a.mp4", "person", 30, 1.0),
+    ("a.mp4", "person", 30, 1.0),
+    ("a.mp4", "person", 60, 2.0),
+    ("a.mp4", "person", 150, 5.0),
+    ("a.mp4", "dog", 150, 5.0),
+    ("a.mp4", "person", 180, 6.0),
+    ("b.mp4", "person", 0, 0.0),
+    ("b.mp4", "car", 30, 1.0),
+]
+
+
+@pytest.fixture
+def extraction_db(test_settings: AppSettings) -> str:
+    """Create an extraction.db with the pipeline's schema, indexes and events."""
+    path = test_settings.events.extraction_db_path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with sqlite3.connect(path) as conn:
+        conn.execute(EXTRACT_CONFIG.database.video_events)
+        for statement in EXTRACT_CONFIG.database.video_event_indexes:
+            conn.execute(statement)
+        conn.executemany(
+            "INSERT INTO video_events (file_name, object_name, frame, timestamp) "
+            "VALUES (?, ?, ?, ?)",
+            VIDEO_EVENTS,
+        )
+    return path
+
+
+@pytest.fixture
+def conn(extraction_db: str):
+    engine = create_engine(f"sqlite:///{extraction_db}")
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+class TestEventQueries:
+    """Test the aggregate statements behind the events endpoints."""
+
+    def test_intervals_split_at_gaps(self, conn):
+        """Test that detections are grouped into runs separated by gaps."""
+        intervals = object_intervals(conn, "person", file_name="a.mp4")
+
+        assert intervals == [
+            {
+                "file_name": "a.mp4",
+                "start": 0.0,
+                "end": 2.0,
+                "detections": 4,
+                "frames": 3,
+            },
+            {
+                "file_name": "a.mp4",
+                "start": 5.0,
+                "end": 6.0,
+                "detections": 2,
+                "frames": 2,
+            },
+        ]
+
+    def test_intervals_across_files_and_time_range(self, conn):
+        """Test that a time range clips intervals in every file."""
+        intervals = object_intervals(conn, "person", start=1.0, end=5.5)
+
+        assert [(i["file_name"], i["start"], i["end"]) for i in intervals] == [
+            ("a.mp4", 1.0, 2.0),
+            ("a.mp4", 5.0, 5.0),
+        ]
+
+    def test_co_occurrence_requires_every_object(self, conn):
+        """Test that only files containing all requested objects match."""
+        both = co_occurrence(conn, ["person", "dog"])
+        person = co_occurrence(conn, ["person"])
+
+        assert both == [
+            {
+                "file_name": "a.mp4",
+                "objects": {"dog": 1, "person": 6},
+                "first_seen": 0.0,
+                "last_seen": 6.0,
+            }
+        ]
+        assert [row["file_name"] for row in person] == ["a.mp4", "b.mp4"]
+
+    def test_timeline_buckets_per_object(self, conn):
+        """Test that a file's events are counted per object and bucket."""
+        timeline = file_timeline(conn, "a.mp4", bucket_seconds=5.0)
+
+        assert timeline == [
+            {"object_name": "dog", "start": 5.0, "detections": 1, "frames": 1},
+            {"object_name": "person", "start": 0.0, "detections": 4, "frames": 3},
+            {"object_name": "person", "start": 5.0, "detections": 2, "frames": 2},
+        ]
+        assert file_timeline(conn, "missing.mp4") is None
+
+    def test_queries_are_answered_from_the_indexes(self, conn):
+        """Test that SQLite plans covering index scans instead of table scans."""
+        plans = [
+            " ".join(
+                row[-1]
+                for row in conn.exec_driver_sql(
+                    "EXPLAIN QUERY PLAN SELECT timestamp FROM video_events "
+                    f"WHERE {where}"
+                )
+            )
+            for where in (
+                "file_name = 'a.mp4' AND timestamp > 1",
+                "object_name IN ('person', 'dog') AND file_name = 'a.mp4'",
+            )
+        ]
+
+        assert f"COVERING INDEX {EVENT_INDEXES[0]}" in plans[0]
+        assert f"COVERING INDEX {EVENT_INDEXES[1]}" in plans[1]
+
+
+class TestEventRoutes:
+    """Test the /events endpoints."""
+
+    def make_client(self, test_settings: AppSettings) -> TestClient:
+        cfg = OmegaConf.create(
+            {
+                "raw_data_dir": test_settings.storage.raw_data_dir,
+                "preprocessing_data_dir": test_settings.storage.preprocessing_data_dir,
+                "processed_data_dir": test_settings.storage.processed_data_dir,
+                "database": {"url": test_settings.database.url},
+                "events": {"max_results": 1},
+            }
+        )
+        return TestClient(create_app(cfg, project_root=test_settings.project_root))
+
+    def test_endpoints_return_aggregates(
+        self, test_settings: AppSettings, extraction_db: str
+    ):
+        """Test that the endpoints answer and cap results at max_results."""
+        with self.make_client(test_settings) as client:
+            intervals = client.get(
+                "/events/intervals", params={"object": "person", "file": "a.mp4"}
+            )
+            pairs = client.get(
+                "/events/co-occurrence", params={"objects": ["person", "car"]}
+            )
+            timeline = client.get(
+                "/events/files/b.mp4/timeline", params={"objects": "car"}
+            )
+            missing = client.get("/events/files/missing.mp4/timeline")
+
+        assert intervals.status_code == 200
+        assert [(i["start"], i["end"]) for i in intervals.json()] == [(0.0, 2.0)]
+        assert [row["file_name"] for row in pairs.json()] == ["b.mp4"]
+        assert timeline.json()["buckets"] == [
+            {"object_name": "car", "start": 1.0, "detections": 1, "frames": 1}
+        ]
+        assert missing.status_code == 404
+
+    def test_missing_extraction_database_is_unavailable(
+        self, test_settings: AppSettings
+    ):
+        """Test that the endpoints return 503 before the pipeline has run."""
+        with self.make_client(test_settings) as client:
+            response = client.get("/events/intervals", params={"object": "person"})
+
+        assert response.status_code == 503
@@ -0,0 +1,230 @@
+"""Tests for copying offline extraction results into the backend tables."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from omegaconf import OmegaConf
+from sqlalchemy import text
+
+from backend import database
+from backend.app import create_app
+from backend.database import init_database
+from backend.response_cache import CACHE_HEADER, CACHE_STAMP_FILE, touch_stamp
+from backend.services.extraction_sync import sync_extraction_db
+from backend.settings import AppSettings
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+EXTRACT_CONFIG = OmegaConf.load(
+    os.path.join(PROJECT_ROOT, "config", "extract_config.yaml")
+)
+
+
+@pytest.fixture
+def extraction_db(test_settings: AppSettings) -> str:
+    """Create an extraction.db with the offline pipeline's schema."""
+    path = test_settings.sync.extraction_db_path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with sqlite3.connect(path) as conn:
+        conn.execute(EXTRACT_CONFIG.database.video_events)
+        conn.execute(EXTRACT_CONFIG.database.audio_events)
+    return path
+
+
+def add_events(path: str, video_events=(), audio_events=()) -> None:
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO video_events (file_name, object_name, frame, timestamp) "
+            "VALUES (?, ?, ?, ?)",
+            video_events,
+        )
+        conn.executemany(
+            "INSERT INTO audio_events (file_name, transcript, confidence) "
+            "VALUES (?, ?, ?)",
+            audio_events,
+        )
+
+
+def fetch(sql: str) -> list[tuple]:
+    with database.get_engine().connect() as conn:
+        return [tuple(row) for row in conn.execute(text(sql))]
+
+
+class TestExtractionSync:
+    """Test watermarked, set-based sync from extraction.db."""
+
+    @pytest.fixture(autouse=True)
+    def _database(self, test_settings: AppSettings):
+        init_database(test_settings.database.url, test_settings.database)
+        yield
+        asyncio.run(database.dispose_engines())
+
+    def test_events_are_aggregated_per_file(
+        self, test_settings: AppSettings, extraction_db: str
+    ):
+        """Test that detections become one video and transcripts link to it."""
+        add_events(
+            extraction_db,
+            video_events=[
+                ("a.mp4", "person", 0, 0.0),
+                ("a.mp4", "car", 30, 1.0),
+                ("a.mp4", "person", 60, 2.0),
+                ("b.mp4", "dog", 0, 0.0),
+            ],
+            audio_events=[("a.wav", "hello there", 0.9)],
+        )
+
+        report = sync_extraction_db(database.get_engine(), test_settings.sync)
+
+        assert (report.video_events, report.audio_events) == (4, 1)
+        assert (report.videos_created, report.transcriptions_created) == (2, 1)
+        assert report.rows_per_second > 0
+        media_a = os.path.join(test_settings.sync.media_dir, "a.mp4")
+        assert fetch(
+            "SELECT filename, storage_path, summary, detected_objects FROM videos "
+            "ORDER BY filename"
+        )[0] == (
+            "a.mp4",
+            media_a,
+            "Detected objects: car, person",
+            '["car","person"]',
+        )
+        assert fetch(
+            "SELECT t.transcript, t.confidence_score, v.filename "
+            "FROM transcriptions t JOIN videos v ON v.id = t.video_id"
+        ) == [("hello there", 0.9, "a.mp4")]
+
+    def test_sync_is_incremental_and_idempotent(
+        self, test_settings: AppSettings, extraction_db: str
+    ):
+        """Test that reruns read nothing new and later events update in place."""
+        add_events(extraction_db, video_events=[("a.mp4", "person", 0, 0.0)])
+        sync_extraction_db(database.get_engine(), test_settings.sync)
+
+        rerun = sync_extraction_db(database.get_engine(), test_settings.sync)
+        assert rerun.events == 0
+
+        add_events(extraction_db, video_events=[("a.mp4", "bus", 30, 1.0)])
+        report = sync_extraction_db(database.get_engine(), test_settings.sync)
+
+        assert (report.video_events, report.videos_updated) == (1, 1)
+        assert report.videos_created == 0
+        assert fetch("SELECT detected_objects FROM videos") == [('["bus","person"]',)]
+
+    def test_chunked_windows_match_single_pass(
+        self, test_settings: AppSettings, extraction_db: str
+    ):
+        """Test that small chunk_events windows still rebuild each file fully."""
+        add_events(
+            extraction_db,
+            video_events=[(f"v{i % 3}.mp4", f"obj{i}", i, float(i)) for i in range(10)],
+        )
+        test_settings.sync.chunk_events = 3
+
+        report = sync_extraction_db(database.get_engine(), test_settings.sync)
+
+        assert report.video_events == 10
+        assert fetch("SELECT count(*) FROM videos") == [(3,)]
+        assert fetch(
+            "SELECT detected_objects FROM videos WHERE filename = 'v0.mp4'"
+        ) == [('["obj0","obj3","obj6","obj9"]',)]
+        assert fetch("SELECT video_event_id FROM sync_state") == [(10,)]
+
+    def test_recreated_source_is_resynced_without_duplicates(
+        self, test_settings: AppSettings, extraction_db: str
+    ):
+        """Test that a rebuilt extraction.db resets the watermark."""
+        add_events(
+            extraction_db,
+            video_events=[("a.mp4", "person", 0, 0.0), ("a.mp4", "car", 30, 1.0)],
+        )
+        sync_extraction_db(database.get_engine(), test_settings.sync)
+        with sqlite3.connect(extraction_db) as conn:
+            conn.execute("DROP TABLE video_events")
+            conn.execute(EXTRACT_CONFIG.database.video_events)
+        add_events(extraction_db, video_events=[("a.mp4", "dog", 0, 0.0)])
+
+        report = sync_extraction_db(database.get_engine(), test_settings.sync)
+
+        assert report.videos_updated == 1
+        assert fetch("SELECT detected_objects FROM videos") == [('["dog"]',)]
+
+    def test_missing_source_raises(self, test_settings: AppSettings):
+        """Test that a missing extraction.db is reported, not created."""
+        with pytest.raises(FileNotFoundError):
+            sync_extraction_db(database.get_engine(), test_settings.sync)
+        assert not os.path.exists(test_settings.sync.extraction_db_path)
+
+
+class TestExtractionSyncTask:
+    """Test the startup sync task of the app."""
+
+    def test_startup_sync_fills_api_and_reports_status(
+        self, test_settings: AppSettings, extraction_db: str
+    ):
+        """Test that offline results show up in /videos after startup."""
+        add_events(extraction_db, video_events=[("a.mp4", "person", 0, 0.0)])
+        cfg = OmegaConf.create(
+            {
+                "raw_data_dir": test_settings.storage.raw_data_dir,
+                "preprocessing_data_dir": (
+                    test_settings.storage.preprocessing_data_dir
+                ),
+                "processed_data_dir": test_settings.storage.processed_data_dir,
+                "database": {"url": test_settings.database.url},
+                "sync": {"enabled": True, "interval_seconds": 0},
+            }
+        )
+        app = create_app(cfg, project_root=test_settings.project_root)
+
+        with TestClient(app) as client:
+            for _ in range(100):
+                status = client.get("/sync/status").json()
+                if status["last_report"] is not None:
+                    break
+                time.sleep(0.05)
+            assert status["last_report"]["videos_created"] == 1
+            assert [v["filename"] for v in client.get("/videos").json()] == ["a.mp4"]
+
+            # Core writes bypass the ORM listeners; the task clears the cache.
+            add_events(extraction_db, video_events=[("b.mp4", "dog", 0, 0.0)])
+            asyncio.run(app.state.extraction_sync.run_once())
+            videos = client.get("/videos").json()
+
+        assert sorted(video["filename"] for video in videos) == ["a.mp4", "b.mp4"]
+
+    def test_stamp_touch_clears_a_single_worker_cache(
+        self, test_settings: AppSettings, extraction_db: str
+    ):
+        """Test that the stamp written by the sync command clears the cache."""
+        add_events(extraction_db, video_events=[("a.mp4", "person", 0, 0.0)])
+        cfg = OmegaConf.create(
+            {
+                "raw_data_dir": test_settings.storage.raw_data_dir,
+                "preprocessing_data_dir": (
+                    test_settings.storage.preprocessing_data_dir
+                ),
+                "processed_data_dir": test_settings.storage.processed_data_dir,
+                "database": {"url": test_settings.database.url},
+            }
+        )
+        app = create_app(cfg, project_root=test_settings.project_root)
+
+        with TestClient(app) as client:
+            assert client.get("/videos").json() == []
+            assert client.get("/videos").headers[CACHE_HEADER] == "HIT"
+
+            # What src/sync_extraction.py does from another process.
+            sync_extraction_db(database.get_engine(), test_settings.sync)
+            touch_stamp(
+                os.path.join(test_settings.storage.processed_data_dir, CACHE_STAMP_FILE)
+            )
+            response = client.get("/videos")
+
+        assert response.headers[CACHE_HEADER] == "MISS"
+        assert [video["filename"] for video in response.json()] == ["a.mp4"]
@@ -0,0 +1,120 @@
+"""Tests for the in-process metrics registry and the /metrics endpoint."""
+
+from __future__ import annotations
+
+import re
+
+from fastapi.testclient import TestClient
+from omegaconf import OmegaConf
+
+from backend.app import create_app
+from backend.metrics import CONTENT_TYPE, Histogram, MetricsRegistry
+from backend.settings import AppSettings
+
+
+def sample(body: str, name: str, **labels: str) -> float:
+    """Return the value of one sample line, or 0 if it is absent."""
+    for line in body.splitlines():
+        if line.startswith("#") or not line.startswith(name):
+            continue
+        series, value = line.rsplit(" ", 1)
+        found = dict(re.findall(r'(\w+)="([^"]*)"', series))
+        if series.split("{")[0] == name and found == labels:
+            return float(value)
+    return 0.0
+
+
+class TestMetricsRegistry:
+    """Test the text exposition format."""
+
+    def test_histogram_buckets_are_cumulative(self, monkeypatch):
+        """Test that bucket counts include all smaller buckets plus +Inf."""
+        registry = MetricsRegistry()
+        monkeypatch.setattr("backend.metrics.REGISTRY", registry)
+        histogram = Histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.5, 5.0):
+            histogram.labels('say "hi"').observe(value)
+        body = registry.render()
+
+        assert "# TYPE demo_seconds histogram" in body
+        assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="0.1"} 1' in body
+        assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="1"} 2' in body
+        assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="+Inf"} 3' in body
+        assert 'demo_seconds_count{stage="say \\"hi\\""} 3' in body
+        assert 'demo_seconds_sum{stage="say \\"hi\\""} 5.55' in body
+
+
+class TestMetricsEndpoint:
+    """Test request, pipeline, database and process metrics."""
+
+    def test_requests_are_labelled_by_route_template(self, client: TestClient):
+        """Test that path parameters do not create one series per id."""
+        before = sample(
+            client.get("/metrics").text,
+            "http_requests_total",
+            method="GET",
+            route="/jobs/{job_id}",
+            status="404",
+        )
+        client.get("/jobs/12345")
+        client.get("/jobs/67890")
+
+        response = client.get("/metrics")
+
+        assert response.headers["content-type"] == CONTENT_TYPE
+        body = response.text
+        labels = {"method": "GET", "route": "/jobs/{job_id}", "status": "404"}
+        assert sample(body, "http_requests_total", **labels) == before + 2
+        durations = sample(
+            body,
+            "http_request_duration_seconds_count",
+            method="GET",
+            route="/jobs/{job_id}",
+        )
+        assert durations >= 2
+        assert "/jobs/12345" not in body
+        assert sample(body, "http_requests_in_flight") == 1
+        assert sample(body, "process_resident_memory_bytes") > 0
+        assert sample(body, "process_cpu_seconds_total") > 0
+
+    def test_video_upload_records_stages_bytes_and_queries(
+        self, client: TestClient, sample_video_file: str
+    ):
+        """Test that processing stages, upload bytes and SQL timings are recorded."""
+        before = client.get("/metrics").text
+        with open(sample_video_file, "rb") as f:
+            payload = f.read()
+        client.post(
+            "/process/video", files={"file": ("test_video.mp4", payload, "video/mp4")}
+        )
+
+        after = client.get("/metrics").text
+
+        for stage in ("persist", "key_frames", "detection", "db_commit"):
+            series = {"processor": "video", "stage": stage}
+            name = "processing_stage_duration_seconds_count"
+            assert sample(after, name, **series) == sample(before, name, **series) + 1
+        assert sample(after, "upload_bytes_total") - sample(
+            before, "upload_bytes_total"
+        ) == len(payload)
+        assert sample(
+            after, "db_query_duration_seconds_count", operation="INSERT"
+        ) > sample(before, "db_query_duration_seconds_count", operation="INSERT")
+
+    def test_metrics_can_be_disabled(self, test_settings: AppSettings):
+        """Test that no endpoint or middleware is installed when disabled."""
+        cfg = OmegaConf.create(
+            {
+                "raw_data_dir": test_settings.storage.raw_data_dir,
+                "preprocessing_data_dir": (
+                    test_settings.storage.preprocessing_data_dir
+                ),
+                "processed_data_dir": test_settings.storage.processed_data_dir,
+                "database": {"url": test_settings.database.url},
+                "metrics": {"enabled": False},
+            }
+        )
+        client = TestClient(create_app(cfg, project_root=test_settings.project_root))
+
+        assert client.get("/metrics").status_code == 404
@@ -0,0 +1,168 @@
+"""Tests for multi-worker serving: app factory, shared state and pre-fork."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+from omegaconf import OmegaConf
+
+from backend import database, models
+from backend.database import init_database, new_async_session
+from backend.response_cache import CachedResponse, ResponseCache
+from backend.services.job_runner import JobRunner
+from backend.serving import CONFIG_ENV, PROJECT_ROOT_ENV, app_factory
+from backend.settings import AppSettings, build_settings
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def storage_config(test_settings: AppSettings, **overrides) -> dict:
+    return {
+        "raw_data_dir": test_settings.storage.raw_data_dir,
+        "preprocessing_data_dir": test_settings.storage.preprocessing_data_dir,
+        "processed_data_dir": test_settings.storage.processed_data_dir,
+        "database": {"url": test_settings.database.url},
+        **overrides,
+    }
+
+
+class CountingProcessor:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def process_path(self, path: str, filename: str, db) -> None:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+
+
+class TestWorkerSettings:
+    """Test settings and factory used by every worker process."""
+
+    def test_app_factory_reads_exported_config(
+        self, test_settings: AppSettings, temp_dir: str, monkeypatch
+    ):
+        """Test that the import-string factory rebuilds the app from the file."""
+        config_path = os.path.join(temp_dir, "backend_app.yaml")
+        OmegaConf.save(
+            OmegaConf.create(storage_config(test_settings, backend={"workers": 3})),
+            config_path,
+        )
+        monkeypatch.setenv(CONFIG_ENV, config_path)
+        monkeypatch.setenv(PROJECT_ROOT_ENV, test_settings.project_root)
+
+        app = app_factory()
+
+        assert app.state.settings.server.workers == 3
+        assert app.state.job_runner.recover_running is False
+        assert app.state.response_cache.stamp_path is not None
+
+    def test_sqlite_is_forced_to_wal_with_several_workers(self, temp_dir: str):
+        """Test that multi-process SQLite always gets WAL and a busy timeout."""
+        settings = build_settings(
+            {
+                "database": {"pragmas": {"journal_mode": "DELETE"}},
+                "backend": {"workers": 4},
+            },
+            project_root=temp_dir,
+        )
+
+        assert settings.database.pragmas == {
+            "journal_mode": "WAL",
+            "busy_timeout": 5000,
+        }
+
+
+class TestSharedState:
+    """Test state that several workers share through the database or files."""
+
+    def test_cache_invalidation_reaches_other_workers(self, temp_dir: str):
+        """Test that a commit seen by one worker clears the other worker's cache."""
+        stamp = os.path.join(temp_dir, ".response-cache-stamp")
+        reader = ResponseCache(stamp_path=stamp)
+        writer = ResponseCache(stamp_path=stamp)
+        entry = CachedResponse(b"[]", {}, '"etag"', "date", time.monotonic() + 60)
+        reader.put("/videos?", entry, reader.version)
+        assert reader.get("/videos?") is entry
+
+        writer.invalidate()
+
+        assert reader.get("/videos?") is None
+        assert reader.invalidations == 1
+
+    def test_queued_job_is_claimed_by_one_worker(self, test_settings: AppSettings):
+        """Test that workers that both enqueue a job process it only once."""
+        init_database(test_settings.database.url, test_settings.database)
+        processor = CountingProcessor()
+
+        async def scenario() -> str:
+            async with new_async_session() as db:
+                job = models.Job(
+                    kind="audio", status="queued", filename="a.wav", storage_path="a"
+                )
+                db.add(job)
+                await db.commit()
+            runners = [
+                JobRunner(processor, processor, recover_running=False) for _ in range(2)
+            ]
+            await asyncio.gather(*(runner._run(job.id) for runner in runners))
+            async with new_async_session() as db:
+                return (await db.get(models.Job, job.id)).status
+
+        assert asyncio.run(scenario()) == "done"
+        assert processor.calls == 1
+        asyncio.run(database.dispose_engines())
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "fork") or not os.path.exists("/proc/self/task"),
+    reason="pre-fork serving needs fork and /proc",
+)
+class TestPreforkServer:
+    """Test the pre-fork supervisor end to end."""
+
+    def test_workers_share_the_port_and_stop_on_sigterm(
+        self, test_settings: AppSettings, temp_dir: str
+    ):
+        """Test that N forked workers serve requests and exit cleanly."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        cfg = storage_config(
+            test_settings, backend={"host": "127.0.0.1", "port": port, "workers": 2}
+        )
+        script = (
+            "from omegaconf import OmegaConf; from backend.serving import serve; "
+            f"serve(OmegaConf.create({cfg!r}), project_root={temp_dir!r})"
+        )
+        process = subprocess.Popen([sys.executable, "-c", script], cwd=PROJECT_ROOT)
+        response = None
+        try:
+            for _ in range(200):
+                try:
+                    response = httpx.get(f"http://127.0.0.1:{port}/health/ready")
+                    if response.status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.05)
+            children_path = f"/proc/{process.pid}/task/{process.pid}/children"
+            with open(children_path, encoding="utf-8") as file:
+                children = file.read().split()
+
+            assert response is not None and response.status_code == 200
+            assert len(children) == 2
+            listing = httpx.get(f"http://127.0.0.1:{port}/videos")
+            assert listing.status_code == 200
+        finally:
+            process.send_signal(signal.SIGTERM)
+            code = process.wait(timeout=20)
+
+        assert code == 0
@@ -0,0 +1,223 @@
+"""Tests for lazy imports, deferred initialization and readiness."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from omegaconf import OmegaConf
+
+from backend import database
+from backend.app import create_app
+from backend.services.batching import MicroBatcher
+from backend.services.transcriber import WhisperTranscriber
+from backend.settings import AppSettings
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+HEAVY_MODULES = ("cv2", "numpy", "soundfile", "torch", "transformers", "ultralytics")
+
+
+def app_config(test_settings: AppSettings, **overrides) -> OmegaConf:
+    return OmegaConf.create(
+        {
+            "raw_data_dir": test_settings.storage.raw_data_dir,
+            "preprocessing_data_dir": test_settings.storage.preprocessing_data_dir,
+            "processed_data_dir": test_settings.storage.processed_data_dir,
+            "database": {"url": test_settings.database.url},
+            **overrides,
+        }
+    )
+
+
+def wait_until_ready(client: TestClient) -> dict:
+    for _ in range(100):
+        status = client.get("/health/ready").json()
+        # Components warm up concurrently; wait until each is up or failed.
+        if all(
+            up or name in status["errors"] for name, up in status["components"].items()
+        ):
+            return status
+        time.sleep(0.05)
+    return status
+
+
+class TestLazyImports:
+    """Test that importing the backend stays cheap."""
+
+    def test_app_import_skips_heavy_libraries(self):
+        """Test that importing backend.app loads no model or media library."""
+        probe = (
+            "import json, sys; import backend.app; "
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", probe],
+            capture_output=True,
+            text=True,
+            cwd=PROJECT_ROOT,
+            check=True,
+        )
+
+        assert json.loads(completed.stdout) == []
+
+
+class TestReadiness:
+    """Test liveness, readiness and the lifespan warm-up."""
+
+    def test_create_app_defers_schema(self, test_settings: AppSettings):
+        """Test that tables are created on first use, not in create_app."""
+        create_app(app_config(test_settings), project_root=test_settings.project_root)
+        db_path = test_settings.database.url.removeprefix("sqlite:///")
+
+        assert not database.schema_ready()
+        with sqlite3.connect(db_path) as conn:
+            tables = conn.execute("SELECT name FROM sqlite_master").fetchall()
+        assert ("videos",) not in tables
+
+        with database.session_scope():
+            pass
+        assert database.schema_ready()
+
+    def test_live_before_ready(self, client: TestClient):
+        """Test that liveness answers while readiness reports 503 before warm-up."""
+        assert client.get("/health/live").json() == {"status": "ok"}
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["components"] == {"database": False, "jobs": False}
+
+    def test_lifespan_warm_up_sets_ready(self, test_app):
+        """Test that the lifespan warm-up brings every component up."""
+        with TestClient(test_app) as client:
+            status = wait_until_ready(client)
+
+        assert status["ready"] is True
+        assert set(status["seconds"]) == {"database", "jobs"}
+
+    def test_failed_model_load_keeps_app_unready(
+        self, test_settings: AppSettings, monkeypatch
+    ):
+        """Test that a model that cannot load is reported and fails its requests."""
+
+        def fail() -> None:
+            raise OSError("checkpoint missing")
+
+        monkeypatch.setattr(WhisperTranscriber, "_load_model", lambda self: fail())
+        app = create_app(
+            app_config(test_settings, transcription={"enabled": True}),
+            project_root=test_settings.project_root,
+        )
+
+        with TestClient(app) as client:
+            status = wait_until_ready(client)
+            assert client.get("/health/live").status_code == 200
+            assert client.get("/health/ready").status_code == 503
+
+        assert status["components"] == {
+            "database": True,
+            "jobs": True,
+            "whisper": False,
+        }
+        assert status["errors"] == {"whisper": "checkpoint missing"}
+
+    def test_models_start_when_the_database_fails(
+        self, test_settings: AppSettings, monkeypatch
+    ):
+        """Test that a failed schema step does not keep the models from loading."""
+
+        def fail() -> None:
+            raise OSError("disk full")
+
+        monkeypatch.setattr("backend.app.ensure_schema", fail)
+        monkeypatch.setattr(WhisperTranscriber, "_load_model", lambda self: None)
+        app = create_app(
+            app_config(test_settings, transcription={"enabled": True}),
+            project_root=test_settings.project_root,
+        )
+
+        with TestClient(app) as client:
+            status = wait_until_ready(client)
+
+        assert status["components"] == {
+            "database": False,
+            "jobs": False,
+            "whisper": True,
+        }
+        assert status["errors"] == {"database": "disk full"}
+
+
+class TestBatcherWarmUp:
+    """Test submits that race with model loading."""
+
+    @pytest.mark.asyncio
+    async def test_submit_waits_for_warm_up(self):
+        """Test that items submitted while the model loads are served after it."""
+        batcher = MicroBatcher("echo", lambda items: items, max_wait_ms=1)
+        loaded = asyncio.Event()
+
+        async def load() -> None:
+            await loaded.wait()
+
+        starting = asyncio.create_task(batcher.start(load()))
+        await asyncio.sleep(0)
+        pending = asyncio.create_task(batcher.submit(1))
+        await asyncio.sleep(0.01)
+        assert not pending.done()
+
+        loaded.set()
+        await starting
+        try:
+            assert await pending == 1
+        finally:
+            await batcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_submit_fails_after_warm_up_error(self):
+        """Test that a failed load is raised to callers instead of hanging."""
+        batcher = MicroBatcher("echo", lambda items: items)
+
+        async def load() -> None:
+            raise OSError("no weights")
+
+        with pytest.raises(OSError):
+            await batcher.start(load())
+
+        with pytest.raises(RuntimeError, match="echo failed to start"):
+            await batcher.submit(1)
+        assert not batcher.started
+
+    def test_submit_before_warm_up_starts_waits(
+        self, test_settings: AppSettings, monkeypatch
+    ):
+        """Test that a request arriving before the warm-up task runs waits."""
+        monkeypatch.setattr(WhisperTranscriber, "_load_model", lambda self: None)
+        monkeypatch.setattr(
+            WhisperTranscriber,
+            "_generate",
+            lambda self, windows: ["text"] * len(windows),
+        )
+        app = create_app(
+            app_config(test_settings, transcription={"enabled": True}),
+            project_root=test_settings.project_root,
+        )
+        transcriber = app.state.audio_processor.transcriber
+
+        async def scenario() -> str:
+            pending = asyncio.create_task(transcriber.batcher.submit("window"))
+            await asyncio.sleep(0.01)
+            assert not pending.done()
+            await transcriber.start()
+            try:
+                return await pending
+            finally:
+                await transcriber.stop()
+
+        assert asyncio.run(scenario()) == "text"
@@ -0,0 +1,155 @@
+"""Unit tests for streamed upload persistence."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from io import BytesIO
+
+import pytest
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from omegaconf import OmegaConf
+
+from backend.admission import BodyLimitMiddleware
+from backend.app import create_app
+from backend.services.storage import stream_upload
+from backend.settings import AppSettings, UploadSettings
+
+
+class TestStreamUpload:
+    """Test chunked upload streaming, hashing and size limits."""
+
+    @pytest.mark.asyncio
+    async def test_stream_upload_writes_file_and_hash(self, temp_dir: str):
+        """Test that the stored file and digest match the uploaded bytes."""
+        data = os.urandom(10_000)
+        upload = UploadFile(BytesIO(data), filename="clip.mp4")
+        settings = UploadSettings(
+            chunk_size=1024, max_upload_bytes=1_000_000, max_request_bytes=2_000_000
+        )
+
+        stored = await stream_upload(
+            upload, dest_dir=temp_dir, upload_settings=settings
+        )
+
+        digest = hashlib.sha256(data).hexdigest()
+        assert stored.path == os.path.join(temp_dir, f"{digest}.mp4")
+        assert stored.size == len(data)
+        assert stored.sha256 == digest
+        with open(stored.path, "rb") as f:
+            assert f.read() == data
+        assert not [name for name in os.listdir(temp_dir) if name.endswith(".part")]
+
+    @pytest.mark.asyncio
+    async def test_same_filename_with_different_content_is_kept(self, temp_dir: str):
+        """Test that uploads sharing a filename no longer overwrite each other."""
+        settings = UploadSettings(
+            chunk_size=1024, max_upload_bytes=1_000_000, max_request_bytes=2_000_000
+        )
+
+        first = await stream_upload(
+            UploadFile(BytesIO(b"first"), filename="clip.mp4"),
+            dest_dir=temp_dir,
+            upload_settings=settings,
+        )
+        second = await stream_upload(
+            UploadFile(BytesIO(b"second"), filename="clip.mp4"),
+            dest_dir=temp_dir,
+            upload_settings=settings,
+        )
+
+        assert first.path != second.path
+        with open(first.path, "rb") as f:
+            assert f.read() == b"first"
+
+    @pytest.mark.asyncio
+    async def test_stream_upload_rejects_oversized_file(self, temp_dir: str):
+        """Test that uploads over the limit fail with 413 and leave no files."""
+        upload = UploadFile(BytesIO(b"x" * 5000), filename="big.mp4")
+        settings = UploadSettings(
+            chunk_size=1024, max_upload_bytes=4096, max_request_bytes=8192
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await stream_upload(upload, dest_dir=temp_dir, upload_settings=settings)
+
+        assert exc_info.value.status_code == 413
+        assert os.listdir(temp_dir) == []
+
+
+def limited_app(max_bytes: int, reads: list[int]) -> FastAPI:
+    """App with one upload route behind a ``max_bytes`` body limit."""
+    app = FastAPI()
+
+    @app.post("/process/video")
+    async def process(file: UploadFile = File(...)) -> dict[str, int]:
+        reads.append(file.size or 0)
+        return {"size": file.size or 0}
+
+    app.add_middleware(
+        BodyLimitMiddleware, max_bytes=max_bytes, paths=("/process/video",)
+    )
+    return app
+
+
+class TestBodyLimit:
+    """Test that oversized request bodies are refused before they are spooled."""
+
+    def test_content_length_over_limit_is_refused_unread(self):
+        """Test that a declared oversized body gets 413 without reaching the route."""
+        reads: list[int] = []
+        client = TestClient(limited_app(4096, reads))
+
+        small = client.post("/process/video", files={"file": ("a.mp4", b"x" * 100)})
+        large = client.post("/process/video", files={"file": ("b.mp4", b"x" * 5000)})
+
+        assert small.status_code == 200
+        assert large.status_code == 413
+        assert large.json()["reason"] == "body_too_large"
+        assert reads == [100]
+
+    def test_streamed_body_is_cut_off_at_the_limit(self):
+        """Test that a chunked body without Content-Length is capped as it arrives."""
+        reads: list[int] = []
+        client = TestClient(limited_app(4096, reads))
+        boundary = "limit"
+        head = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+            'filename="a.mp4"\r\nContent-Type: video/mp4\r\n\r\n'
+        ).encode()
+
+        def body():
+            yield head
+            for _ in range(10):
+                yield b"x" * 1024
+            yield f"\r\n--{boundary}--\r\n".encode()
+
+        response = client.post(
+            "/process/video",
+            content=body(),
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        )
+
+        assert response.status_code == 413
+        assert reads == []
+
+    def test_app_limits_processing_requests(self, test_settings: AppSettings):
+        """Test that the app applies upload.max_request_mb to processing routes."""
+        cfg = OmegaConf.create(
+            {
+                "raw_data_dir": test_settings.storage.raw_data_dir,
+                "preprocessing_data_dir": test_settings.storage.preprocessing_data_dir,
+                "processed_data_dir": test_settings.storage.processed_data_dir,
+                "database": {"url": test_settings.database.url},
+                "upload": {"max_request_mb": 1},
+            }
+        )
+        with TestClient(create_app(cfg, project_root=test_settings.project_root)) as c:
+            response = c.post(
+                "/process/video",
+                files={"file": ("big.mp4", b"x" * (2 * 1024 * 1024))},
+            )
+
+        assert response.status_code == 413
+        assert response.json()["reason"] == "body_too_large"
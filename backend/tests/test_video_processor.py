@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import threading
 from io import BytesIO
 
 import cv2
@@ -55,6 +56,73 @@ class TestVideoFrameExtraction:
             assert img is not None
             assert img.shape == (480, 640, 3)
 
+    def test_extract_key_frames_samples_expected_indices(
+        self, test_settings, db_session: Session, sample_video_file: str
+    ):
+        """Test that grab-based sampling keeps frames at multiples of the interval."""
+        processor = VideoProcessor(settings=test_settings, frame_interval=20, max_frames=5)
+
+        key_frames = processor._extract_key_frames(sample_video_file)
+
+        assert [os.path.basename(frame) for frame in key_frames] == [
+            "test_video_frame_0000.jpg",
+            "test_video_frame_0020.jpg",
+            "test_video_frame_0040.jpg",
+        ]
+
+    def test_extract_key_frames_seek_matches_grab(
+        self, test_settings, db_session: Session, sample_video_file: str
+    ):
+        """Test that seek-based sampling returns the same frames as grabbing."""
+        grab_processor = VideoProcessor(
+            settings=test_settings, frame_interval=20, max_frames=3, seek_threshold=1000
+        )
+        seek_processor = VideoProcessor(
+            settings=test_settings, frame_interval=20, max_frames=3, seek_threshold=1
+        )
+
+        grab_paths, grab_images = grab_processor._extract_key_frames_with_images(
+            sample_video_file
+        )
+        seek_paths, seek_images = seek_processor._extract_key_frames_with_images(
+            sample_video_file
+        )
+
+        assert grab_paths == seek_paths
+        for grab_image, seek_image in zip(grab_images, seek_images):
+            assert np.array_equal(grab_image, seek_image)
+
+    def test_close_stops_the_encoder_pool(
+        self, test_settings, db_session: Session, sample_video_file: str
+    ):
+        """Test that close finishes pending writes and refuses new key frames."""
+        processor = VideoProcessor(settings=test_settings, frame_interval=10, max_frames=2)
+
+        key_frames = processor._extract_key_frames(sample_video_file)
+        processor.close()
+
+        assert len(key_frames) == 2
+        with pytest.raises(RuntimeError):
+            processor._extract_key_frames(sample_video_file)
+
+    @pytest.mark.skipif(
+        not os.path.isdir("/proc/self/task"), reason="per-thread nice needs Linux"
+    )
+    def test_encoder_threads_are_deprioritised(self, test_settings):
+        """Test that key-frame encoding runs at the processing nice value."""
+        processor = VideoProcessor(settings=test_settings)
+        base = os.getpriority(os.PRIO_PROCESS, 0)
+
+        def nice() -> int:
+            return os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+
+        try:
+            encoder_nice = processor._encode_pool.submit(nice).result()
+        finally:
+            processor.close()
+
+        assert encoder_nice == min(19, base + test_settings.processing.nice)
+
 
 class TestObjectDetection:
     """Test object detection accuracy."""
@@ -140,3 +208,15 @@ class TestObjectDetection:
         assert "bright-scene" in detected or "well-lit-scene" in detected
         assert "portrait" in detected
 
+    def test_detect_objects_accepts_in_memory_frames(
+        self, test_settings, db_session: Session
+    ):
+        """Test that decoded frames can be classified without touching disk."""
+        processor = VideoProcessor(settings=test_settings)
+
+        detected = processor._detect_objects(
+            [np.full((480, 640, 3), 200, dtype=np.uint8)]
+        )
+
+        assert "bright-scene" in detected
+        assert "landscape" in detected
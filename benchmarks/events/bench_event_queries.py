@@ -0,0 +1,278 @@
+"""Temporal event queries over a synthetic ``video_events`` table.
+
+Fills an extraction database with the pipeline's schema (``extract_config.yaml``)
+and ``--rows`` detections, then times the ``backend.services.event_queries``
+statements under three index layouts:
+
+- ``scan``: no secondary indexes (the schema before ``video_event_indexes``);
+- ``object_only``: ``(file_name, object_name, timestamp)`` and ``(object_name)``;
+- ``pipeline``: the ``video_event_indexes`` from ``extract_config.yaml``.
+
+    python benchmarks/events/bench_event_queries.py --rows 10000000
+
+Detections are sampled at one frame per second as the pipeline does, with about
+three boxes per frame, "person" in 40% of them and the other classes skewed.
+Index build time, database size and latency percentiles per query are written
+as JSON to ``benchmarks/events/results/``.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Sequence
+
+from omegaconf import OmegaConf
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from backend.services.event_queries import (  # noqa: E402
+    EventStore,
+    co_occurrence,
+    file_timeline,
+    object_intervals,
+)
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_CONFIG = os.path.join(PROJECT_ROOT, "config", "extract_config.yaml")
+
+# The 80 COCO classes the pipeline's YOLO checkpoints emit.
+OBJECTS = (
+    "person bicycle car motorcycle airplane bus train truck boat traffic_light "
+    "fire_hydrant stop_sign parking_meter bench bird cat dog horse sheep cow "
+    "elephant bear zebra giraffe backpack umbrella handbag tie suitcase frisbee "
+    "skis snowboard sports_ball kite baseball_bat baseball_glove skateboard "
+    "surfboard tennis_racket bottle wine_glass cup fork knife spoon bowl banana "
+    "apple sandwich orange broccoli carrot hot_dog pizza donut cake chair couch "
+    "potted_plant bed dining_table toilet tv laptop mouse remote keyboard "
+    "cell_phone microwave oven toaster sink refrigerator book clock vase "
+    "scissors teddy_bear hair_drier toothbrush"
+).split()
+
+BOXES_PER_FRAME = 3
+
+# Row i belongs to file i / per_file and to the frame sampled at second
+# (i % per_file) / BOXES_PER_FRAME. Products of uniform draws skew the class
+# index towards the common (low) classes.
+_POPULATE = """
+WITH RECURSIVE n(i) AS (
+    SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i + 1 < :rows
+)
+INSERT INTO video_events (file_name, object_name, frame, timestamp)
+SELECT
+    printf('video_%05d.mp4', i / :per_file),
+    json_extract(:objects, printf('$[%d]', CASE
+        WHEN abs(random()) % 10 < 4 THEN 0
+        ELSE (abs(random()) % 80) * (abs(random()) % 80) / 80
+    END)),
+    ((i % :per_file) / :boxes) * 30,
+    CAST((i % :per_file) / :boxes AS REAL)
+FROM n
+"""
+
+LAYOUTS: Dict[str, List[str]] = {
+    "scan": [],
+    "object_only": [
+        "CREATE INDEX idx_video_events_file_object_time "
+        "ON video_events (file_name, object_name, timestamp)",
+        "CREATE INDEX idx_video_events_object ON video_events (object_name)",
+    ],
+}
+
+
+def populate(path: str, rows: int, files: int) -> float:
+    """Create the pipeline schema in ``path`` and insert ``rows`` detections."""
+    extract_config = OmegaConf.load(EXTRACT_CONFIG)
+    start = time.perf_counter()
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(extract_config.database.video_events)
+        conn.execute(
+            _POPULATE,
+            {
+                "rows": rows,
+                "per_file": max(1, rows // files),
+                "boxes": BOXES_PER_FRAME,
+                "objects": json.dumps(OBJECTS),
+            },
+        )
+    return time.perf_counter() - start
+
+
+def apply_layout(path: str, statements: Sequence[str]) -> Dict[str, float]:
+    """Replace the secondary indexes of ``video_events`` with ``statements``."""
+    with sqlite3.connect(path) as conn:
+        existing = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'video_events' AND sql IS NOT NULL"
+        ).fetchall()
+        for (name,) in existing:
+            conn.execute(f"DROP INDEX {name}")
+        start = time.perf_counter()
+        for statement in statements:
+            conn.execute(statement)
+        build_s = time.perf_counter() - start
+        conn.execute("ANALYZE")
+    conn.close()
+    with sqlite3.connect(path) as conn:
+        conn.execute("VACUUM")
+    conn.close()
+    return {"index_build_s": build_s, "db_bytes": os.path.getsize(path)}
+
+
+def _percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "first_ms": samples[0] * 1000,
+        "p50_ms": statistics.median(ms),
+        "p95_ms": ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))],
+        "max_ms": ms[-1],
+    }
+
+
+def build_queries(args: argparse.Namespace) -> Dict[str, Callable[[Any, Any], Any]]:
+    """Query name -> ``fn(conn, rng)`` running one randomly parameterised query."""
+    common, medium, rare = OBJECTS[:8], OBJECTS[8:40], OBJECTS[60:]
+
+    def file_name(rng: random.Random) -> str:
+        return f"video_{rng.randrange(args.files):05d}.mp4"
+
+    return {
+        "intervals_in_file": lambda conn, rng: object_intervals(
+            conn, rng.choice(medium), file_name=file_name(rng)
+        ),
+        "intervals_in_file_range": lambda conn, rng: object_intervals(
+            conn, rng.choice(common), file_name=file_name(rng), start=60.0, end=300.0
+        ),
+        "intervals_all_files": lambda conn, rng: object_intervals(
+            conn, rng.choice(rare), limit=args.limit
+        ),
+        "co_occurrence_rare": lambda conn, rng: co_occurrence(
+            conn, rng.sample(rare, 2), limit=args.limit
+        ),
+        "co_occurrence_common": lambda conn, rng: co_occurrence(
+            conn, ["person", rng.choice(common[1:])], limit=args.limit
+        ),
+        "timeline": lambda conn, rng: file_timeline(
+            conn, file_name(rng), bucket_seconds=60.0, limit=args.limit
+        ),
+    }
+
+
+def time_queries(
+    path: str, args: argparse.Namespace, repeats: int
+) -> Dict[str, Dict[str, float]]:
+    store = EventStore(path)
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        with store.connect() as conn:
+            for name, query in build_queries(args).items():
+                rng = random.Random(args.seed)
+                samples, rows = [], 0
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    rows += len(query(conn, rng) or ())
+                    samples.append(time.perf_counter() - start)
+                results[name] = {**_percentiles(samples), "mean_rows": rows / repeats}
+                logger.info(f"  {name}: p50 {results[name]['p50_ms']:.1f} ms")
+    finally:
+        store.dispose()
+    return results
+
+
+def run(args: argparse.Namespace, work_dir: str) -> Dict[str, Any]:
+    path = os.path.join(work_dir, "extraction.db")
+    logger.info(f"Inserting {args.rows} detections over {args.files} files.")
+    populate_s = populate(path, args.rows, args.files)
+    logger.info(f"Populated in {populate_s:.1f}s.")
+
+    layouts = {
+        **LAYOUTS,
+        "pipeline": list(OmegaConf.load(EXTRACT_CONFIG).database.video_event_indexes),
+    }
+    report: Dict[str, Any] = {"populate_s": populate_s, "layouts": {}}
+    for name in args.layouts:
+        statements = layouts[name]
+        layout = apply_layout(path, statements)
+        logger.info(
+            f"{name}: indexes built in {layout['index_build_s']:.1f}s, "
+            f"{layout['db_bytes'] / 2**20:.0f} MiB"
+        )
+        repeats = args.scan_repeats if name == "scan" else args.repeats
+        report["layouts"][name] = {
+            **layout,
+            "indexes": statements,
+            "queries": time_queries(path, args, repeats),
+        }
+    return report
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument(
+        "--layouts",
+        nargs="+",
+        choices=["scan", "object_only", "pipeline"],
+        default=["scan", "object_only", "pipeline"],
+    )
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument(
+        "--scan-repeats", type=int, default=3, help="Repeats without indexes."
+    )
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="JSON output path (defaults to a timestamped file under results/).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        level=logging.INFO,
+    )
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        report = run(args, work_dir)
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"event_queries_{timestamp}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "timestamp": timestamp,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "sqlite": sqlite3.sqlite_version,
+                "params": {k: v for k, v in vars(args).items() if k != "output"},
+                **report,
+            },
+            file,
+            indent=2,
+        )
+    logger.info(f"Wrote results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+"""HTTP load test of the backend under concurrent clients.
+
+Starts the app with uvicorn in a separate process (so client and server do not
+share a GIL), seeds its database with synthetic videos and transcriptions, and
+drives each scenario with ``--concurrency`` asyncio workers over httpx:
+
+    python benchmarks/load/bench_load.py --requests 500 --concurrency 32
+
+Scenarios:
+
+- ``search_storm``: ``GET /search`` with varying terms and page sizes.
+- ``list_pagination``: walks ``GET /videos`` following ``X-Next-Cursor``.
+- ``audio_upload``: ``POST /process/audio`` with distinct synthetic WAV files.
+- ``video_upload``: ``POST /process/video`` with distinct synthetic MP4 files.
+
+Uploads are generated like the fixtures in ``backend/tests/conftest.py``, one
+file per request, so the content-hash dedup never short-circuits processing.
+Nothing is downloaded and models stay disabled, so the run works offline. Pass
+``--url`` to target an already running server instead (no seeding).
+Throughput, p50/p95/p99 latency and error rates are written as JSON to
+``benchmarks/load/results/``.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Sequence
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import cv2  # noqa: E402
+import httpx  # noqa: E402
+import numpy as np  # noqa: E402
+from omegaconf import OmegaConf  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "person car dog truck bicycle bus street park meeting kitchen "
+    "weather traffic music interview river market"
+).split()
+
+
+@dataclass
+class Samples:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+    def add(self, latency: float, status: int | str) -> None:
+        self.latencies.append(latency)
+        key = str(status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors += 1
+
+
+Operation = Callable[[httpx.AsyncClient, int, Samples], Awaitable[None]]
+
+
+def make_video(index: int, frames: int, width: int, height: int) -> bytes:
+    """Encode ``frames`` random frames to MP4; ``index`` seeds distinct content."""
+    rng = np.random.default_rng(index)
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as file:
+        writer = cv2.VideoWriter(
+            file.name, cv2.VideoWriter_fourcc(*"mp4v"), 20.0, (width, height)
+        )
+        for _ in range(frames):
+            writer.write(rng.integers(0, 255, (height, width, 3), dtype=np.uint8))
+        writer.release()
+        with open(file.name, "rb") as video:
+            return video.read()
+
+
+def make_wav(index: int, seconds: float, sample_rate: int = 16000) -> bytes:
+    """Build a mono 16-bit PCM WAV of random samples seeded by ``index``."""
+    rng = np.random.default_rng(index)
+    data = rng.integers(-2000, 2000, int(seconds * sample_rate), dtype=np.int16)
+    payload = data.tobytes()
+    header = b"".join(
+        [
+            b"RIFF",
+            (36 + len(payload)).to_bytes(4, "little"),
+            b"WAVE",
+            b"fmt ",
+            (16).to_bytes(4, "little"),
+            (1).to_bytes(2, "little"),
+            (1).to_bytes(2, "little"),
+            sample_rate.to_bytes(4, "little"),
+            (sample_rate * 2).to_bytes(4, "little"),
+            (2).to_bytes(2, "little"),
+            (16).to_bytes(2, "little"),
+            b"data",
+            len(payload).to_bytes(4, "little"),
+        ]
+    )
+    return header + payload
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed_database(database_url: str, rows: int) -> None:
+    """Insert ``rows`` videos and transcriptions with searchable text."""
+    from sqlalchemy import insert
+
+    from backend import database, models
+
+    database.init_database(database_url)
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    with database.get_engine().begin() as conn:
+        for offset in range(0, rows, 10_000):
+            chunk = range(offset, min(offset + 10_000, rows))
+            conn.execute(
+                insert(models.Video),
+                [
+                    {
+                        "filename": f"clip_{i:07d}.mp4",
+                        "storage_path": f"/data/videos/clip_{i:07d}.mp4",
+                        "summary": f"Detected objects: {_sentence(rng, 3)}",
+                        "detected_objects": sorted(set(_sentence(rng, 3).split())),
+                        "key_frames": [],
+                        "created_at": start + timedelta(seconds=i),
+                    }
+                    for i in chunk
+                ],
+            )
+            conn.execute(
+                insert(models.Transcription),
+                [
+                    {
+                        "filename": f"clip_{i:07d}.wav",
+                        "storage_path": f"/data/audio/clip_{i:07d}.wav",
+                        "transcript": _sentence(rng, 20),
+                        "confidence_score": 0.9,
+                        "created_at": start + timedelta(seconds=i),
+                    }
+                    for i in chunk
+                ],
+            )
+    asyncio.run(database.dispose_engines())
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(config_path: str, port: int) -> None:
+    """Child-process entry point: run the app described by ``config_path``."""
+    import uvicorn
+
+    from backend.app import create_app
+
+    cfg = OmegaConf.load(config_path)
+    app = create_app(cfg, project_root=os.path.dirname(config_path))
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+@contextmanager
+def local_server(work_dir: str, args: argparse.Namespace) -> Iterator[str]:
+    """Seed a fresh database, start uvicorn on a free port and wait for ready."""
+    database_url = f"sqlite:///{os.path.join(work_dir, 'load.db')}"
+    logger.info(f"Seeding {args.rows} videos and transcriptions.")
+    seed_database(database_url, args.rows)
+
+    config_path = os.path.join(work_dir, "backend_app.yaml")
+    OmegaConf.save(
+        OmegaConf.create(
+            {
+                "raw_data_dir": os.path.join(work_dir, "raw"),
+                "preprocessing_data_dir": os.path.join(work_dir, "preprocessed"),
+                "processed_data_dir": os.path.join(work_dir, "processed"),
+                "database": {"url": database_url},
+                "cache": {"enabled": not args.no_cache},
+            }
+        ),
+        config_path,
+    )
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", config_path]
+        + ["--port", str(port)],
+        cwd=PROJECT_ROOT,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + args.startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode}.")
+            try:
+                if httpx.get(f"{url}/health/ready", timeout=1).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Server not ready after {args.startup_timeout}s.")
+            time.sleep(0.1)
+        yield url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def _timed(
+    samples: Samples, send: Awaitable[httpx.Response]
+) -> httpx.Response | None:
+    started = time.perf_counter()
+    try:
+        response = await send
+    except httpx.HTTPError as error:
+        samples.add(time.perf_counter() - started, type(error).__name__)
+        return None
+    samples.add(time.perf_counter() - started, response.status_code)
+    return response
+
+
+def build_payloads(name: str, args: argparse.Namespace) -> List[bytes]:
+    """Generate one distinct upload per operation before the timed run."""
+    if name == "audio_upload":
+        return [
+            make_wav(args.seed + i, args.audio_seconds) for i in range(args.uploads)
+        ]
+    return [
+        make_video(args.seed + i, args.video_frames, *args.video_size)
+        for i in range(args.uploads)
+    ]
+
+
+def build_scenarios(
+    args: argparse.Namespace, payloads: Dict[str, List[bytes]]
+) -> Dict[str, Operation]:
+    async def search_storm(client: httpx.AsyncClient, i: int, samples: Samples):
+        rng = random.Random(i)
+        term = " ".join(rng.sample(WORDS, rng.choice((1, 1, 2))))
+        limit = rng.choice((10, 20, 50))
+        await _timed(
+            samples,
+            client.get("/search", params={"term": term, "limit": limit}),
+        )
+
+    async def list_pagination(client: httpx.AsyncClient, i: int, samples: Samples):
+        params: Dict[str, Any] = {"limit": args.page_size, "view": "summary"}
+        for _ in range(args.pages):
+            response = await _timed(samples, client.get("/videos", params=params))
+            cursor = response.headers.get("X-Next-Cursor") if response else None
+            if not cursor:
+                break
+            params["cursor"] = cursor
+
+    async def audio_upload(client: httpx.AsyncClient, i: int, samples: Samples):
+        payload = payloads["audio_upload"][i]
+        files = {"file": (f"load_{i}.wav", payload, "audio/wav")}
+        await _timed(samples, client.post("/process/audio", files=files))
+
+    async def video_upload(client: httpx.AsyncClient, i: int, samples: Samples):
+        payload = payloads["video_upload"][i]
+        files = {"file": (f"load_{i}.mp4", payload, "video/mp4")}
+        await _timed(samples, client.post("/process/video", files=files))
+
+    return {
+        "search_storm": search_storm,
+        "list_pagination": list_pagination,
+        "audio_upload": audio_upload,
+        "video_upload": video_upload,
+    }
+
+
+def summarize(samples: Samples, wall_seconds: float) -> Dict[str, Any]:
+    latencies = sorted(samples.latencies)
+    count = len(latencies)
+    report: Dict[str, Any] = {
+        "requests": count,
+        "wall_s": wall_seconds,
+        "throughput_rps": count / wall_seconds if wall_seconds else 0.0,
+        "errors": samples.errors,
+        "error_rate": samples.errors / count if count else 0.0,
+        "statuses": samples.statuses,
+    }
+    if count >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        report["latency_ms"] = {
+            "mean": statistics.fmean(latencies) * 1000,
+            "p50": cuts[49] * 1000,
+            "p95": cuts[94] * 1000,
+            "p99": cuts[98] * 1000,
+            "max": latencies[-1] * 1000,
+        }
+    return report
+
+
+async def run_scenario(
+    url: str, operation: Operation, operations: int, args: argparse.Namespace
+) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    client = httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout)
+    samples = Samples()
+    counter = itertools.count()
+
+    async def worker() -> None:
+        while (i := next(counter)) < operations:
+            await operation(client, i, samples)
+
+    async with client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        wall = time.perf_counter() - started
+    return summarize(samples, wall)
+
+
+def run(args: argparse.Namespace, url: str) -> Dict[str, Any]:
+    payloads: Dict[str, List[bytes]] = {}
+    scenarios = build_scenarios(args, payloads)
+    report: Dict[str, Any] = {}
+    for name in args.scenarios:
+        operations = args.requests
+        if name.endswith("_upload"):
+            payloads[name] = build_payloads(name, args)
+            operations = len(payloads[name])
+        result = asyncio.run(run_scenario(url, scenarios[name], operations, args))
+        report[name] = result
+        latency = result.get("latency_ms", {})
+        logger.info(
+            f"{name}: {result['throughput_rps']:.1f} req/s, "
+            f"p50 {latency.get('p50', 0):.1f} ms, p99 {latency.get('p99', 0):.1f} ms, "
+            f"errors {result['error_rate']:.1%}"
+        )
+    return report
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=("search_storm", "list_pagination", "audio_upload", "video_upload"),
+        default=["search_storm", "list_pagination", "audio_upload", "video_upload"],
+    )
+    parser.add_argument("--requests", type=int, default=1000, help="Per read scenario.")
+    parser.add_argument("--uploads", type=int, default=100, help="Per upload scenario.")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=10, help="Pages per list walk.")
+    parser.add_argument("--video-frames", type=int, default=20)
+    parser.add_argument(
+        "--video-size", type=int, nargs=2, default=(160, 120), metavar=("W", "H")
+    )
+    parser.add_argument("--audio-seconds", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Disable the response cache."
+    )
+    parser.add_argument(
+        "--url", default=None, help="Target a running server instead of starting one."
+    )
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument("--serve", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="JSON output path (defaults to a timestamped file under results/).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        level=logging.INFO,
+    )
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    args = parse_args(argv)
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    if args.url:
+        report = run(args, args.url)
+    else:
+        with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+            with local_server(work_dir, args) as url:
+                report = run(args, url)
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"load_{timestamp}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "timestamp": timestamp,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "params": {
+                    k: v
+                    for k, v in vars(args).items()
+                    if k not in ("output", "serve", "port")
+                },
+                "scenarios": report,
+            },
+            file,
+            indent=2,
+        )
+    logger.info(f"Wrote results to {output}")
+
+
+if __name__ == "__main__":
+    main()
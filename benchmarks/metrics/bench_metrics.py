@@ -0,0 +1,195 @@
+"""Overhead of the ``/metrics`` instrumentation.
+
+Times the metric primitives on their own and then the same requests through
+two apps that differ only in ``metrics.enabled`` (response cache off, so every
+request reaches the database and the SQL hooks):
+
+    python benchmarks/metrics/bench_metrics.py --requests 2000
+
+The uninstrumented app is measured first because the SQLAlchemy hooks are
+process-wide once installed. Results are written as JSON to
+``benchmarks/metrics/results/``.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Sequence
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import httpx  # noqa: E402
+from omegaconf import OmegaConf  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from backend import database, models  # noqa: E402
+from backend.app import create_app  # noqa: E402
+from backend.metrics import (  # noqa: E402
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    render_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+ENDPOINTS = ("/health", "/videos?limit=20")
+
+
+def _primitives(number: int = 200_000) -> Dict[str, float]:
+    """Nanoseconds per call of the operations done on every request."""
+    child = HTTP_LATENCY.labels("GET", "/bench")
+    counter = HTTP_REQUESTS.labels("GET", "/bench", "200")
+    timings = {
+        "counter_inc_ns": timeit.timeit(counter.inc, number=number),
+        "histogram_observe_ns": timeit.timeit(
+            lambda: child.observe(0.003), number=number
+        ),
+        "labels_and_observe_ns": timeit.timeit(
+            lambda: HTTP_LATENCY.labels("GET", "/bench").observe(0.003),
+            number=number,
+        ),
+    }
+    report = {name: seconds / number * 1e9 for name, seconds in timings.items()}
+    report["render_ms"] = timeit.timeit(render_metrics, number=100) / 100 * 1000
+    return report
+
+
+def _build_app(work_dir: str, name: str, metrics_enabled: bool, rows: int) -> Any:
+    root = os.path.join(work_dir, name)
+    cfg = OmegaConf.create(
+        {
+            "raw_data_dir": os.path.join(root, "raw"),
+            "preprocessing_data_dir": os.path.join(root, "preprocessed"),
+            "processed_data_dir": os.path.join(root, "processed"),
+            "database": {"url": f"sqlite:///{os.path.join(root, 'bench.db')}"},
+            "cache": {"enabled": False},
+            "metrics": {"enabled": metrics_enabled},
+        }
+    )
+    app = create_app(cfg, project_root=root)
+    start = datetime(2024, 1, 1)
+    with database.get_engine().begin() as conn:
+        conn.execute(
+            insert(models.Video),
+            [
+                {
+                    "filename": f"clip_{i:06d}.mp4",
+                    "storage_path": f"/data/videos/clip_{i:06d}.mp4",
+                    "summary": "Detected objects: person",
+                    "detected_objects": ["person"],
+                    "key_frames": [],
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(rows)
+            ],
+        )
+    return app
+
+
+async def _measure(app: Any, path: str, requests: int, repeats: int) -> Dict[str, Any]:
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    async with client:
+        for _ in range(50):
+            await client.get(path)
+        rounds = []
+        latencies = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            for _ in range(requests):
+                sent = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - sent)
+                response.raise_for_status()
+            rounds.append(requests / (time.perf_counter() - started))
+
+    latencies.sort()
+    return {
+        "requests_per_s": statistics.median(rounds),
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def run(args: argparse.Namespace, work_dir: str) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"primitives": _primitives(), "endpoints": {}}
+    logger.info(f"Primitives: {report['primitives']}")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, enabled in (("baseline", False), ("instrumented", True)):
+        app = _build_app(work_dir, name, enabled, args.rows)
+        for path in ENDPOINTS:
+            results.setdefault(path, {})[name] = asyncio.run(
+                _measure(app, path, args.requests, args.repeats)
+            )
+        asyncio.run(database.dispose_engines())
+
+    for path, result in results.items():
+        baseline = result["baseline"]["requests_per_s"]
+        instrumented = result["instrumented"]["requests_per_s"]
+        result["throughput_overhead_pct"] = (baseline / instrumented - 1) * 100
+        report["endpoints"][path] = result
+        logger.info(
+            f"{path}: {baseline:.0f} -> {instrumented:.0f} req/s "
+            f"({result['throughput_overhead_pct']:+.1f}%)"
+        )
+    return report
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="JSON output path (defaults to a timestamped file under results/).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        level=logging.INFO,
+    )
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        report = run(args, work_dir)
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"metrics_{timestamp}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "timestamp": timestamp,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "params": {k: v for k, v in vars(args).items() if k != "output"},
+                **report,
+            },
+            file,
+            indent=2,
+        )
+    logger.info(f"Wrote results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""Retrieval benchmark over synthetic embedding corpora.
+
+Fills an ``embeddings`` table with clustered unit vectors at several scales and
+measures ``EmbeddingsGenerator.perform_retrieval`` without loading a real model:
+
+    python benchmarks/retrieval/bench_retrieval.py --scales 10000 100000 1000000
+
+Results are written as JSON to ``benchmarks/retrieval/results/`` so runs can be
+compared over time.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from omegaconf import OmegaConf
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from embeddings.embeddings_generator import EmbeddingsGenerator  # noqa: E402
+from utils.connection_manager import get_connection_manager  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+class StubEncoder:
+    """Stand-in for ``SentenceTransformer`` that maps queries onto clusters.
+
+    A query of the form ``"cluster:<i>:<n>"`` deterministically encodes to the
+    ``n``-th noisy copy of cluster centre ``i`` so that queries have meaningful
+    nearest neighbours and repeat runs see identical vectors.
+    """
+
+    def __init__(self, centers: np.ndarray, noise: float, seed: int) -> None:
+        self.centers = centers
+        self.noise = noise
+        self.seed = seed
+
+    def _encode_one(self, text: str) -> np.ndarray:
+        _, cluster, variant = text.split(":")
+        rng = np.random.default_rng((self.seed, int(cluster), int(variant)))
+        vec = self.centers[int(cluster) % len(self.centers)] + (
+            self.noise * rng.standard_normal(self.centers.shape[1])
+        )
+        return (vec / np.linalg.norm(vec)).astype("float32")
+
+    def encode(self, sentences: Any, **kwargs: Any) -> np.ndarray:
+        if isinstance(sentences, str):
+            return self._encode_one(sentences)
+        return np.stack([self._encode_one(text) for text in sentences])
+
+
+def _percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    values = np.asarray(samples, dtype="float64") * 1000.0
+    return {
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "mean_ms": float(values.mean()),
+    }
+
+
+def _populate(
+    db_path: str,
+    num_rows: int,
+    centers: np.ndarray,
+    rows_per_file: int,
+    noise: float,
+    seed: int,
+    chunk_size: int = 50_000,
+) -> float:
+    rng = np.random.default_rng(seed)
+    dim = centers.shape[1]
+    num_files = max(1, num_rows // rows_per_file)
+    file_clusters = rng.integers(0, len(centers), size=num_files)
+
+    start = time.perf_counter()
+    with sqlite3.connect(database=db_path) as conn:
+        for offset in range(0, num_rows, chunk_size):
+            count = min(chunk_size, num_rows - offset)
+            row_ids = np.arange(offset, offset + count)
+            file_ids = row_ids % num_files
+            vectors = centers[file_clusters[file_ids]] + noise * rng.standard_normal(
+                (count, dim)
+            )
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors.astype("float32")
+            conn.executemany(
+                """
+                INSERT INTO embeddings (modality, file_name, vector)
+                VALUES (?, ?, ?)
+                """,
+                (
+                    (
+                        "video" if file_id % 2 == 0 else "audio",
+                        f"file_{file_id:07d}.mp4",
+                        vec.tobytes(),
+                    )
+                    for file_id, vec in zip(file_ids, vectors)
+                ),
+            )
+            conn.commit()
+    return time.perf_counter() - start
+
+
+def _drop_caches(db_path: str) -> None:
+    """Close pooled connections and evict the database files from the page cache.
+
+    Closing the connections discards SQLite's page cache and mmap; the
+    ``POSIX_FADV_DONTNEED`` hint asks the kernel to drop its cached pages, so
+    the next query reads from disk. Without ``posix_fadvise`` (macOS) only the
+    connections are reopened and the OS cache stays warm.
+    """
+    get_connection_manager(db_path).close()
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for path in (db_path, f"{db_path}-wal"):
+        if not os.path.exists(path):
+            continue
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def _timed_queries(
+    generator: EmbeddingsGenerator,
+    db_path: str,
+    queries: Sequence[str],
+    top_k: int,
+    shortlist_size: int,
+    cold: bool = False,
+) -> Tuple[List[float], List[List[Tuple[str, float]]]]:
+    latencies = []
+    results = []
+    for query in queries:
+        if cold:
+            _drop_caches(db_path)
+        start = time.perf_counter()
+        results.append(
+            generator.perform_retrieval(
+                db_path=db_path,
+                query=query,
+                top_k=top_k,
+                shortlist_size=shortlist_size,
+            )
+        )
+        latencies.append(time.perf_counter() - start)
+    return latencies, results
+
+
+def _file_recall(
+    approximate: List[List[Tuple[str, float]]],
+    exact: List[List[Tuple[str, float]]],
+) -> float:
+    """Share of the exact top-k file names (with multiplicity) found by a mode.
+
+    Rows carry no vector id, so two vectors of the same file are
+    interchangeable here: this is recall over files, not over vectors.
+    """
+    hits = 0
+    total = 0
+    for approx_rows, exact_rows in zip(approximate, exact):
+        remaining = [file_name for file_name, _ in exact_rows]
+        total += len(remaining)
+        for file_name, _ in approx_rows:
+            if file_name in remaining:
+                remaining.remove(file_name)
+                hits += 1
+    return hits / total if total else 1.0
+
+
+def _measure_qps(
+    generator: EmbeddingsGenerator,
+    db_path: str,
+    queries: Sequence[str],
+    top_k: int,
+    shortlist_size: int,
+    concurrency: int,
+) -> float:
+    def _run(query: str) -> None:
+        generator.perform_retrieval(
+            db_path=db_path, query=query, top_k=top_k, shortlist_size=shortlist_size
+        )
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(_run, queries))
+    return len(queries) / (time.perf_counter() - start)
+
+
+def run_scale(args: argparse.Namespace, num_rows: int, work_dir: str) -> Dict[str, Any]:
+    rng = np.random.default_rng(args.seed)
+    centers = rng.standard_normal((args.clusters, args.dim))
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+
+    db_path = os.path.join(work_dir, f"embeddings_{num_rows}.db")
+    cfg = OmegaConf.load(
+        os.path.join(PROJECT_ROOT, "config", "generate_embeddings.yaml")
+    )
+    cfg.database.embeddings_db_path = db_path
+    cfg.retrieval.shortlist_size = args.shortlist_size
+    # Exhaustive scans at large scales are slow by design; don't log them.
+    cfg.database.slow_query_ms = None
+
+    encoder = StubEncoder(centers=centers, noise=args.query_noise, seed=args.seed)
+    generator = EmbeddingsGenerator(
+        cfg=cfg, logger=logger, sentence_transformer=encoder
+    )
+
+    logger.info(f"Populating {num_rows} rows.")
+    populate_s = _populate(
+        db_path=db_path,
+        num_rows=num_rows,
+        centers=centers,
+        rows_per_file=args.rows_per_file,
+        noise=args.corpus_noise,
+        seed=args.seed + 1,
+    )
+
+    start = time.perf_counter()
+    for modality in ("video", "audio"):
+        generator._update_centroids(embeddings_db_path=db_path, modality=modality)
+    index_build_s = time.perf_counter() - start
+
+    queries = [f"cluster:{i % args.clusters}:{i}" for i in range(args.queries)]
+    modes = {"two_stage": args.shortlist_size, "exhaustive": 0}
+    report: Dict[str, Any] = {
+        "rows": num_rows,
+        "files": max(1, num_rows // args.rows_per_file),
+        "populate_s": populate_s,
+        "index_build_s": index_build_s,
+        "db_size_bytes": os.path.getsize(db_path),
+        "modes": {},
+    }
+
+    exact_results: List[List[Tuple[str, float]]] = []
+    for mode, shortlist_size in reversed(modes.items()):
+        cold, _ = _timed_queries(
+            generator,
+            db_path,
+            queries[: args.cold_queries],
+            args.top_k,
+            shortlist_size,
+            cold=True,
+        )
+        warm, results = _timed_queries(
+            generator, db_path, queries, args.top_k, shortlist_size
+        )
+
+        tracemalloc.start()
+        generator.perform_retrieval(
+            db_path=db_path,
+            query=queries[0],
+            top_k=args.top_k,
+            shortlist_size=shortlist_size,
+        )
+        _, peak_alloc = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        mode_report: Dict[str, Any] = {
+            "shortlist_size": shortlist_size,
+            "cold": _percentiles(cold),
+            "warm": _percentiles(warm),
+            "qps": _measure_qps(
+                generator,
+                db_path,
+                queries,
+                args.top_k,
+                shortlist_size,
+                args.concurrency,
+            ),
+            "query_peak_alloc_bytes": peak_alloc,
+        }
+        if mode == "exhaustive":
+            exact_results = results
+            mode_report["file_recall_at_k"] = 1.0
+        else:
+            mode_report["file_recall_at_k"] = _file_recall(results, exact_results)
+        report["modes"][mode] = mode_report
+        logger.info(f"{num_rows} rows, {mode}: {json.dumps(mode_report)}")
+
+    os.remove(db_path)
+    return report
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=64)
+    parser.add_argument("--rows-per-file", type=int, default=100)
+    parser.add_argument("--corpus-noise", type=float, default=0.05)
+    parser.add_argument("--query-noise", type=float, default=0.05)
+    parser.add_argument("--shortlist-size", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument(
+        "--cold-queries",
+        type=int,
+        default=5,
+        help="Queries timed after reopening the database and dropping caches.",
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="JSON output path (defaults to a timestamped file under results/).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        level=logging.INFO,
+    )
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        scales = [run_scale(args, num_rows, work_dir) for num_rows in args.scales]
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"retrieval_{timestamp}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "timestamp": timestamp,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "params": {k: v for k, v in vars(args).items() if k != "output"},
+                "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                * 1024,
+                "scales": scales,
+            },
+            file,
+            indent=2,
+        )
+    logger.info(f"Results written to {output}.")
+
+
+if __name__ == "__main__":
+    main()
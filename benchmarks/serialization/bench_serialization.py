@@ -0,0 +1,190 @@
+"""Serialization benchmark for large ``/videos`` list responses.
+
+Fills a SQLite database with synthetic videos and times the per-object ORM +
+``VideoRead.model_validate`` + ``jsonable_encoder`` path against the bulk
+column-tuple path used by the list endpoints:
+
+    python benchmarks/serialization/bench_serialization.py --rows 100000
+
+Results are written as JSON to ``benchmarks/serialization/results/``.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Sequence
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend import models  # noqa: E402
+from backend.routes.videos import VIDEO_ADAPTER, VIDEO_COLUMNS  # noqa: E402
+from backend.schemas import VideoRead  # noqa: E402
+from backend.serialization import (  # noqa: E402
+    _ndjson_chunks,
+    dumps,
+    orjson,
+    row_dicts,
+    validated,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _populate(engine: Any, num_rows: int, batch_size: int = 10_000) -> None:
+    models.Base.metadata.create_all(bind=engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        for offset in range(0, num_rows, batch_size):
+            conn.execute(
+                insert(models.Video),
+                [
+                    {
+                        "filename": f"clip_{i:07d}.mp4",
+                        "storage_path": f"/data/videos/clip_{i:07d}.mp4",
+                        "summary": "Detected objects: landscape, well-lit-scene",
+                        "detected_objects": ["landscape", "well-lit-scene"],
+                        "key_frames": [
+                            f"keyframes/clip_{i:07d}_frame_{f:04d}.jpg"
+                            for f in range(5)
+                        ],
+                        "created_at": start + timedelta(seconds=i),
+                    }
+                    for i in range(offset, min(offset + batch_size, num_rows))
+                ],
+            )
+
+
+def orm_path(session: Session) -> bytes:
+    videos = session.scalars(select(models.Video).order_by(models.Video.id)).all()
+    content = jsonable_encoder([VideoRead.model_validate(video) for video in videos])
+    session.expunge_all()
+    return JSONResponse(content=content).body
+
+
+def bulk_trusted_path(session: Session) -> bytes:
+    rows = session.execute(select(*VIDEO_COLUMNS).order_by(models.Video.id)).all()
+    return dumps(row_dicts(rows, VIDEO_COLUMNS))
+
+
+def bulk_validated_path(session: Session) -> bytes:
+    rows = session.execute(select(*VIDEO_COLUMNS).order_by(models.Video.id)).all()
+    return dumps(validated(row_dicts(rows, VIDEO_COLUMNS), VIDEO_ADAPTER))
+
+
+def bulk_ndjson_path(session: Session) -> bytes:
+    rows = session.execute(select(*VIDEO_COLUMNS).order_by(models.Video.id)).all()
+    return b"".join(_ndjson_chunks(row_dicts(rows, VIDEO_COLUMNS), chunk_rows=500))
+
+
+PATHS: Dict[str, Callable[[Session], bytes]] = {
+    "orm_model_validate": orm_path,
+    "bulk_trusted": bulk_trusted_path,
+    "bulk_type_adapter": bulk_validated_path,
+    "bulk_ndjson": bulk_ndjson_path,
+}
+
+
+def _measure(
+    engine: Any, func: Callable[[Session], bytes], repeats: int
+) -> Dict[str, Any]:
+    timings = []
+    body = b""
+    for _ in range(repeats):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            body = func(session)
+            timings.append(time.perf_counter() - started)
+
+    with Session(engine) as session:
+        tracemalloc.start()
+        func(session)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "body_bytes": len(body),
+        "tracemalloc_peak_bytes": peak,
+    }
+
+
+def run(args: argparse.Namespace, work_dir: str) -> Dict[str, Any]:
+    engine = create_engine(f"sqlite:///{os.path.join(work_dir, 'bench.db')}")
+    started = time.perf_counter()
+    _populate(engine, args.rows)
+    logger.info(f"Inserted {args.rows} videos in {time.perf_counter() - started:.1f}s.")
+
+    report: Dict[str, Any] = {}
+    for name, func in PATHS.items():
+        report[name] = _measure(engine, func, args.repeats)
+        report[name]["rows_per_s"] = args.rows / report[name]["median_s"]
+        logger.info(f"{name}: {report[name]['median_s'] * 1000:.0f} ms (median)")
+
+    baseline = report["orm_model_validate"]["median_s"]
+    for name in PATHS:
+        report[name]["speedup"] = baseline / report[name]["median_s"]
+    engine.dispose()
+    return report
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="JSON output path (defaults to a timestamped file under results/).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        level=logging.INFO,
+    )
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        paths = run(args, work_dir)
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"serialization_{timestamp}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "timestamp": timestamp,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "json_encoder": "orjson" if orjson is not None else "json",
+                "params": {k: v for k, v in vars(args).items() if k != "output"},
+                "paths": paths,
+            },
+            file,
+            indent=2,
+        )
+    logger.info(f"Wrote results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Search throughput against the number of server worker processes.
+
+Seeds one database, then for each worker count starts the backend through
+``backend.serving.serve`` (pre-fork, response cache off so every request runs
+the FTS query) and drives ``GET /search`` with the load generator from
+``benchmarks/load``:
+
+    python benchmarks/serving/bench_workers.py --workers 1 2 4 --requests 4000
+
+Scaling is only meaningful with at least one more core than the largest
+worker count, since the client runs in this process. Speedup and efficiency
+(speedup / workers) relative to one worker are written as JSON to
+``benchmarks/serving/results/``.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Sequence
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "benchmarks", "load"))
+
+import httpx  # noqa: E402
+from bench_load import (  # noqa: E402
+    build_scenarios,
+    free_port,
+    run_scenario,
+    seed_database,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _start_server(work_dir: str, database_url: str, workers: int) -> Any:
+    port = free_port()
+    cfg = {
+        "raw_data_dir": os.path.join(work_dir, "raw"),
+        "preprocessing_data_dir": os.path.join(work_dir, "preprocessed"),
+        "processed_data_dir": os.path.join(work_dir, "processed"),
+        "database": {"url": database_url},
+        "cache": {"enabled": False},
+        "metrics": {"enabled": False},
+        "backend": {"host": "127.0.0.1", "port": port, "workers": workers},
+    }
+    script = (
+        "import logging; logging.basicConfig(level=logging.WARNING); "
+        "from omegaconf import OmegaConf; from backend.serving import serve; "
+        f"serve(OmegaConf.create({cfg!r}), project_root={work_dir!r})"
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-c", script],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}.")
+        try:
+            if httpx.get(f"{url}/health/ready", timeout=1).status_code == 200:
+                return process, url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise TimeoutError("Server did not become ready.")
+
+
+def _stop_server(process: Any) -> None:
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=20)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run(args: argparse.Namespace, work_dir: str) -> Dict[str, Any]:
+    seed_path = os.path.join(work_dir, "seed.db")
+    logger.info(f"Seeding {args.rows} videos and transcriptions.")
+    seed_database(f"sqlite:///{seed_path}", args.rows)
+    search = build_scenarios(args, {})["search_storm"]
+
+    results: Dict[str, Any] = {}
+    for workers in args.workers:
+        run_dir = os.path.join(work_dir, f"workers_{workers}")
+        os.makedirs(run_dir)
+        database_path = os.path.join(run_dir, "bench.db")
+        shutil.copy(seed_path, database_path)
+        process, url = _start_server(run_dir, f"sqlite:///{database_path}", workers)
+        try:
+            # Warm every worker's connection pool and SQLite page cache.
+            asyncio.run(run_scenario(url, search, args.concurrency * 4, args))
+            rounds = [
+                asyncio.run(run_scenario(url, search, args.requests, args))
+                for _ in range(args.repeats)
+            ]
+        finally:
+            _stop_server(process)
+        best = max(rounds, key=lambda result: result["throughput_rps"])
+        results[str(workers)] = best
+        logger.info(
+            f"{workers} workers: {best['throughput_rps']:.0f} req/s, "
+            f"p99 {best.get('latency_ms', {}).get('p99', 0):.1f} ms, "
+            f"errors {best['error_rate']:.1%}"
+        )
+
+    baseline = results[str(args.workers[0])]["throughput_rps"] / args.workers[0]
+    for workers in args.workers:
+        result = results[str(workers)]
+        result["speedup"] = result["throughput_rps"] / baseline
+        result["efficiency"] = result["speedup"] / workers
+    return {"cpu_count": os.cpu_count(), "workers": results}
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="JSON output path (defaults to a timestamped file under results/).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        level=logging.INFO,
+    )
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    args = parse_args(argv)
+    if (os.cpu_count() or 1) <= max(args.workers):
+        logger.warning(
+            f"Only {os.cpu_count()} CPUs for up to {max(args.workers)} workers "
+            "plus the client; scaling will flatten."
+        )
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        report = run(args, work_dir)
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"workers_{timestamp}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "timestamp": timestamp,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "params": {k: v for k, v in vars(args).items() if k != "output"},
+                **report,
+            },
+            file,
+            indent=2,
+        )
+    logger.info(f"Wrote results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""Import-time budget for the backend and the offline ``src`` modules.
+
+Imports each module in a fresh interpreter under ``python -X importtime``,
+keeps the median cumulative time over ``--repeats`` runs and compares it with
+``budget.json`` next to this file:
+
+    python benchmarks/startup/bench_import_time.py --repeats 5
+
+The run exits non-zero when a module exceeds its budget, or imports one of
+the heavy libraries it is not allowed to load, so it can gate CI. Modules whose
+dependencies are not installed are reported as ``unavailable`` and skipped.
+Results are written as JSON to ``benchmarks/startup/results/``.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Sequence
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+BUDGET_PATH = os.path.join(os.path.dirname(__file__), "budget.json")
+
+logger = logging.getLogger(__name__)
+
+# Printed by the child after the import so the parent can check what was loaded.
+PROBE = (
+    "import json, sys, time; started = time.perf_counter(); import {module}; "
+    "print(json.dumps({{'wall_ms': (time.perf_counter() - started) * 1000, "
+    "'modules': sorted(sys.modules)}}))"
+)
+CREATE_APP_PROBE = (
+    "import json, tempfile, time; from omegaconf import OmegaConf; "
+    "from backend.app import create_app; root = tempfile.mkdtemp(); "
+    "cfg = OmegaConf.create({'raw_data_dir': root + '/raw', "
+    "'preprocessing_data_dir': root + '/pre', 'processed_data_dir': root + '/out', "
+    "'database': {'url': 'sqlite:///' + root + '/app.db'}}); "
+    "started = time.perf_counter(); create_app(cfg, project_root=root); "
+    "print(json.dumps({'wall_ms': (time.perf_counter() - started) * 1000}))"
+)
+
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    paths = [PROJECT_ROOT, os.path.join(PROJECT_ROOT, "src")]
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    return env
+
+
+def _parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse ``import time: self [us] | cumulative | name`` lines."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3:
+            continue
+        rows.append(
+            {
+                "self_us": int(fields[0]),
+                "cumulative_us": int(fields[1]),
+                "name": fields[2].strip(),
+            }
+        )
+    return rows
+
+
+def _import_once(module: str) -> Dict[str, Any]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT,
+        env=_environment(),
+    )
+    if completed.returncode != 0:
+        tail = completed.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        return {"error": tail[0]}
+    rows = _parse_importtime(completed.stderr)
+    probe = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {
+        "cumulative_ms": sum(row["self_us"] for row in rows) / 1000,
+        "wall_ms": probe["wall_ms"],
+        "modules": probe["modules"],
+        "rows": rows,
+    }
+
+
+def measure_module(module: str, repeats: int, top: int) -> Dict[str, Any]:
+    runs = [_import_once(module) for _ in range(repeats)]
+    if "error" in runs[0]:
+        return {"status": "unavailable", "error": runs[0]["error"]}
+
+    loaded = set(runs[0]["modules"])
+    self_times: Dict[str, List[int]] = {}
+    for result in runs:
+        for row in result["rows"]:
+            self_times.setdefault(row["name"], []).append(row["self_us"])
+    slowest = sorted(
+        ((statistics.median(times) / 1000, name) for name, times in self_times.items()),
+        reverse=True,
+    )[:top]
+    return {
+        "status": "ok",
+        "import_ms": statistics.median(r["cumulative_ms"] for r in runs),
+        "wall_ms": statistics.median(r["wall_ms"] for r in runs),
+        "module_count": len(loaded),
+        "top_self_ms": [{"module": name, "ms": ms} for ms, name in slowest],
+        "loaded": sorted(loaded),
+    }
+
+
+def measure_create_app(repeats: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-c", CREATE_APP_PROBE],
+            capture_output=True,
+            text=True,
+            cwd=PROJECT_ROOT,
+            env=_environment(),
+        )
+        if completed.returncode != 0:
+            return {"status": "unavailable", "error": completed.stderr.strip()[-200:]}
+        timings.append(json.loads(completed.stdout.strip().splitlines()[-1])["wall_ms"])
+    return {"status": "ok", "wall_ms": statistics.median(timings)}
+
+
+def check_budget(
+    results: Dict[str, Dict[str, Any]], budget: Dict[str, Dict[str, Any]], slack: float
+) -> List[str]:
+    """Return one message per module that is over budget or loads a heavy lib."""
+    failures = []
+    for module, limits in budget.items():
+        result = results.get(module, {})
+        if result.get("status") != "ok":
+            continue
+        allowed_ms = limits["max_ms"] * (1 + slack)
+        if result["import_ms"] > allowed_ms:
+            failures.append(
+                f"{module}: {result['import_ms']:.0f} ms > {allowed_ms:.0f} ms budget"
+            )
+        loaded = set(result["loaded"])
+        for heavy in limits.get("forbid", []):
+            if heavy in loaded:
+                failures.append(f"{module}: imports {heavy} at module import time")
+    return failures
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    with open(args.budget, encoding="utf-8") as file:
+        budget = json.load(file)
+
+    modules = args.modules or list(budget)
+    results = {}
+    for module in modules:
+        results[module] = measure_module(module, args.repeats, args.top)
+        result = results[module]
+        if result["status"] == "ok":
+            logger.info(
+                f"{module}: {result['import_ms']:.0f} ms, "
+                f"{result['module_count']} modules loaded"
+            )
+        else:
+            logger.info(f"{module}: unavailable ({result['error']})")
+
+    create_app_result = measure_create_app(args.repeats)
+    if create_app_result["status"] == "ok":
+        logger.info(f"create_app: {create_app_result['wall_ms']:.0f} ms")
+
+    failures = check_budget(
+        results, {m: budget[m] for m in modules if m in budget}, args.slack
+    )
+    if not args.keep_module_lists:
+        for result in results.values():
+            result.pop("loaded", None)
+    return {
+        "modules": results,
+        "create_app": create_app_result,
+        "budget": budget,
+        "failures": failures,
+    }
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--modules",
+        nargs="*",
+        default=None,
+        help="Modules to measure (defaults to every module in the budget).",
+    )
+    parser.add_argument("--budget", default=BUDGET_PATH)
+    parser.add_argument(
+        "--slack",
+        type=float,
+        default=0.0,
+        help="Fraction over max_ms tolerated before failing, e.g. 0.2 on slow CI.",
+    )
+    parser.add_argument("--keep-module-lists", action="store_true")
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="JSON output path (defaults to a timestamped file under results/).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        level=logging.INFO,
+    )
+    args = parse_args(argv)
+    report = run(args)
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"import_time_{timestamp}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "timestamp": timestamp,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "params": {k: v for k, v in vars(args).items() if k != "output"},
+                **report,
+            },
+            file,
+            indent=2,
+        )
+    logger.info(f"Wrote results to {output}")
+
+    for failure in report["failures"]:
+        logger.error(failure)
+    if report["failures"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
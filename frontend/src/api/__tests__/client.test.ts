@@ -0,0 +1,51 @@
+import { describe, it, expect, vi, beforeEach } from "vitest";
+
+const { get } = vi.hoisted(() => ({ get: vi.fn() }));
+
+vi.mock("axios", () => ({
+  default: { create: vi.fn(() => ({ get })) },
+}));
+
+import { fetchTranscriptions, fetchVideos } from "../client";
+
+function page(ids: number[], nextCursor?: string) {
+  return {
+    data: ids.map((id) => ({ id, filename: `video${id}.mp4` })),
+    headers: nextCursor ? { "x-next-cursor": nextCursor } : {},
+  };
+}
+
+describe("api client", () => {
+  beforeEach(() => {
+    get.mockReset();
+  });
+
+  it("should follow X-Next-Cursor until every video is fetched", async () => {
+    const ids = Array.from({ length: 2500 }, (_, index) => index + 1);
+    get
+      .mockResolvedValueOnce(page(ids.slice(0, 1000), "c1"))
+      .mockResolvedValueOnce(page(ids.slice(1000, 2000), "c2"))
+      .mockResolvedValueOnce(page(ids.slice(2000)));
+
+    const videos = await fetchVideos();
+
+    expect(videos.map((video) => video.id)).toEqual(ids);
+    expect(get).toHaveBeenCalledTimes(3);
+    expect(get.mock.calls.map(([, config]) => config.params.cursor)).toEqual([
+      undefined,
+      "c1",
+      "c2",
+    ]);
+    expect(get.mock.calls[0][0]).toBe("/videos");
+  });
+
+  it("should stop after a single page without a cursor", async () => {
+    get.mockResolvedValueOnce(page([1, 2]));
+
+    const transcriptions = await fetchTranscriptions();
+
+    expect(transcriptions).toHaveLength(2);
+    expect(get).toHaveBeenCalledTimes(1);
+    expect(get.mock.calls[0][0]).toBe("/transcriptions");
+  });
+});
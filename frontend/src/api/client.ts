@@ -17,14 +17,31 @@ const api = axios.create({
   timeout: 20000,
 });
 
+// The backend's largest page (MAX_PAGE_SIZE); fewer round trips per refresh.
+const LIST_PAGE_SIZE = 1000;
+const NEXT_CURSOR_HEADER = "x-next-cursor";
+
+// List endpoints return one keyset page; follow X-Next-Cursor to the end.
+async function fetchAllPages<T>(path: string): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const { data, headers } = await api.get<T[]>(path, {
+      params: { limit: LIST_PAGE_SIZE, cursor },
+    });
+    items.push(...data);
+    const next = headers[NEXT_CURSOR_HEADER];
+    cursor = typeof next === "string" && next ? next : undefined;
+  } while (cursor);
+  return items;
+}
+
 export async function fetchVideos(): Promise<Video[]> {
-  const { data } = await api.get<Video[]>("/videos");
-  return data;
+  return fetchAllPages<Video>("/videos");
 }
 
 export async function fetchTranscriptions(): Promise<Transcription[]> {
-  const { data } = await api.get<Transcription[]>("/transcriptions");
-  return data;
+  return fetchAllPages<Transcription>("/transcriptions");
 }
 
 export async function searchContent(term: string): Promise<SearchResponse> {
@@ -1,10 +1,9 @@
 import os
 
 import hydra
-import uvicorn
 from omegaconf import DictConfig
 
-from backend import create_app
+from backend.serving import serve
 from utils.general_utils import setup_logging
 
 
@@ -19,14 +18,7 @@ def main(cfg: DictConfig):
             hydra.utils.get_original_cwd(), "config", "logging.yaml"
         )
     )
-    project_root = hydra.utils.get_original_cwd()
-    app = create_app(cfg=cfg, project_root=project_root)
-    uvicorn.run(
-        app,
-        host=cfg.backend.host,
-        port=cfg.backend.port,
-        reload=cfg.backend.reload,
-    )
+    serve(cfg=cfg, project_root=hydra.utils.get_original_cwd())
 
 
 if __name__ == "__main__":
@@ -1,30 +1,55 @@
 import heapq
 import logging
+import queue
 import sqlite3
-from typing import List, Optional, Tuple
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import numpy as np
 from omegaconf import DictConfig
-from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
 
+from utils.connection_manager import get_connection_manager
 from utils.general_utils import cosine_similarity, init_db
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 
 class EmbeddingsGenerator:
     def __init__(
         self,
         cfg: DictConfig,
         logger: Optional[logging.Logger] = None,
+        sentence_transformer: Optional["SentenceTransformer"] = None,
     ) -> None:
         self.cfg = cfg
         self.logger = logger or logging.getLogger(__name__)
-        self.sentence_transformer = SentenceTransformer(
-            model_name_or_path=self.cfg.sentence_transformer
-        )
+        if sentence_transformer is None:
+            # Imported here: sentence_transformers pulls in torch, which callers
+            # that pass their own encoder should not pay for.
+            from sentence_transformers import SentenceTransformer
+
+            sentence_transformer = SentenceTransformer(
+                model_name_or_path=self.cfg.sentence_transformer
+            )
+        self.sentence_transformer = sentence_transformer
+        self.batch_size = self.cfg.get("backfill", {}).get("batch_size", 64)
+        self.shortlist_size = self.cfg.get("retrieval", {}).get("shortlist_size")
+        self._stream_queue: Optional[
+            "queue.Queue[Optional[Tuple[str, List[Tuple[str, str]]]]]"
+        ] = None
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_errors: List[BaseException] = []
         init_db(
             db_path=self.cfg.database.embeddings_db_path,
-            sql_statements=[self.cfg.database.create_embeddings_table],
+            sql_statements=[
+                self.cfg.database.create_embeddings_table,
+                self.cfg.database.create_embeddings_index,
+                self.cfg.database.create_centroids_table,
+            ],
+            migrations=self.cfg.database.get("migrations", []),
+            slow_query_ms=self.cfg.database.get("slow_query_ms"),
         )
 
     def _vector_to_blob(self, vector: np.ndarray) -> bytes:
@@ -38,74 +63,397 @@ class EmbeddingsGenerator:
         source_db_path: str,
         embeddings_db_path: str,
         modality: str,
+        chunk_size: int,
+        pool: Optional[Dict[str, Any]] = None,
     ) -> None:
         self.logger.info(f"Generating embeddings for {modality}.")
 
-        with sqlite3.connect(database=source_db_path) as read_conn:
-            read_cursor = read_conn.cursor()
-            if modality == "video":
-                read_cursor.execute("SELECT file_name, object_name FROM video_events")
-            else:
-                read_cursor.execute("SELECT file_name, transcript FROM audio_events")
-
-            rows = read_cursor.fetchall()
+        table, column = (
+            ("video_events", "object_name")
+            if modality == "video"
+            else ("audio_events", "transcript")
+        )
 
-        with sqlite3.connect(database=embeddings_db_path) as write_conn:
-            write_cursor = write_conn.cursor()
+        # Encoding runs on this thread (or the process pool) while a single
+        # writer thread inserts finished chunks in order.
+        write_queue: "queue.Queue[Optional[Tuple[List[Tuple], np.ndarray]]]" = (
+            queue.Queue(maxsize=2)
+        )
+        write_errors: List[BaseException] = []
+        writer = threading.Thread(
+            target=self._write_embeddings,
+            kwargs={
+                "embeddings_db_path": embeddings_db_path,
+                "modality": modality,
+                "write_queue": write_queue,
+                "write_errors": write_errors,
+            },
+            daemon=True,
+        )
 
+        with get_connection_manager(source_db_path).connection() as read_conn:
+            read_cursor = read_conn.cursor()
+            total = read_cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
             pbar = tqdm(
-                total=len(rows),
+                total=total,
                 desc=f"Embedding {modality}",
                 dynamic_ncols=True,
                 leave=True,
             )
+            writer.start()
 
-            for file_name, object_name in rows:
-                vec = self.sentence_transformer.encode(
-                    object_name,
-                    show_progress_bar=False,
-                )
-                blob = self._vector_to_blob(vector=vec)
-                write_cursor.execute(
-                    """
-                    INSERT INTO embeddings (modality, file_name, vector)
-                    VALUES (?, ?, ?)
-                    """,
-                    (modality, file_name, blob),
-                )
-                pbar.update(1)
+            try:
+                # Rows are read chunk_size at a time so memory stays flat
+                # however large the source tables are.
+                read_cursor.execute(f"SELECT file_name, {column} FROM {table}")
+                while not write_errors:
+                    chunk = read_cursor.fetchmany(chunk_size)
+                    if not chunk:
+                        break
+                    vectors = self.sentence_transformer.encode(
+                        [text for _, text in chunk],
+                        batch_size=self.batch_size,
+                        pool=pool,
+                        show_progress_bar=False,
+                    )
+                    write_queue.put((chunk, np.asarray(vectors, dtype="float32")))
+                    pbar.update(len(chunk))
+            finally:
+                write_queue.put(None)
+                writer.join()
+                pbar.close()
 
-            pbar.close()
-            write_conn.commit()
+        if write_errors:
+            raise write_errors[0]
 
+        self._update_centroids(embeddings_db_path=embeddings_db_path, modality=modality)
         self.logger.info(f"Embeddings completed for {modality}.")
 
-    def generate_embeddings(self) -> None:
-        self._generate_embeddings_mode(
-            source_db_path=self.cfg.database.source_db_path,
-            embeddings_db_path=self.cfg.database.embeddings_db_path,
-            modality="video",
+    def _write_embeddings(
+        self,
+        embeddings_db_path: str,
+        modality: str,
+        write_queue: "queue.Queue[Optional[Tuple[List[Tuple], np.ndarray]]]",
+        write_errors: List[BaseException],
+    ) -> None:
+        with get_connection_manager(embeddings_db_path).connection() as write_conn:
+            write_cursor = write_conn.cursor()
+            while True:
+                item = write_queue.get()
+                if item is None:
+                    break
+                if write_errors:
+                    # Keep draining so the producer never blocks on a full queue.
+                    continue
+
+                chunk, vectors = item
+                try:
+                    self._insert_embeddings(
+                        cursor=write_cursor,
+                        modality=modality,
+                        rows=chunk,
+                        vectors=vectors,
+                    )
+                    write_conn.commit()
+                except Exception as error:
+                    self.logger.exception(f"Failed to write {modality} embeddings.")
+                    write_errors.append(error)
+
+    def _insert_embeddings(
+        self,
+        cursor: sqlite3.Cursor,
+        modality: str,
+        rows: List[Tuple[str, str]],
+        vectors: np.ndarray,
+    ) -> None:
+        cursor.executemany(
+            """
+            INSERT INTO embeddings (modality, file_name, vector)
+            VALUES (?, ?, ?)
+            """,
+            [
+                (modality, file_name, self._vector_to_blob(vector=vec))
+                for (file_name, _), vec in zip(rows, vectors)
+            ],
         )
-        self._generate_embeddings_mode(
-            source_db_path=self.cfg.database.source_db_path,
-            embeddings_db_path=self.cfg.database.embeddings_db_path,
-            modality="audio",
+
+    def _update_centroids(
+        self,
+        embeddings_db_path: str,
+        modality: str,
+        file_names: Optional[List[str]] = None,
+    ) -> None:
+        """Recompute the normalized mean vector per file for a modality.
+
+        All files are refreshed unless ``file_names`` restricts the update.
+        """
+        sums: Dict[str, np.ndarray] = {}
+        counts: Dict[str, int] = {}
+
+        with get_connection_manager(embeddings_db_path).connection() as conn:
+            cursor = conn.cursor()
+            if file_names:
+                placeholders = ", ".join("?" for _ in file_names)
+                cursor.execute(
+                    "SELECT file_name, vector FROM embeddings "
+                    f"WHERE modality = ? AND file_name IN ({placeholders})",
+                    (modality, *file_names),
+                )
+            else:
+                cursor.execute(
+                    "SELECT file_name, vector FROM embeddings WHERE modality = ?",
+                    (modality,),
+                )
+            for file_name, blob in cursor:
+                vec = self._normalize(self._blob_to_vector(blob=blob))
+                if file_name in sums:
+                    sums[file_name] += vec
+                    counts[file_name] += 1
+                else:
+                    sums[file_name] = vec.copy()
+                    counts[file_name] = 1
+
+            cursor.executemany(
+                """
+                INSERT INTO file_centroids (file_name, modality, vector, num_vectors)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (file_name, modality) DO UPDATE SET
+                    vector = excluded.vector,
+                    num_vectors = excluded.num_vectors,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                [
+                    (
+                        file_name,
+                        modality,
+                        self._vector_to_blob(vector=self._normalize(total)),
+                        counts[file_name],
+                    )
+                    for file_name, total in sums.items()
+                ],
+            )
+            conn.commit()
+
+        self.logger.info(f"Updated {len(sums)} file centroids for {modality}.")
+
+    def start_streaming(self, queue_size: int = 64) -> None:
+        """Start a consumer thread that embeds rows pushed through ``submit``.
+
+        ``submit`` blocks once ``queue_size`` batches are pending, so a fast
+        producer is throttled to the encoding rate.
+        """
+        if self._stream_thread is not None:
+            raise RuntimeError("Embeddings streaming is already running.")
+
+        self._stream_queue = queue.Queue(maxsize=queue_size)
+        self._stream_errors = []
+        self._stream_thread = threading.Thread(
+            target=self._consume_stream,
+            name="embeddings-stream",
+            daemon=True,
         )
+        self._stream_thread.start()
+        self.logger.info("Embeddings streaming started.")
+
+    def submit(self, modality: str, rows: List[Tuple[str, str]]) -> None:
+        """Queue ``(file_name, text)`` rows of ``modality`` for embedding."""
+        if self._stream_queue is None:
+            raise RuntimeError("Embeddings streaming is not running.")
+        if self._stream_errors:
+            raise self._stream_errors[0]
+        if rows:
+            self._stream_queue.put((modality, rows))
+
+    def stop_streaming(self, raise_errors: bool = True) -> None:
+        """Drain pending batches and stop the consumer thread.
+
+        The first batch failure is re-raised unless ``raise_errors`` is false,
+        which callers use while another exception is already propagating.
+        """
+        if self._stream_queue is None or self._stream_thread is None:
+            return
+
+        self._stream_queue.put(None)
+        self._stream_thread.join()
+        self._stream_queue = None
+        self._stream_thread = None
+        self.logger.info("Embeddings streaming stopped.")
+
+        if self._stream_errors:
+            if raise_errors:
+                raise self._stream_errors[0]
+            self.logger.error(
+                f"Embeddings streaming stopped after {len(self._stream_errors)} "
+                "failed batches."
+            )
+
+    def _consume_stream(self) -> None:
+        embeddings_db_path = self.cfg.database.embeddings_db_path
+        assert self._stream_queue is not None
+
+        with get_connection_manager(embeddings_db_path).connection() as write_conn:
+            write_cursor = write_conn.cursor()
+            while True:
+                item = self._stream_queue.get()
+                if item is None:
+                    break
+                if self._stream_errors:
+                    continue
+
+                modality, rows = item
+                try:
+                    # Detections repeat the same few labels, so encode each once.
+                    texts = list(dict.fromkeys(text for _, text in rows))
+                    encoded = np.asarray(
+                        self.sentence_transformer.encode(
+                            texts,
+                            batch_size=self.batch_size,
+                            show_progress_bar=False,
+                        ),
+                        dtype="float32",
+                    )
+                    index = {text: i for i, text in enumerate(texts)}
+                    vectors = encoded[[index[text] for _, text in rows]]
+
+                    self._insert_embeddings(
+                        cursor=write_cursor,
+                        modality=modality,
+                        rows=rows,
+                        vectors=vectors,
+                    )
+                    write_conn.commit()
+                    self._update_centroids(
+                        embeddings_db_path=embeddings_db_path,
+                        modality=modality,
+                        file_names=sorted({file_name for file_name, _ in rows}),
+                    )
+                except Exception as error:
+                    self.logger.exception(f"Failed to stream {modality} embeddings.")
+                    self._stream_errors.append(error)
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def generate_embeddings(self, num_workers: int = 1, chunk_size: int = 1024) -> None:
+        """Embed all extracted labels and transcripts.
+
+        With ``num_workers`` > 1 a pool of encoder processes is started for the
+        backfill; rows are encoded ``chunk_size`` at a time and written in order.
+        """
+        pool = None
+        if num_workers > 1:
+            self.logger.info(f"Starting {num_workers} encoder processes.")
+            pool = self.sentence_transformer.start_multi_process_pool(
+                target_devices=["cpu"] * num_workers
+            )
+
+        try:
+            for modality in ("video", "audio"):
+                self._generate_embeddings_mode(
+                    source_db_path=self.cfg.database.source_db_path,
+                    embeddings_db_path=self.cfg.database.embeddings_db_path,
+                    modality=modality,
+                    chunk_size=chunk_size,
+                    pool=pool,
+                )
+        finally:
+            if pool is not None:
+                self.sentence_transformer.stop_multi_process_pool(pool)
 
     def perform_retrieval(
-        self, db_path: str, query: str, top_k: int
+        self,
+        db_path: str,
+        query: str,
+        top_k: int,
+        shortlist_size: Optional[int] = None,
     ) -> List[Tuple[str, float]]:
+        """Return the ``top_k`` best matching vectors for ``query``.
+
+        Files are first shortlisted by centroid similarity and only their
+        fine-grained vectors are rescored. Falls back to exhaustive search when
+        ``shortlist_size`` is unset or no centroids have been built.
+        """
         query_vec = np.asarray(
             self.sentence_transformer.encode(query),
             dtype="float32",
         )
-        with sqlite3.connect(database=db_path) as conn:
+        shortlist_size = (
+            self.shortlist_size if shortlist_size is None else shortlist_size
+        )
+
+        with get_connection_manager(db_path).connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT file_name, vector FROM embeddings")
-            results = []
-            for file_name, blob in cursor.fetchall():
-                vec = self._blob_to_vector(blob=blob)
-                score = cosine_similarity(a=query_vec, b=vec)
-                results.append((file_name, score))
+            shortlist = (
+                self._shortlist_files(
+                    cursor=cursor, query_vec=query_vec, shortlist_size=shortlist_size
+                )
+                if shortlist_size
+                else []
+            )
+
+            results = self._score_vectors(
+                cursor=cursor, query_vec=query_vec, file_names=shortlist
+            )
+            if shortlist and len(results) < top_k:
+                self.logger.info(
+                    "Shortlist returned fewer than top_k vectors, "
+                    "using exhaustive search."
+                )
+                results = self._score_vectors(cursor=cursor, query_vec=query_vec)
 
         return heapq.nlargest(top_k, results, key=lambda x: x[1])
+
+    def _score_vectors(
+        self,
+        cursor: sqlite3.Cursor,
+        query_vec: np.ndarray,
+        file_names: Optional[List[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        if file_names:
+            placeholders = ", ".join("?" for _ in file_names)
+            cursor.execute(
+                "SELECT file_name, vector FROM embeddings "
+                f"WHERE file_name IN ({placeholders})",
+                file_names,
+            )
+        else:
+            cursor.execute("SELECT file_name, vector FROM embeddings")
+
+        results = []
+        for file_name, blob in cursor.fetchall():
+            vec = self._blob_to_vector(blob=blob)
+            score = cosine_similarity(a=query_vec, b=vec)
+            results.append((file_name, score))
+        return results
+
+    def _shortlist_files(
+        self,
+        cursor: sqlite3.Cursor,
+        query_vec: np.ndarray,
+        shortlist_size: int,
+    ) -> List[str]:
+        cursor.execute("SELECT file_name, vector FROM file_centroids")
+        rows = cursor.fetchall()
+        if not rows:
+            self.logger.info("No file centroids found, using exhaustive search.")
+            return []
+
+        # A file can have one centroid per modality; keep its best score.
+        best: Dict[str, float] = {}
+        centroids = np.stack([self._blob_to_vector(blob=blob) for _, blob in rows])
+        scores = centroids @ self._normalize(query_vec)
+        for (file_name, _), score in zip(rows, scores):
+            if score > best.get(file_name, -np.inf):
+                best[file_name] = float(score)
+
+        if len(best) <= shortlist_size:
+            return []
+
+        return [
+            file_name
+            for file_name, _ in heapq.nlargest(
+                shortlist_size, best.items(), key=lambda x: x[1]
+            )
+        ]
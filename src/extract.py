@@ -2,9 +2,8 @@ import logging
 import os
 
 import hydra
-from omegaconf import DictConfig
+from omegaconf import DictConfig, OmegaConf
 
-from extraction.extraction_pipeline import ExtractionPipeline
 from utils.general_utils import setup_logging
 
 
@@ -22,7 +21,26 @@ def main(cfg: DictConfig):
     )
     logger.info("Setting up logging configuration.")
 
-    extraction_pipeline = ExtractionPipeline(cfg=cfg, logger=logger)
+    # The pipeline imports torch, transformers and ultralytics; keep them out of
+    # module import so ``--help`` and config errors return immediately.
+    from extraction.extraction_pipeline import ExtractionPipeline
+
+    embeddings_generator = None
+    if cfg.streaming_embeddings.enabled:
+        embeddings_cfg = OmegaConf.load(
+            os.path.join(
+                hydra.utils.get_original_cwd(), "config", "generate_embeddings.yaml"
+            )
+        )
+        from embeddings.embeddings_generator import EmbeddingsGenerator
+
+        embeddings_generator = EmbeddingsGenerator(cfg=embeddings_cfg, logger=logger)
+
+    extraction_pipeline = ExtractionPipeline(
+        cfg=cfg,
+        logger=logger,
+        embeddings_generator=embeddings_generator,
+    )
     extraction_pipeline.run()
 
 
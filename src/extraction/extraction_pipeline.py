@@ -1,6 +1,5 @@
 import logging
 import os
-import sqlite3
 import time
 from typing import Any, List, Optional, Tuple
 
@@ -13,6 +12,8 @@ from tqdm import tqdm
 from transformers import WhisperForConditionalGeneration, WhisperProcessor
 from ultralytics.models import YOLO
 
+from embeddings.embeddings_generator import EmbeddingsGenerator
+from utils.connection_manager import get_connection_manager
 from utils.general_utils import init_db
 
 
@@ -21,9 +22,11 @@ class ExtractionPipeline:
         self,
         cfg: DictConfig,
         logger: Optional[logging.Logger] = None,
+        embeddings_generator: Optional[EmbeddingsGenerator] = None,
     ) -> None:
         self.cfg = cfg
         self.logger = logger or logging.getLogger(__name__)
+        self.embeddings_generator = embeddings_generator
 
         self.device_video = "cuda" if torch.cuda.is_available() else "cpu"
         self.logger.info(f"Using device: {self.device_video}.")
@@ -97,7 +100,7 @@ class ExtractionPipeline:
                     self.logger.exception(f"Error parsing box for {video_name}.")
 
         if db_buffer:
-            with sqlite3.connect(database=db_path) as conn:
+            with get_connection_manager(db_path).connection() as conn:
                 cursor = conn.cursor()
                 cursor.executemany(
                     """
@@ -108,6 +111,12 @@ class ExtractionPipeline:
                 )
                 conn.commit()
 
+            if self.embeddings_generator is not None:
+                self.embeddings_generator.submit(
+                    modality="video",
+                    rows=[(row[0], row[1]) for row in db_buffer],
+                )
+
     def _extract_audio(self, video_path: str) -> str:
         audio_path = video_path.replace(".mp4", ".wav")
         cmd = (
@@ -145,7 +154,7 @@ class ExtractionPipeline:
 
         db_buffer = [(audio_name, text, confidence)]
 
-        with sqlite3.connect(database=db_path) as conn:
+        with get_connection_manager(db_path).connection() as conn:
             cursor = conn.cursor()
             cursor.executemany(
                 """
@@ -156,6 +165,12 @@ class ExtractionPipeline:
             )
             conn.commit()
 
+        if self.embeddings_generator is not None:
+            self.embeddings_generator.submit(
+                modality="audio",
+                rows=[(audio_name, text)],
+            )
+
     def run(self) -> None:
         start_time = time.time()
 
@@ -164,21 +179,38 @@ class ExtractionPipeline:
             sql_statements=[
                 self.cfg.database.video_events,
                 self.cfg.database.audio_events,
+                *self.cfg.database.get("video_event_indexes", []),
             ],
+            migrations=self.cfg.database.get("migrations", []),
+            slow_query_ms=self.cfg.database.get("slow_query_ms"),
         )
-        video_paths = self._get_video_list(dir_path=self.cfg.dir_path)
-        for video_path in tqdm(video_paths):
-            self.logger.info(f"Processing {os.path.basename(video_path)}.")
-            self._process_video(
-                db_path=self.cfg.database.db_path,
-                video_path=video_path,
-            )
-            audio_path = self._extract_audio(video_path=video_path)
-            self._process_audio(
-                db_path=self.cfg.database.db_path,
-                audio_path=audio_path,
+        if self.embeddings_generator is not None:
+            self.embeddings_generator.start_streaming(
+                queue_size=self.cfg.streaming_embeddings.queue_size
             )
 
+        try:
+            video_paths = self._get_video_list(dir_path=self.cfg.dir_path)
+            for video_path in tqdm(video_paths):
+                self.logger.info(f"Processing {os.path.basename(video_path)}.")
+                self._process_video(
+                    db_path=self.cfg.database.db_path,
+                    video_path=video_path,
+                )
+                audio_path = self._extract_audio(video_path=video_path)
+                self._process_audio(
+                    db_path=self.cfg.database.db_path,
+                    audio_path=audio_path,
+                )
+        except BaseException:
+            # Keep the extraction error; streaming failures are only logged.
+            if self.embeddings_generator is not None:
+                self.embeddings_generator.stop_streaming(raise_errors=False)
+            raise
+
+        if self.embeddings_generator is not None:
+            self.embeddings_generator.stop_streaming()
+
         elapsed = time.time() - start_time
         minutes, seconds = divmod(elapsed, 60)
         self.logger.info(f"Extraction took {int(minutes)}m {seconds:.2f}s.")
@@ -22,7 +22,10 @@ def main(cfg: DictConfig):
     )
 
     generate_embeddings = EmbeddingsGenerator(cfg=cfg, logger=logger)
-    generate_embeddings.generate_embeddings()
+    generate_embeddings.generate_embeddings(
+        num_workers=cfg.backfill.num_workers,
+        chunk_size=cfg.backfill.chunk_size,
+    )
 
 
 if __name__ == "__main__":
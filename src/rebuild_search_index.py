@@ -0,0 +1,43 @@
+import logging
+import os
+from typing import Any
+
+import hydra
+from omegaconf import DictConfig, OmegaConf
+
+from backend.database import get_engine, init_database, search_index_enabled
+from backend.search_index import rebuild_search_index
+from backend.settings import build_settings
+from utils.general_utils import setup_logging
+
+
+@hydra.main(
+    version_base=None,
+    config_path="../config",
+    config_name="backend_app.yaml",
+)
+def main(cfg: DictConfig):
+    logger = logging.getLogger(__name__)
+    setup_logging(
+        logging_config_path=os.path.join(
+            hydra.utils.get_original_cwd(), "config", "logging.yaml"
+        )
+    )
+    resolved: dict[str, Any] = OmegaConf.to_container(
+        cfg, resolve=True, throw_on_missing=True
+    )  # type: ignore[assignment]
+    settings = build_settings(resolved, project_root=hydra.utils.get_original_cwd())
+
+    init_database(
+        database_url=settings.database.url, database_settings=settings.database
+    )
+    if not search_index_enabled():
+        logger.error("SQLite FTS5 is not available; nothing to rebuild.")
+        return
+
+    rebuild_search_index(get_engine())
+    logger.info("Search index rebuilt.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import logging
+import os
+from typing import Any
+
+import hydra
+from omegaconf import DictConfig, OmegaConf
+
+from backend.database import get_engine, init_database
+from backend.response_cache import CACHE_STAMP_FILE, touch_stamp
+from backend.services.extraction_sync import sync_extraction_db
+from backend.settings import build_settings
+from utils.general_utils import setup_logging
+
+
+@hydra.main(
+    version_base=None,
+    config_path="../config",
+    config_name="backend_app.yaml",
+)
+def main(cfg: DictConfig):
+    logger = logging.getLogger(__name__)
+    setup_logging(
+        logging_config_path=os.path.join(
+            hydra.utils.get_original_cwd(), "config", "logging.yaml"
+        )
+    )
+    resolved: dict[str, Any] = OmegaConf.to_container(
+        cfg, resolve=True, throw_on_missing=True
+    )  # type: ignore[assignment]
+    settings = build_settings(resolved, project_root=hydra.utils.get_original_cwd())
+
+    init_database(
+        database_url=settings.database.url, database_settings=settings.database
+    )
+    report = sync_extraction_db(get_engine(), settings.sync)
+    logger.info(f"Sync report: {report.to_dict()}")
+    if report.changed and settings.cache.enabled:
+        # Core inserts bypass the ORM listeners; tell running servers instead.
+        touch_stamp(os.path.join(settings.storage.processed_data_dir, CACHE_STAMP_FILE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Offline pipeline tests package
@@ -0,0 +1,32 @@
+"""Shared pytest fixtures for the offline pipeline tests."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+
+import pytest
+from omegaconf import DictConfig, OmegaConf
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+# The pipeline scripts run from src/ and import ``utils`` and ``embeddings``.
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+
+@pytest.fixture
+def temp_dir() -> str:
+    """Create a temporary directory for test databases."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+@pytest.fixture
+def embeddings_cfg(temp_dir: str) -> DictConfig:
+    """Load generate_embeddings.yaml with databases in ``temp_dir``."""
+    cfg = OmegaConf.load(
+        os.path.join(PROJECT_ROOT, "config", "generate_embeddings.yaml")
+    )
+    cfg.database.source_db_path = os.path.join(temp_dir, "extraction.db")
+    cfg.database.embeddings_db_path = os.path.join(temp_dir, "embeddings.db")
+    return cfg
@@ -0,0 +1,171 @@
+"""Tests for pooled SQLite connections, query hooks and migrations."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from utils.connection_manager import ConnectionManager, apply_migrations
+from utils.general_utils import init_db
+
+
+@pytest.fixture
+def manager(temp_dir: str) -> ConnectionManager:
+    manager = ConnectionManager(db_path=os.path.join(temp_dir, "test.db"), pool_size=1)
+    with manager.connection() as conn:
+        conn.execute("CREATE TABLE items (name TEXT NOT NULL)")
+    yield manager
+    manager.close()
+
+
+def _names(manager: ConnectionManager) -> list[str]:
+    with manager.connection() as conn:
+        return [name for (name,) in conn.execute("SELECT name FROM items")]
+
+
+class TestConnectionManager:
+    """Test connection reuse, transactions and pragmas."""
+
+    def test_connections_are_pooled(self, manager):
+        """Test that released connections are reused up to pool_size."""
+        with manager.connection() as first:
+            pass
+        with manager.connection() as second:
+            pass
+
+        results: dict[str, sqlite3.Connection] = {}
+
+        def hold(name: str, ready: threading.Barrier) -> None:
+            with manager.connection() as conn:
+                results[name] = conn
+                ready.wait(timeout=5)
+
+        ready = threading.Barrier(2)
+        threads = [threading.Thread(target=hold, args=(n, ready)) for n in "ab"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert second is first
+        assert results["a"] is not results["b"]
+        assert len(manager._idle) == 1
+
+    def test_nested_blocks_share_one_transaction(self, manager):
+        """Test that an inner block reuses the connection and defers the commit."""
+        with manager.connection() as outer:
+            outer.execute("INSERT INTO items VALUES ('a')")
+            with manager.connection() as inner:
+                inner.execute("INSERT INTO items VALUES ('b')")
+            with sqlite3.connect(manager.db_path) as other:
+                uncommitted = other.execute("SELECT COUNT(*) FROM items").fetchone()
+            other.close()
+
+        assert inner is outer
+        assert uncommitted == (0,)
+        assert _names(manager) == ["a", "b"]
+
+    def test_exception_rolls_back(self, manager):
+        """Test that an error in the outermost block discards its writes."""
+        with pytest.raises(RuntimeError):
+            with manager.connection() as conn:
+                conn.execute("INSERT INTO items VALUES ('a')")
+                with manager.connection():
+                    raise RuntimeError("boom")
+
+        assert _names(manager) == []
+        assert manager._local.conn is None
+
+    def test_pragmas_are_applied(self, temp_dir):
+        """Test that defaults and overrides are set on every new connection."""
+        manager = ConnectionManager(
+            db_path=os.path.join(temp_dir, "pragmas.db"),
+            pragmas={"busy_timeout": 1234},
+        )
+        with manager.connection() as conn:
+            pragmas = {
+                name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ("journal_mode", "synchronous", "busy_timeout")
+            }
+        manager.close()
+
+        assert pragmas == {
+            "journal_mode": "wal",
+            "synchronous": 1,
+            "busy_timeout": 1234,
+        }
+
+    def test_slow_queries_are_logged(self, manager, caplog):
+        """Test that the slow-query threshold can be set, replaced and removed."""
+        timings: list[str] = []
+        manager.add_query_hook(lambda sql, duration: timings.append(sql))
+
+        manager.log_slow_queries(threshold_ms=0)
+        manager.log_slow_queries(threshold_ms=0)
+        with caplog.at_level("WARNING"):
+            _names(manager)
+        logged = [record.getMessage() for record in caplog.records]
+
+        manager.log_slow_queries(threshold_ms=None)
+        caplog.clear()
+        _names(manager)
+
+        assert timings == ["SELECT name FROM items"] * 2
+        assert len(logged) == 1
+        assert logged[0].startswith("Slow query")
+        assert caplog.records == []
+
+
+class TestMigrations:
+    """Test schema versioning through PRAGMA user_version."""
+
+    def test_migrations_apply_once_in_order(self, manager):
+        """Test that only migrations past the stored version run."""
+        migrations = ["ALTER TABLE items ADD COLUMN size INTEGER"]
+
+        first = apply_migrations(manager.db_path, migrations)
+        again = apply_migrations(manager.db_path, migrations)
+        migrations.append(
+            "CREATE INDEX idx_items_size ON items (size); " "UPDATE items SET size = 0"
+        )
+        upgraded = apply_migrations(manager.db_path, migrations)
+
+        with manager.connection() as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(items)")]
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+        assert (first, again, upgraded, version) == (1, 1, 2, 2)
+        assert columns == ["name", "size"]
+
+    def test_failed_migration_keeps_the_previous_version(self, manager):
+        """Test that a failing script leaves schema and version untouched."""
+        with pytest.raises(sqlite3.OperationalError):
+            apply_migrations(
+                manager.db_path,
+                ["ALTER TABLE items ADD COLUMN size INTEGER; SELECT * FROM missing"],
+            )
+
+        with manager.connection() as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(items)")]
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+        assert (columns, version) == (["name"], 0)
+
+    def test_init_db_creates_tables_then_migrates(self, temp_dir):
+        """Test that init_db runs the idempotent schema and pending migrations."""
+        db_path = os.path.join(temp_dir, "init.db")
+        schema = ["CREATE TABLE IF NOT EXISTS items (name TEXT)"]
+        migrations = ["ALTER TABLE items ADD COLUMN size INTEGER"]
+
+        init_db(db_path=db_path, sql_statements=schema, migrations=migrations)
+        init_db(db_path=db_path, sql_statements=schema, migrations=migrations)
+
+        with sqlite3.connect(db_path) as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(items)")]
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+
+        assert (columns, version) == (["name", "size"], 1)
@@ -0,0 +1,246 @@
+"""Tests for embedding generation and two-stage retrieval."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+from omegaconf import DictConfig, OmegaConf
+
+from embeddings.embeddings_generator import EmbeddingsGenerator
+from utils.connection_manager import get_connection_manager
+
+DIM = 8
+
+EXTRACT_CONFIG = OmegaConf.load(
+    os.path.join(os.path.dirname(__file__), "..", "..", "config", "extract_config.yaml")
+)
+
+
+class StubEncoder:
+    """Stand-in for ``SentenceTransformer`` with fixed vectors per text.
+
+    Unknown texts get a deterministic random unit vector.
+    """
+
+    def __init__(self, vectors: Dict[str, np.ndarray] | None = None, dim: int = 8):
+        self.vectors = dict(vectors or {})
+        self.dim = dim
+        self.calls = 0
+
+    def _encode_one(self, text: str) -> np.ndarray:
+        if text not in self.vectors:
+            rng = np.random.default_rng(sum(text.encode()))
+            vec = rng.standard_normal(self.dim)
+            self.vectors[text] = vec / np.linalg.norm(vec)
+        return np.asarray(self.vectors[text], dtype="float32")
+
+    def encode(self, sentences: Any, **kwargs: Any) -> np.ndarray:
+        self.calls += 1
+        if isinstance(sentences, str):
+            return self._encode_one(sentences)
+        return np.stack([self._encode_one(text) for text in sentences])
+
+    def start_multi_process_pool(self, target_devices: List[str]) -> Dict[str, Any]:
+        self.pool = {"devices": target_devices, "stopped": False}
+        return self.pool
+
+    def stop_multi_process_pool(self, pool: Dict[str, Any]) -> None:
+        pool["stopped"] = True
+
+
+def _unit(axis: int, noise: float, seed: int) -> np.ndarray:
+    vec = np.eye(DIM)[axis] + noise * np.random.default_rng(seed).standard_normal(DIM)
+    return (vec / np.linalg.norm(vec)).astype("float32")
+
+
+@pytest.fixture
+def generator(embeddings_cfg: DictConfig) -> EmbeddingsGenerator:
+    """Build a generator whose query ``"axis:<i>"`` points along axis ``i``."""
+    encoder = StubEncoder({f"axis:{i}": np.eye(DIM)[i] for i in range(DIM)}, dim=DIM)
+    return EmbeddingsGenerator(cfg=embeddings_cfg, sentence_transformer=encoder)
+
+
+@pytest.fixture
+def corpus(generator: EmbeddingsGenerator) -> str:
+    """Store three vectors per file, each file clustered around its own axis."""
+    db_path = generator.cfg.database.embeddings_db_path
+    with get_connection_manager(db_path).connection() as conn:
+        for axis in range(4):
+            file_name = f"file_{axis}.mp4"
+            generator._insert_embeddings(
+                cursor=conn.cursor(),
+                modality="video",
+                rows=[(file_name, "label")] * 3,
+                vectors=np.stack(
+                    [_unit(axis, 0.3, seed=axis * 10 + i) for i in range(3)]
+                ),
+            )
+    generator._update_centroids(embeddings_db_path=db_path, modality="video")
+    return db_path
+
+
+class TestPerformRetrieval:
+    """Test centroid shortlisting against exhaustive search."""
+
+    @pytest.mark.parametrize("shortlist_size", [1, 3, 4, 10])
+    def test_two_stage_matches_exhaustive(self, generator, corpus, shortlist_size):
+        """Test that a shortlist holding the best file returns the exact top-k."""
+        exhaustive = generator.perform_retrieval(
+            db_path=corpus, query="axis:2", top_k=3, shortlist_size=0
+        )
+        two_stage = generator.perform_retrieval(
+            db_path=corpus, query="axis:2", top_k=3, shortlist_size=shortlist_size
+        )
+
+        assert [name for name, _ in exhaustive] == ["file_2.mp4"] * 3
+        assert two_stage == exhaustive
+
+    def test_falls_back_when_shortlist_is_too_small(self, generator, corpus, caplog):
+        """Test that fewer than top_k shortlisted vectors triggers a full search."""
+        exhaustive = generator.perform_retrieval(
+            db_path=corpus, query="axis:0", top_k=5, shortlist_size=0
+        )
+        with caplog.at_level("INFO"):
+            two_stage = generator.perform_retrieval(
+                db_path=corpus, query="axis:0", top_k=5, shortlist_size=1
+            )
+
+        assert len(two_stage) == 5
+        assert two_stage == exhaustive
+        assert "using exhaustive search" in caplog.text
+
+
+@pytest.fixture
+def source_db(embeddings_cfg: DictConfig) -> str:
+    """Create an extraction.db with seven detections and one transcript."""
+    path = embeddings_cfg.database.source_db_path
+    with sqlite3.connect(path) as conn:
+        conn.execute(EXTRACT_CONFIG.database.video_events)
+        conn.execute(EXTRACT_CONFIG.database.audio_events)
+        conn.executemany(
+            "INSERT INTO video_events (file_name, object_name, frame, timestamp) "
+            "VALUES (?, ?, 0, 0)",
+            [(f"file_{i % 3}.mp4", f"object_{i}") for i in range(7)],
+        )
+        conn.execute(
+            "INSERT INTO audio_events (file_name, transcript) "
+            "VALUES ('file_0.wav', 'hello')"
+        )
+    conn.close()
+    return path
+
+
+class TestGenerateEmbeddings:
+    """Test the chunked backfill of the embeddings table."""
+
+    def test_rows_are_written_in_source_order(self, embeddings_cfg, source_db):
+        """Test that chunks encoded through a worker pool are stored in order."""
+        encoder = StubEncoder(dim=DIM)
+        generator = EmbeddingsGenerator(
+            cfg=embeddings_cfg, sentence_transformer=encoder
+        )
+
+        generator.generate_embeddings(num_workers=2, chunk_size=2)
+
+        with sqlite3.connect(embeddings_cfg.database.embeddings_db_path) as conn:
+            rows = conn.execute(
+                "SELECT modality, file_name, vector FROM embeddings ORDER BY id"
+            ).fetchall()
+            centroids = conn.execute("SELECT COUNT(*) FROM file_centroids").fetchone()
+        conn.close()
+
+        texts = [f"object_{i}" for i in range(7)] + ["hello"]
+        assert [(modality, name) for modality, name, _ in rows] == [
+            *(("video", f"file_{i % 3}.mp4") for i in range(7)),
+            ("audio", "file_0.wav"),
+        ]
+        for (_, _, blob), text in zip(rows, texts):
+            np.testing.assert_array_equal(
+                np.frombuffer(blob, dtype="float32"), encoder._encode_one(text)
+            )
+        assert centroids == (4,)
+        assert encoder.pool == {"devices": ["cpu", "cpu"], "stopped": True}
+
+    def test_writer_failure_stops_encoding(
+        self, embeddings_cfg, source_db, monkeypatch
+    ):
+        """Test that no further chunks are encoded once a write has failed."""
+        failed = threading.Event()
+        encoder = StubEncoder(dim=DIM)
+        generator = EmbeddingsGenerator(
+            cfg=embeddings_cfg, sentence_transformer=encoder
+        )
+
+        def failing_insert(**kwargs: Any) -> None:
+            failed.set()
+            raise sqlite3.OperationalError("disk I/O error")
+
+        def encode_after_failure(sentences: Any, **kwargs: Any) -> np.ndarray:
+            # Hold the second chunk until the writer has failed on the first.
+            if encoder.calls == 1:
+                failed.wait(timeout=5)
+            return StubEncoder.encode(encoder, sentences, **kwargs)
+
+        monkeypatch.setattr(generator, "_insert_embeddings", failing_insert)
+        monkeypatch.setattr(encoder, "encode", encode_after_failure)
+
+        with pytest.raises(sqlite3.OperationalError):
+            generator.generate_embeddings(chunk_size=2)
+
+        assert encoder.calls == 2
+
+
+class TestStreaming:
+    """Test embedding rows as the extraction pipeline submits them."""
+
+    def test_stop_drains_submitted_batches(self, embeddings_cfg):
+        """Test that every batch submitted before stop is embedded."""
+        encoder = StubEncoder(dim=DIM)
+        generator = EmbeddingsGenerator(
+            cfg=embeddings_cfg, sentence_transformer=encoder
+        )
+
+        generator.start_streaming(queue_size=1)
+        for i in range(5):
+            generator.submit("video", [(f"file_{i}.mp4", "person")] * 2)
+        generator.submit("audio", [])
+        generator.stop_streaming()
+
+        with sqlite3.connect(embeddings_cfg.database.embeddings_db_path) as conn:
+            embedded = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            centroids = conn.execute("SELECT COUNT(*) FROM file_centroids").fetchone()
+        conn.close()
+
+        assert embedded == (10,)
+        assert centroids == (5,)
+        with pytest.raises(RuntimeError):
+            generator.submit("video", [("late.mp4", "person")])
+
+    def test_batch_failure_surfaces_on_submit_and_stop(
+        self, embeddings_cfg, monkeypatch
+    ):
+        """Test that a failed batch is re-raised unless the caller opts out."""
+        generator = EmbeddingsGenerator(
+            cfg=embeddings_cfg, sentence_transformer=StubEncoder(dim=DIM)
+        )
+
+        def failing_insert(**kwargs: Any) -> None:
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(generator, "_insert_embeddings", failing_insert)
+
+        generator.start_streaming()
+        generator.submit("video", [("a.mp4", "person")])
+        with pytest.raises(sqlite3.OperationalError):
+            generator.stop_streaming()
+
+        generator.start_streaming()
+        generator.submit("video", [("a.mp4", "person")])
+        generator.stop_streaming(raise_errors=False)
+        with pytest.raises(RuntimeError):
+            generator.submit("video", [("a.mp4", "person")])
@@ -0,0 +1,195 @@
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+QueryHook = Callable[[str, float], None]
+
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -64000,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+}
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that reports the duration of every statement to query hooks."""
+
+    def execute(self, sql: str, parameters: Any = (), /) -> "TimedCursor":
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _run_hooks(self.connection, sql, time.perf_counter() - start)
+
+    def executemany(self, sql: str, parameters: Any, /) -> "TimedCursor":
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, parameters)
+        finally:
+            _run_hooks(self.connection, sql, time.perf_counter() - start)
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors (including ``execute`` shortcuts) are timed."""
+
+    query_hooks: List[QueryHook]
+
+    def cursor(self, factory: Any = TimedCursor) -> Any:  # type: ignore[override]
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> Any:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, parameters: Any, /) -> Any:
+        return self.cursor().executemany(sql, parameters)
+
+
+def _run_hooks(connection: Any, sql: str, duration: float) -> None:
+    for hook in getattr(connection, "query_hooks", ()):
+        try:
+            hook(sql, duration)
+        except Exception:
+            logger.exception("Query hook failed.")
+
+
+class ConnectionManager:
+    """Pool of configured SQLite connections for a single database file.
+
+    Connections are opened with the pragmas in ``DEFAULT_PRAGMAS`` (WAL,
+    ``mmap_size``, ``cache_size``, ``busy_timeout``, ``temp_store``) and reused
+    across operations, so sqlite3's per-connection prepared statement cache
+    stays warm. Nested ``connection()`` calls on the same thread share one
+    connection and only the outermost block commits or rolls back.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: int = 4,
+        pragmas: Optional[Dict[str, Any]] = None,
+        cached_statements: int = 256,
+    ) -> None:
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.cached_statements = cached_statements
+        self.query_hooks: List[QueryHook] = []
+        self._slow_query_hook: Optional[QueryHook] = None
+        self._idle: List[TimedConnection] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _open(self) -> TimedConnection:
+        conn = sqlite3.connect(
+            database=self.db_path,
+            factory=TimedConnection,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.query_hooks = self.query_hooks
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _acquire(self) -> TimedConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open()
+
+    def _release(self, conn: TimedConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[TimedConnection]:
+        held: Optional[TimedConnection] = getattr(self._local, "conn", None)
+        if held is not None:
+            yield held
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    def add_query_hook(self, hook: QueryHook) -> None:
+        """Register ``hook(sql, duration_seconds)`` for every statement."""
+        self.query_hooks.append(hook)
+
+    def log_slow_queries(self, threshold_ms: Optional[float]) -> None:
+        """Log statements slower than ``threshold_ms``; ``None`` turns it off.
+
+        Replaces the threshold set by an earlier call instead of adding a
+        second logger.
+        """
+        if self._slow_query_hook is not None:
+            self.query_hooks.remove(self._slow_query_hook)
+            self._slow_query_hook = None
+        if threshold_ms is not None:
+            self._slow_query_hook = slow_query_logger(threshold_ms=threshold_ms)
+            self.add_query_hook(self._slow_query_hook)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path: str) -> ConnectionManager:
+    """Return the process-wide ``ConnectionManager`` for ``db_path``."""
+    with _managers_lock:
+        manager = _managers.get(db_path)
+        if manager is None:
+            manager = ConnectionManager(db_path=db_path)
+            _managers[db_path] = manager
+        return manager
+
+
+def slow_query_logger(threshold_ms: float = 100.0) -> QueryHook:
+    """Build a query hook that logs statements slower than ``threshold_ms``."""
+
+    def _hook(sql: str, duration: float) -> None:
+        if duration * 1000 >= threshold_ms:
+            logger.warning(f"Slow query ({duration * 1000:.1f} ms): {sql.strip()}")
+
+    return _hook
+
+
+def apply_migrations(db_path: str, migrations: Sequence[str]) -> int:
+    """Bring ``db_path`` up to ``len(migrations)`` using ``PRAGMA user_version``.
+
+    ``migrations[i]`` upgrades the schema from version ``i`` to ``i + 1`` and
+    may contain several statements. Returns the resulting schema version.
+    """
+    with get_connection_manager(db_path).connection() as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, script in enumerate(migrations[version:], start=version + 1):
+            logger.info(f"Migrating {db_path} to schema version {target}.")
+            conn.executescript(
+                f"BEGIN; {script}; PRAGMA user_version = {target}; COMMIT;"
+            )
+        return max(version, len(migrations))
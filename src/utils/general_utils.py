@@ -1,12 +1,13 @@
 import logging
 import logging.config
 import os
-import sqlite3
-from typing import Sequence
+from typing import Optional, Sequence
 
 import numpy as np
 import yaml
 
+from utils.connection_manager import apply_migrations, get_connection_manager
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,12 +33,23 @@ def setup_logging(
 def init_db(
     db_path: str,
     sql_statements: Sequence[str],
+    migrations: Sequence[str] = (),
+    slow_query_ms: Optional[float] = None,
 ) -> None:
-    with sqlite3.connect(database=db_path) as conn:
+    """Create the tables in ``db_path``, then apply pending ``migrations``.
+
+    ``sql_statements`` must be idempotent (``IF NOT EXISTS``); schema changes
+    to existing databases go through ``migrations`` (see ``apply_migrations``).
+    Statements slower than ``slow_query_ms`` are logged from then on.
+    """
+    manager = get_connection_manager(db_path)
+    manager.log_slow_queries(threshold_ms=slow_query_ms)
+    with manager.connection() as conn:
         cursor = conn.cursor()
         for statement in sql_statements:
             cursor.execute(statement)
         conn.commit()
+    apply_migrations(db_path=db_path, migrations=migrations)
 
 
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float: